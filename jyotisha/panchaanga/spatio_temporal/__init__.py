@@ -115,13 +115,30 @@ class City(JsonObject):
   def get_lunar_eclipse_time(self, jd_start):
     return swe.lun_eclipse_when_loc(jd_start, lon=self.longitude, lat=self.latitude)
 
+  def get_solar_eclipses_in_period(self, jd_start, jd_end):
+    """Get solar eclipses visible here, with maxima between jd_start and jd_end - each in the format of get_solar_eclipse_time.
+    
+    Unlike repeated get_solar_eclipse_time calls, only the eclipses in the global catalogue which could be visible here are examined (see eclipse.get_local_eclipses). 
+    """
+    from jyotisha.panchaanga.temporal import eclipse
+    return eclipse.get_local_eclipses(eclipse_type=eclipse.SOLAR, latitude=self.latitude, longitude=self.longitude, jd_start=jd_start, jd_end=jd_end)
+
+  def get_lunar_eclipses_in_period(self, jd_start, jd_end):
+    """Get lunar eclipses visible here, with maxima between jd_start and jd_end - each in the format of get_lunar_eclipse_time.
+    
+    See get_solar_eclipses_in_period.
+    """
+    from jyotisha.panchaanga.temporal import eclipse
+    return eclipse.get_local_eclipses(eclipse_type=eclipse.LUNAR, latitude=self.latitude, longitude=self.longitude, jd_start=jd_start, jd_end=jd_end)
+
   def get_zodiac_longitude_eastern_horizon(self, jd):
     """ Get the ID of the raashi what is currently rising.
     
     :param jd: 
     :return: 
     """
-    return swe.houses_ex(jd, self.latitude, self.longitude)[1][0]
+    # The ascendant does not depend on the house system - but placidus houses (the default) cannot be computed above the polar circles.
+    return swe.houses_ex(jd, self.latitude, self.longitude, b'E')[1][0]
 
   def get_lagna_float(self, jd, offset=0, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, debug=False):
     """Returns the rising rAshi at a given location.
@@ -3,6 +3,7 @@ import os
 import sys
 import traceback
 
+from jyotisha import util
 from jyotisha.panchaanga.spatio_temporal import periodical
 from jyotisha.panchaanga.spatio_temporal.periodical import Panchaanga
 from jyotisha.panchaanga.temporal import ComputationSystem, set_constants, time, era
@@ -25,14 +26,17 @@ def load_panchaanga(fname, fallback_fn):
     logging.warning("Precomputed Panchanga obsolete.")
     return fallback_fn()
   else:
-    panchaanga.dump_to_file(filename=fname)
+    util.dump_to_file_atomically(obj=panchaanga, filename=fname)
     return panchaanga
-  
+
+
+def get_precomputed_path(city, year, year_type, computation_system, precomputed_json_dir="~/Documents/jyotisha"):
+  return os.path.expanduser('%s/%s__%s_%s__%s.json' % (precomputed_json_dir, city.name, year_type, year, computation_system))
 
 
 def get_panchaanga_for_kali_year(city, year, precomputed_json_dir="~/Documents/jyotisha", computation_system: ComputationSystem = None, allow_precomputed=True, recompute_festivals=True):
   year = int(year)
-  fname = os.path.expanduser('%s/%s__kali_%s__%s.json' % (precomputed_json_dir, city.name, year, computation_system))
+  fname = get_precomputed_path(city=city, year=year, year_type=era.ERA_KALI, computation_system=computation_system, precomputed_json_dir=precomputed_json_dir)
   if os.path.isfile(fname) and allow_precomputed:
     fn = lambda: get_panchaanga_for_kali_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir,
                                                computation_system=computation_system, allow_precomputed=False)
@@ -58,7 +62,7 @@ def get_panchaanga_for_kali_year(city, year, precomputed_json_dir="~/Documents/j
     logging.info('Writing computed panchaanga to %s...\n' % fname)
 
     try:
-      panchaanga.dump_to_file(filename=fname)
+      util.dump_to_file_atomically(obj=panchaanga, filename=fname)
     except EnvironmentError:
       logging.warning("Not able to save.")
       logging.error(traceback.format_exc())
@@ -66,7 +70,7 @@ def get_panchaanga_for_kali_year(city, year, precomputed_json_dir="~/Documents/j
 
 
 def get_panchaanga_for_shaka_year(city, year, precomputed_json_dir="~/Documents/jyotisha", computation_system: ComputationSystem = None, allow_precomputed=True):
-  fname = os.path.expanduser('%s/%s__shaka_%s__%s.json' % (precomputed_json_dir, city.name, year, computation_system))
+  fname = get_precomputed_path(city=city, year=year, year_type=era.ERA_SHAKA, computation_system=computation_system, precomputed_json_dir=precomputed_json_dir)
   if os.path.isfile(fname) and allow_precomputed:
     fn = lambda: get_panchaanga_for_shaka_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir,
                                                computation_system=computation_system, allow_precomputed=False)
@@ -89,7 +93,7 @@ def get_panchaanga_for_shaka_year(city, year, precomputed_json_dir="~/Documents/
     logging.info('Writing computed panchaanga to %s...\n' % fname)
 
     try:
-      panchaanga.dump_to_file(filename=fname)
+      util.dump_to_file_atomically(obj=panchaanga, filename=fname)
     except EnvironmentError:
       logging.warning("Not able to save.")
       logging.error(traceback.format_exc())
@@ -98,7 +102,7 @@ def get_panchaanga_for_shaka_year(city, year, precomputed_json_dir="~/Documents/
 
 def get_panchaanga_for_civil_year(city, year, precomputed_json_dir="~/Documents/jyotisha",
                                   computation_system: ComputationSystem = None, allow_precomputed=True):
-  fname = os.path.expanduser('%s/%s__gregorian_%s__%s.json' % (precomputed_json_dir, city.name, year, computation_system))
+  fname = get_precomputed_path(city=city, year=year, year_type=era.ERA_GREGORIAN, computation_system=computation_system, precomputed_json_dir=precomputed_json_dir)
   if os.path.isfile(fname) and allow_precomputed:
     fn = lambda: get_panchaanga_for_civil_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir,
                                             computation_system=computation_system, allow_precomputed=False)
@@ -110,17 +114,17 @@ def get_panchaanga_for_civil_year(city, year, precomputed_json_dir="~/Documents/
     panchaanga.year = year
     logging.info('Writing computed panchaanga to %s...\n' % fname)
 
-    panchaanga.dump_to_file(filename=fname)
+    util.dump_to_file_atomically(obj=panchaanga, filename=fname)
     return panchaanga
 
 
-def get_panchaanga_for_year(city, year, year_type, computation_system, allow_precomputed=True):
+def get_panchaanga_for_year(city, year, year_type, computation_system, allow_precomputed=True, precomputed_json_dir="~/Documents/jyotisha"):
   if year_type == era.ERA_GREGORIAN:
-    return get_panchaanga_for_civil_year(city=city, year=year, computation_system=computation_system, allow_precomputed=allow_precomputed)
+    return get_panchaanga_for_civil_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir, computation_system=computation_system, allow_precomputed=allow_precomputed)
   elif year_type == era.ERA_KALI:
-    return get_panchaanga_for_kali_year(city=city, year=year, computation_system=computation_system, allow_precomputed=allow_precomputed)
+    return get_panchaanga_for_kali_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir, computation_system=computation_system, allow_precomputed=allow_precomputed)
   elif year_type == era.ERA_SHAKA:
-    return get_panchaanga_for_shaka_year(city=city, year=year, computation_system=computation_system, allow_precomputed=allow_precomputed)
+    return get_panchaanga_for_shaka_year(city=city, year=year, precomputed_json_dir=precomputed_json_dir, computation_system=computation_system, allow_precomputed=allow_precomputed)
 
 
 def get_panchaanga_for_given_dates(city, start_date, end_date, precomputed_json_dir="~/Documents/jyotisha",
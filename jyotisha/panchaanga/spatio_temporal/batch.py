@@ -0,0 +1,205 @@
+"""
+Compute annual panchaangas for many (city, year, year_type, computation_system) jobs - in a pool of processes.
+
+Each job is independent: it computes its panchaanga from scratch and writes it (atomically) to its own file - the one annual.get_panchaanga_for_year reads as the precomputed panchaanga. So, writers (eg. generation_project.dump_summary) can follow with allow_precomputed=True. Worker processes load what every job needs (festival rules, ephemeris files, the eclipse catalogue, timezone tables) once, when they start.
+
+Usage example:
+  python -m jyotisha.panchaanga.spatio_temporal.batch --cities Chennai Delhi --years 2019 2021-2023 --workers 4
+"""
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+import traceback
+
+import swisseph as swe
+from sanskrit_data.schema import common
+from sanskrit_data.schema.common import JsonObject
+
+from jyotisha import util
+from jyotisha.panchaanga.spatio_temporal import City, annual
+from jyotisha.panchaanga.temporal import ComputationSystem, body, eclipse, era, julian_day
+from jyotisha.panchaanga.temporal.festival import rules
+from jyotisha.panchaanga.temporal.time import Timezone
+
+
+class BatchJob(JsonObject):
+  def __init__(self, city, year, year_type=era.ERA_GREGORIAN, computation_system=None):
+    super(BatchJob, self).__init__()
+    self.city = city
+    self.year = int(year)
+    self.year_type = year_type
+    self.computation_system = computation_system if computation_system is not None else ComputationSystem.DEFAULT
+
+  def get_output_path(self, output_dir):
+    return annual.get_precomputed_path(city=self.city, year=self.year, year_type=self.year_type, computation_system=self.computation_system, precomputed_json_dir=output_dir)
+
+  def __repr__(self):
+    return "%s %s %d (%s)" % (self.city.name, self.year_type, self.year, self.computation_system)
+
+
+class BatchJobReport(JsonObject):
+  def __init__(self, job, output_path, seconds, error=None):
+    """
+
+    :param seconds: Time taken by the job (in the worker process).
+    :param error: The traceback, if the job failed.
+    """
+    super(BatchJobReport, self).__init__()
+    self.job = job
+    self.output_path = output_path
+    self.seconds = seconds
+    self.error = error
+
+
+def _get_jd_ranges(jobs):
+  """Julian day ranges covering the years of the jobs (rather than all years between the earliest and the latest) - merged where they overlap, in chronological order."""
+  jd_ranges = []
+  for civil_year in sorted({job.year - era.get_year_0_offset(era_id=job.year_type) for job in jobs}):
+    # Margins - for padding days and non-gregorian years (which end in the next gregorian year).
+    (jd_start, jd_end) = (julian_day.ymdhms_to_jd(civil_year - 1, 1, 1), julian_day.ymdhms_to_jd(civil_year + 2, 1, 1))
+    if len(jd_ranges) > 0 and jd_start <= jd_ranges[-1][1]:
+      jd_ranges[-1] = (jd_ranges[-1][0], jd_end)
+    else:
+      jd_ranges.append((jd_start, jd_end))
+  return jd_ranges
+
+
+def warm_up(jobs):
+  """Load what the given jobs need in this process - so that it happens once per process rather than in the midst of (the first) jobs."""
+  for computation_system in {str(job.computation_system): job.computation_system for job in jobs}.values():
+    festival_options = computation_system.festival_options
+    if not festival_options.no_fests:
+      rules.RulesCollection.get_cached(repos_tuple=tuple(festival_options.repos), julian_handling=festival_options.julian_handling)
+  for timezone_id in {job.city.timezone for job in jobs}:
+    Timezone.get_cached(timezone_id=timezone_id).utc_offset_table
+  for (jd_start, jd_end) in _get_jd_ranges(jobs=jobs):
+    # Opens the fixed star and ephemeris files.
+    body.get_star_longitude(star="Spica", jd=jd_start)
+    for body_id in (swe.SUN, swe.MOON):
+      swe.calc_ut(jd_start, body_id)
+    # Built (and saved) by the parent process; only read here.
+    for eclipse_type in (eclipse.SOLAR, eclipse.LUNAR):
+      eclipse.DEFAULT_CATALOGUE.get_eclipses(eclipse_type=eclipse_type, jd_start=jd_start, jd_end=jd_end)
+
+
+def _warm_up_worker(pickled_jobs):
+  warm_up(jobs=pickle.loads(pickled_jobs))
+
+
+def run_job(job, output_dir):
+  """Compute the panchaanga for the job and write it to job.get_output_path(output_dir). Errors are reported rather than raised.
+
+  :return: A BatchJobReport.
+  """
+  output_path = job.get_output_path(output_dir=output_dir)
+  start_time = time.time()
+  error = None
+  try:
+    annual.get_panchaanga_for_year(city=job.city, year=job.year, year_type=job.year_type, computation_system=job.computation_system, allow_precomputed=False, precomputed_json_dir=output_dir)
+    if not os.path.isfile(output_path):
+      error = "%s was not written." % output_path
+  except Exception:
+    error = traceback.format_exc()
+  return BatchJobReport(job=job, output_path=output_path, seconds=time.time() - start_time, error=error)
+
+
+def _run_job_in_worker(pickled_job, output_dir):
+  report = run_job(job=pickle.loads(pickled_job), output_dir=output_dir)
+  return (report.output_path, report.seconds, report.error)
+
+
+def _log_report(report):
+  if report.error is None:
+    logging.info("Computed %s in %.1fs: %s", report.job, report.seconds, report.output_path)
+  else:
+    logging.error("Failed to compute %s (in %.1fs):\n%s", report.job, report.seconds, report.error)
+
+
+def run_jobs(jobs, output_dir="~/Documents/jyotisha", workers=None):
+  """Run the jobs in a pool of processes.
+
+  :param jobs: A list of BatchJob-s.
+  :param workers: Number of processes. Defaults to the number of CPUs. If 1, jobs are run in this process.
+  :return: A list of BatchJobReport-s, in the order of jobs.
+  """
+  if len(jobs) == 0:
+    return []
+  if workers is None:
+    workers = os.cpu_count() or 1
+  workers = min(workers, len(jobs))
+  # This also builds any missing parts of the (on-disk) eclipse catalogue once, before workers read it.
+  warm_up(jobs=jobs)
+  if workers == 1:
+    reports = []
+    for job in jobs:
+      reports.append(run_job(job=job, output_dir=output_dir))
+      _log_report(report=reports[-1])
+    return reports
+
+  reports = [None] * len(jobs)
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_warm_up_worker, initargs=(util.pickle_dumps(jobs),)) as executor:
+    future_to_index = {executor.submit(_run_job_in_worker, util.pickle_dumps(job), output_dir): index for (index, job) in enumerate(jobs)}
+    for future in concurrent.futures.as_completed(future_to_index):
+      index = future_to_index[future]
+      try:
+        (output_path, seconds, error) = future.result()
+      except Exception:
+        # Eg. the worker process died.
+        (output_path, seconds, error) = (jobs[index].get_output_path(output_dir=output_dir), 0.0, traceback.format_exc())
+      reports[index] = BatchJobReport(job=jobs[index], output_path=output_path, seconds=seconds, error=error)
+      _log_report(report=reports[index])
+  return reports
+
+
+def get_jobs(cities, years, year_types=(era.ERA_GREGORIAN,), computation_systems=(None,)):
+  """All combinations of the given cities, years, year types and computation systems - as a list of BatchJob-s."""
+  return [BatchJob(city=city, year=year, year_type=year_type, computation_system=computation_system) for computation_system in computation_systems for year_type in year_types for city in cities for year in years]
+
+
+def _parse_years(year_args):
+  years = []
+  for year_arg in year_args:
+    if "-" in year_arg:
+      (first_year, last_year) = year_arg.split("-")
+      years.extend(range(int(first_year), int(last_year) + 1))
+    else:
+      years.append(int(year_arg))
+  return years
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Compute annual panchaangas for several cities and years, in parallel.')
+  parser.add_argument('--cities', nargs='+', required=True, help="Names of cities in the city database.")
+  parser.add_argument('--years', nargs='+', required=True, help="Years, or inclusive ranges like 2010-2020.")
+  parser.add_argument('--year_types', nargs='+', default=[era.ERA_GREGORIAN], choices=[era.ERA_GREGORIAN, era.ERA_KALI, era.ERA_SHAKA])
+  parser.add_argument('--computation_systems', nargs='+', default=None, help="Computation system toml files. Defaults to ComputationSystem.DEFAULT.")
+  parser.add_argument('--output_dir', default="~/Documents/jyotisha")
+  parser.add_argument('--workers', type=int, default=None)
+  parser.add_argument('--report', default=None, help="A json file to write per-job timings and errors to.")
+  args = parser.parse_args(argv)
+
+  cities = [City.get_city_from_db(name=name) for name in args.cities]
+  computation_systems = [None] if args.computation_systems is None else [ComputationSystem.read_from_file(filename=filename) for filename in args.computation_systems]
+  jobs = get_jobs(cities=cities, years=_parse_years(args.years), year_types=args.year_types, computation_systems=computation_systems)
+  start_time = time.time()
+  reports = run_jobs(jobs=jobs, output_dir=args.output_dir, workers=args.workers)
+  failed_reports = [report for report in reports if report.error is not None]
+  logging.info("Ran %d jobs (%d failed) in %.1fs; %.1fs of computation.", len(reports), len(failed_reports), time.time() - start_time, sum(report.seconds for report in reports))
+  if args.report is not None:
+    with open(os.path.expanduser(args.report), "w") as f:
+      json.dump([{"job": str(report.job), "output_path": report.output_path, "seconds": report.seconds, "error": report.error} for report in reports], f, indent=2)
+  return 1 if len(failed_reports) > 0 else 0
+
+
+# Essential for depickling to work.
+common.update_json_class_index(sys.modules[__name__])
+
+
+if __name__ == '__main__':
+  logging.basicConfig(level=logging.INFO)
+  sys.exit(main())
@@ -2,15 +2,14 @@
 #  -*- coding: utf-8 -*-
 import logging
 import sys
-from math import floor, modf
+from math import isnan, modf
 
 import methodtools
 from indic_transliteration import sanscript
 from sanskrit_data.schema import common
-from scipy.optimize import brentq
 from timebudget import timebudget
 
-from jyotisha.panchaanga.spatio_temporal import City
+from jyotisha.panchaanga.spatio_temporal import City, lagna
 from jyotisha.panchaanga.temporal import time, ComputationSystem, set_constants, names, era, body
 from jyotisha.panchaanga.temporal import zodiac
 from jyotisha.panchaanga.temporal.body import Graha
@@ -19,7 +18,7 @@ from jyotisha.panchaanga.temporal.festival.rules import pancha_paxi
 from jyotisha.panchaanga.temporal.interval import DayLengthBasedPeriods, Interval, get_interval
 from jyotisha.panchaanga.temporal.month import LunarMonthAssigner
 from jyotisha.panchaanga.temporal.names import translate_or_transliterate
-from jyotisha.panchaanga.temporal.time import Timezone, Date, BasicDate, Hour
+from jyotisha.panchaanga.temporal.time import Date, BasicDate, Hour
 from jyotisha.panchaanga.temporal.zodiac import Ayanamsha, NakshatraDivision, AngaSpanFinder
 from jyotisha.panchaanga.temporal.zodiac.angas import AngaType, Anga
 from jyotisha.util import default_if_none
@@ -134,6 +133,14 @@ class PaxiActivities(common.JsonObject):
       activity_intervals.append(activity_interval)
 
 
+def _check_sun_event(jd, event_name):
+  """City.get_rising_time (and get_setting_time) yield 0.0, and rise_set.get_sunrise_sunset_table yields nan, when the sun does not rise (or set)."""
+  if jd == 0.0 or isnan(jd):
+    logging.error('No %s was computed!' % event_name)
+    raise (ValueError(
+      'No %s was computed. Perhaps the co-ordinates are beyond the polar circle (most likely a LAT-LONG swap! Please check your inputs.' % event_name))
+
+
 # This class is not named Panchangam in order to be able to disambiguate from annual.Panchangam in serialized objects.
 class DailyPanchaanga(common.JsonObject):
   """This class enables the construction of a panchaanga.
@@ -143,24 +150,28 @@ class DailyPanchaanga(common.JsonObject):
 
   @classmethod
   def from_city_and_julian_day(cls, city, julian_day, computation_system: ComputationSystem = None):
-    date = Timezone(city.timezone).julian_day_to_local_time(julian_day)
+    date = city.get_timezone_obj().julian_day_to_local_time(julian_day)
     return DailyPanchaanga(city=city, date=date, computation_system=computation_system)
 
   def __init__(self, city: City, date: Date, computation_system = None,
-               previous_day_panchaanga=None) -> None:
+               previous_day_panchaanga=None, anga_timelines=None, sun_rise_set_jds=None) -> None:
     """Constructor for the panchaanga.
+    
+    :param anga_timelines: Optional dict mapping (ayanaamsha_id, anga_type name) to zodiac.AngaTimeline objects covering this day. Avoids repeated searches for boundaries when computing many days. 
+    :param sun_rise_set_jds: Optional dict with precomputed jd_sunrise, jd_sunset, jd_previous_sunset and jd_next_sunrise (see rise_set.get_sunrise_sunset_table).
     """
     super(DailyPanchaanga, self).__init__()
     self.city = city
     self.date = date
     date.set_time_to_day_start()
-    self.julian_day_start = Timezone(self.city.timezone).local_time_to_julian_day(date=self.date)
+    self.julian_day_start = self.city.get_timezone_obj().local_time_to_julian_day(date=self.date)
     self.computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
 
-    self.jd_sunrise = None
-    self.jd_sunset = None
-    self.jd_previous_sunset = None
-    self.jd_next_sunrise = None
+    sun_rise_set_jds = default_if_none(sun_rise_set_jds, {})
+    self.jd_sunrise = sun_rise_set_jds.get("jd_sunrise", None)
+    self.jd_sunset = sun_rise_set_jds.get("jd_sunset", None)
+    self.jd_previous_sunset = sun_rise_set_jds.get("jd_previous_sunset", None)
+    self.jd_next_sunrise = sun_rise_set_jds.get("jd_next_sunrise", None)
     self.graha_rise_jd = {}
     self.graha_set_jd = {}
 
@@ -178,6 +189,7 @@ class DailyPanchaanga(common.JsonObject):
     self.festival_id_to_instance = {}
     self.mauDhyas = None
     self.amauDhyas = None
+    self._anga_timelines = anga_timelines
 
     self.compute_graha_transitions(previous_day_panchaanga=previous_day_panchaanga)
     self.compute_solar_day_sunset(previous_day_panchaanga=previous_day_panchaanga)
@@ -201,7 +213,7 @@ class DailyPanchaanga(common.JsonObject):
     return repr(self)
 
   def __lt__(self, other):
-    return self.date.get_date_str() < self.date.get_date_str()
+    return self.date < other.date
 
   def compute_graha_transitions(self, previous_day_panchaanga=None, force_recomputation=False):
     """
@@ -215,8 +227,10 @@ class DailyPanchaanga(common.JsonObject):
         self.jd_sunrise = previous_day_panchaanga.jd_next_sunrise
       else:
         self.jd_sunrise = self.city.get_rising_time(julian_day_start=self.julian_day_start, body=Graha.SUN)
+    _check_sun_event(jd=self.jd_sunrise, event_name="sunrise")
     if force_recomputation or self.jd_sunset is None:
       self.jd_sunset = self.city.get_setting_time(julian_day_start=self.jd_sunrise, body=Graha.SUN)
+    _check_sun_event(jd=self.jd_sunset, event_name="sunset")
     if force_recomputation or self.jd_previous_sunset is None:
       if previous_day_panchaanga is not None and previous_day_panchaanga.jd_sunset is not None:
         self.jd_previous_sunset = previous_day_panchaanga.jd_sunset
@@ -225,40 +239,64 @@ class DailyPanchaanga(common.JsonObject):
                                                              body=Graha.SUN)
     if force_recomputation or self.jd_next_sunrise is None:
       self.jd_next_sunrise = self.city.get_rising_time(julian_day_start=self.jd_sunset, body=Graha.SUN)
-    if self.jd_sunset == 0.0:
-      logging.error('No sunset was computed!')
-      raise (ValueError(
-        'No sunset was computed. Perhaps the co-ordinates are beyond the polar circle (most likely a LAT-LONG swap! Please check your inputs.'))
 
-    for body in Graha.PLANETS_REVERSE_ORDER + [Graha.MOON]:
-      if force_recomputation or body not in self.graha_rise_jd:
-        self.graha_rise_jd[body] = self.city.get_rising_time(julian_day_start=self.jd_sunrise, body=body)
-      if force_recomputation or body not in self.graha_set_jd:
-        self.graha_set_jd[body] = self.city.get_setting_time(julian_day_start=self.jd_sunrise, body=body)
+    # Rise and set times of other bodies are computed upon access - unless listed in FestivalOptions.graha_rise_set_bodies.
+    self.compute_graha_rise_set_jds(bodies=default_if_none(self.computation_system.festival_options.graha_rise_set_bodies, []), force_recomputation=force_recomputation)
 
     if force_recomputation or self.sunrise_day_angas is None:
       self.sunrise_day_angas = DayAngas()
       # Deliberately passing ASHVINI_STARTING_0 below since it is cheapest. Tithi is independent of ayanAmsha. 
-      self.sunrise_day_angas.tithis_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0, anga_type=zodiac.AngaType.TITHI).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.tithis_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0, anga_type=zodiac.AngaType.TITHI)
       self.sunrise_day_angas.tithi_at_sunrise = self.sunrise_day_angas.tithis_with_ends[0].anga
       
-      self.sunrise_day_angas.nakshatras_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.NAKSHATRA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.nakshatras_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.NAKSHATRA)
       self.sunrise_day_angas.nakshatra_at_sunrise = self.sunrise_day_angas.nakshatras_with_ends[0].anga
       
-      self.sunrise_day_angas.yogas_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.YOGA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.yogas_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.YOGA)
       self.sunrise_day_angas.yoga_at_sunrise = self.sunrise_day_angas.yogas_with_ends[0].anga
       
-      self.sunrise_day_angas.karanas_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.KARANA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.karanas_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.KARANA)
       
-      self.sunrise_day_angas.raashis_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.RASHI).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
-      self.sunrise_day_angas.solar_raashis_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.SIDEREAL_MONTH).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.raashis_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.RASHI)
+      self.sunrise_day_angas.solar_raashis_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.SIDEREAL_MONTH)
       
-      self.sunrise_day_angas.solar_nakshatras_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.SOLAR_NAKSH).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      self.sunrise_day_angas.solar_nakshatras_with_ends = self._get_sunrise_day_angas_with_ends(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.SOLAR_NAKSH)
+
+  def compute_graha_rise_set_jds(self, bodies=None, force_recomputation=False):
+    """Compute rise and set times of the given bodies (by default, Graha.PLANETS_REVERSE_ORDER + [Graha.MOON]) now - so that they are serialized.
+    """
+    for body in default_if_none(bodies, Graha.PLANETS_REVERSE_ORDER + [Graha.MOON]):
+      if force_recomputation:
+        self.graha_rise_jd.pop(body, None)
+        self.graha_set_jd.pop(body, None)
+      self.get_graha_rise_jd(body=body)
+      self.get_graha_set_jd(body=body)
+
+  def get_graha_rise_jd(self, body):
+    """First rise of the body after sunrise - computed upon first access (see compute_graha_rise_set_jds) and memoized.
+    """
+    if body not in self.graha_rise_jd:
+      self.graha_rise_jd[body] = self.city.get_rising_time(julian_day_start=self.jd_sunrise, body=body)
+    return self.graha_rise_jd[body]
+
+  def get_graha_set_jd(self, body):
+    """First setting of the body after sunrise - computed upon first access (see compute_graha_rise_set_jds) and memoized.
+    """
+    if body not in self.graha_set_jd:
+      self.graha_set_jd[body] = self.city.get_setting_time(julian_day_start=self.jd_sunrise, body=body)
+    return self.graha_set_jd[body]
+
+  def _get_sunrise_day_angas_with_ends(self, ayanaamsha_id, anga_type):
+    # _anga_timelines is not serialized - it could be None upon deserialization.
+    anga_timeline = default_if_none(self._anga_timelines, {}).get((ayanaamsha_id, anga_type.name), None)
+    if anga_timeline is not None and anga_timeline.covers(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise):
+      return anga_timeline.get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+    return AngaSpanFinder.get_cached(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
 
   def get_interval(self, interval_id):
     interval_id = names.devanaagarii_to_python.get(interval_id, interval_id)
     if interval_id == "moonrise":
-      return Interval(name=interval_id, jd_start=self.graha_rise_jd[Graha.MOON], jd_end=self.graha_rise_jd[Graha.MOON])
+      return Interval(name=interval_id, jd_start=self.get_graha_rise_jd(body=Graha.MOON), jd_end=self.get_graha_rise_jd(body=Graha.MOON))
     elif interval_id == "sunrise":
       return Interval(jd_start=self.jd_sunrise, jd_end=self.jd_sunrise, name=interval_id)
     elif interval_id == "sunset":
@@ -460,29 +498,11 @@ class DailyPanchaanga(common.JsonObject):
     if self.lagna_data is not None:
       return self.lagna_data
 
-    self.lagna_data = []
     if getattr(self, "jd_sunrise", None) is None or self.jd_sunrise is None:
       self.compute_graha_transitions()
-    lagna_sunrise = 1 + floor(self.city.get_lagna_float(self.jd_sunrise, ayanaamsha_id=ayanaamsha_id))
-
-    lagna_list = [(x + lagna_sunrise - 1) % 12 + 1 for x in range(13)]
-
-    lbrack = self.jd_sunrise - 3 / 24
-    rbrack = self.jd_sunrise + 3 / 24
-
-    for lagna in lagna_list:
-      # print('---\n', lagna)
-      if debug:
-        logging.debug(('lagna sunrise', self.city.get_lagna_float(self.jd_sunrise, ayanaamsha_id=ayanaamsha_id)))
-        logging.debug(('lbrack', self.city.get_lagna_float(lbrack, int(-lagna), ayanaamsha_id=ayanaamsha_id)))
-        logging.debug(('rbrack', self.city.get_lagna_float(rbrack, int(-lagna), ayanaamsha_id=ayanaamsha_id)))
-
-      lagna_end_time = brentq(self.city.get_lagna_float, lbrack, rbrack,
-                              args=(-lagna, ayanaamsha_id, debug))
-      lbrack = lagna_end_time + 1 / 24
-      rbrack = lagna_end_time + 3 / 24
-      if lagna_end_time < self.jd_next_sunrise:
-        self.lagna_data.append((lagna, lagna_end_time))
+    self.lagna_data = lagna.get_lagna_data(city=self.city, jd_start=self.jd_sunrise, jd_end=self.jd_next_sunrise, ayanaamsha_id=ayanaamsha_id)
+    if debug:
+      logging.debug(self.lagna_data)
     return self.lagna_data
 
 
@@ -538,8 +558,14 @@ class DailyPanchaanga(common.JsonObject):
 
 
   def set_graha_raashis(self):
+    ayanaamsha_id = self.computation_system.ayanaamsha_id
     for graha_id in [Graha.MERCURY, Graha.VENUS, Graha.MARS, Graha.JUPITER, Graha.SATURN, Graha.RAHU, Graha.KETU]:
-      self.sunrise_day_angas.graha_raashis_with_ends[graha_id] = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.GRAHA_RASHI[graha_id]).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+      anga_type = zodiac.AngaType.GRAHA_RASHI[graha_id]
+      anga_timeline = default_if_none(self._anga_timelines, {}).get((ayanaamsha_id, anga_type.name), None)
+      if anga_timeline is None or not anga_timeline.covers(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise):
+        # Unlike AngaSpanFinder, this accounts for retrograde transits.
+        anga_timeline = zodiac.AngaTimeline.from_transits(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=self.jd_sunrise, jd_end=self.jd_next_sunrise)
+      self.sunrise_day_angas.graha_raashis_with_ends[graha_id] = anga_timeline.get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
 
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
@@ -0,0 +1,194 @@
+"""
+Find the days on which a festival (defined by a rule in the rules collection) falls over a range of years - without computing full panchaangas for those years.
+
+Candidate occurrences are found by searching for the festival's anga with zodiac.AngaSpanFinder (or, for festivals on some day of a solar month, for the start of that month). Daily panchaangas are computed only for a few days around each candidate; and the festival is assigned among them as RuleLookupAssigner would - so that results agree with those in periodical.Panchaanga-s. (Relative festivals whose anchors fall before the start of a periodical.Panchaanga are missed there, but not here.) Festivals without a queryable timing (eg. those assigned only by hardcoded appliers) raise ValueError.
+
+Usage example:
+  FestivalQuery(city=City.get_city_from_db("Chennai")).find_dates(fest_id="dIpAvalI_or_lakSmI-kubEra-pUjA", start_year=1900, end_year=2100)
+"""
+import datetime
+
+from jyotisha.panchaanga.spatio_temporal import daily, periodical
+from jyotisha.panchaanga.temporal import ComputationSystem, era
+from jyotisha.panchaanga.temporal.festival import priority_decision, rules
+from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner, rule_repo_based
+from jyotisha.panchaanga.temporal.festival.rules import RulesRepo
+from jyotisha.panchaanga.temporal.time import Date
+from jyotisha.panchaanga.temporal.zodiac import Anga, AngaSpanFinder, AngaType, Ayanamsha, NakshatraDivision
+from jyotisha.util import default_if_none
+
+# Festivals are sought this many days beyond the period of interest - since a later occurrence (within a month) may displace an earlier one.
+MARGIN_DAYS = 40
+# Spans of the target anga when the sun is more than these many raashis away from the festival month are skipped (lunar months lag the sun's raashi by upto a month).
+MAX_RAASHI_DISTANCE = 2
+# Festivals which other appliers assign by their own logic, or rename or remove after RuleLookupAssigner assigns them - as declared by those appliers (see FestivalAssigner.OVERRIDDEN_FEST_IDS).
+OVERRIDDEN_FEST_IDS = set().union(*[applier_class.OVERRIDDEN_FEST_IDS for applier_class in periodical.FESTIVAL_ASSIGNER_CLASSES + [FestivalAssigner]])
+
+
+class FestivalQuery(object):
+  def __init__(self, city, computation_system=None):
+    self.city = city
+    self.computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
+    festival_options = self.computation_system.festival_options
+    self.rules_collection = rules.RulesCollection.get_cached(repos_tuple=tuple(festival_options.repos), julian_handling=festival_options.julian_handling)
+    self._timezone = city.get_timezone_obj()
+    self._date_to_panchaanga = {}
+
+  def get_daily_panchaanga(self, date):
+    """Daily panchaangas are computed independently of each other (rather than from the previous day's), so that results do not depend on the order of queries."""
+    if date not in self._date_to_panchaanga:
+      self._date_to_panchaanga[date] = daily.DailyPanchaanga(city=self.city, date=date, computation_system=self.computation_system)
+    return self._date_to_panchaanga[date]
+
+  def _get_local_date(self, jd):
+    local_time = self._timezone.julian_day_to_local_time(jd)
+    return Date(year=local_time.year, month=local_time.month, day=local_time.day)
+
+  def find_dates(self, fest_id, start_year, end_year):
+    """Days on which the festival falls in the (gregorian) years start_year to end_year.
+
+    :return: A sorted list of Date-s.
+    """
+    fest_rule = self.rules_collection.name_to_rule.get(fest_id, None)
+    if fest_rule is None:
+      raise ValueError("No rule for %s" % fest_id)
+    if fest_id in OVERRIDDEN_FEST_IDS:
+      raise ValueError("%s is overridden by other festival appliers" % fest_id)
+    (start_date, end_date) = (Date(year=start_year, month=1, day=1), Date(year=end_year, month=12, day=31))
+    dates = self._find_dates(fest_rule=fest_rule, start_date=start_date - MARGIN_DAYS, end_date=end_date + MARGIN_DAYS)
+    return sorted(date for date in dates if start_date <= date <= end_date and not self._is_before_year_start(date=date, fest_rule=fest_rule))
+
+  def _is_before_year_start(self, date, fest_rule):
+    """As in FestivalAssigner.assign_festival_numbers - which removes festivals whose ordinal would not be positive."""
+    timing = fest_rule.timing
+    if timing is None or timing.year_start is None:
+      return False
+    year = date.year + era.get_year_0_offset(era_id=timing.year_start_era)
+    if timing.month_type in (RulesRepo.LUNAR_MONTH_DIR, RulesRepo.SIDEREAL_SOLAR_MONTH_DIR):
+      daily_panchaanga = self.get_daily_panchaanga(date=date)
+      month = daily_panchaanga.lunar_month_sunrise.index if timing.month_type == RulesRepo.LUNAR_MONTH_DIR else daily_panchaanga.solar_sidereal_date_sunset.month
+      # Years begin with chaitra or mESha - in March or April.
+      if date.month > 4 or month < 6:
+        year += 1
+    elif timing.month_type != RulesRepo.GREGORIAN_MONTH_DIR:
+      return False
+    return year - timing.year_start <= 0
+
+  def _find_dates(self, fest_rule, start_date, end_date):
+    timing = fest_rule.timing
+    if timing is not None and timing.offset is not None:
+      return self._find_relative_dates(fest_rule=fest_rule, start_date=start_date, end_date=end_date)
+    if timing is None or timing.month_number is None or timing.anga_number is None:
+      raise ValueError("%s has no timing which can be queried" % fest_rule.id)
+    if timing.anga_type == RulesRepo.DAY_DIR:
+      if timing.month_type == RulesRepo.GREGORIAN_MONTH_DIR:
+        return self._find_gregorian_dates(fest_rule=fest_rule, start_date=start_date, end_date=end_date)
+      elif timing.month_type in (RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, RulesRepo.TROPICAL_MONTH_DIR):
+        return self._find_solar_month_day_dates(fest_rule=fest_rule, start_date=start_date, end_date=end_date)
+    elif timing.month_type in (RulesRepo.LUNAR_MONTH_DIR, RulesRepo.SIDEREAL_SOLAR_MONTH_DIR):
+      return self._find_anga_dates(fest_rule=fest_rule, start_date=start_date, end_date=end_date)
+    raise ValueError("Unsupported timing for %s: %s %s" % (fest_rule.id, timing.month_type, timing.anga_type))
+
+  def _find_relative_dates(self, fest_rule, start_date, end_date):
+    # As in RuleLookupAssigner.assign_relative_festivals - except that approximate anchor matches are sought only among rules.
+    offset = int(fest_rule.timing.offset)
+    anchor_festival_id = fest_rule.timing.anchor_festival_id
+    if anchor_festival_id not in self.rules_collection.name_to_rule:
+      aliases = self.rules_collection.get_anchor_aliases(anchor_festival_id=anchor_festival_id)
+      if len(aliases) != 1:
+        raise ValueError("Anchor %s of %s does not match a unique rule: %s" % (anchor_festival_id, fest_rule.id, str(aliases)))
+      anchor_festival_id = aliases[0]
+    anchor_rule = self.rules_collection.name_to_rule[anchor_festival_id]
+    return [date + offset for date in self._find_dates(fest_rule=anchor_rule, start_date=start_date - offset, end_date=end_date - offset)]
+
+  def _find_gregorian_dates(self, fest_rule, start_date, end_date):
+    # As in RuleLookupAssigner.apply_month_day_events - days beyond the end of a month fall on its last day.
+    months = range(1, 13) if fest_rule.timing.month_number == 0 else [fest_rule.timing.month_number]
+    dates = []
+    for year in range(start_date.year, end_date.year + 1):
+      for month in months:
+        last_day = (datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)).day
+        dates.append(Date(year=year, month=month, day=min(fest_rule.timing.anga_number, last_day)))
+    return dates
+
+  def _find_solar_month_day_dates(self, fest_rule, start_date, end_date):
+    timing = fest_rule.timing
+    # Tropical months are sidereal months with zero ayanaamsha.
+    ayanaamsha_id = self.computation_system.ayanaamsha_id if timing.month_type == RulesRepo.SIDEREAL_SOLAR_MONTH_DIR else Ayanamsha.ASHVINI_STARTING_0
+    anga_finder = AngaSpanFinder.get_cached(ayanaamsha_id=ayanaamsha_id, anga_type=AngaType.SIDEREAL_MONTH)
+    months = range(1, 13) if timing.month_number == 0 else [timing.month_number]
+    (jd_start, jd_end) = (self._timezone.local_time_to_julian_day(date=start_date), self._timezone.local_time_to_julian_day(date=end_date))
+    dates = []
+    for month in months:
+      for span in anga_finder.get_spans_in_period(jd_start=jd_start, jd_end=jd_end, target_anga_id=month):
+        if span.jd_start is None:
+          continue
+        approximate_date = self._get_local_date(jd=span.jd_start) + (timing.anga_number - 1)
+        for date in [approximate_date - 1, approximate_date, approximate_date + 1]:
+          solar_date = self.get_daily_panchaanga(date=date).get_date(month_type=timing.month_type)
+          if solar_date.month == month and solar_date.day == timing.anga_number:
+            dates.append(date)
+    return dates
+
+  def _may_be_in_month(self, jd, fest_rule):
+    if fest_rule.timing.month_number == 0:
+      return True
+    raashi = NakshatraDivision(jd, ayanaamsha_id=self.computation_system.ayanaamsha_id).get_anga(anga_type=AngaType.SIDEREAL_MONTH).index
+    distance = (raashi - int(fest_rule.timing.month_number)) % 12
+    return min(distance, 12 - distance) <= MAX_RAASHI_DISTANCE
+
+  def _find_anga_dates(self, fest_rule, start_date, end_date):
+    timing = fest_rule.timing
+    target_anga = Anga.get_cached(index=timing.anga_number, anga_type_id=timing.anga_type.upper())
+    anga_type = target_anga.get_type()
+    anga_finder = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=anga_type)
+    (jd_start, jd_end) = (self._timezone.local_time_to_julian_day(date=start_date), self._timezone.local_time_to_julian_day(date=end_date))
+    # Ordered by date - as would be assigned by RuleLookupAssigner over a panchaanga for the whole period.
+    fest_days = {}
+    for span in anga_finder.get_spans_in_period(jd_start=jd_start, jd_end=jd_end, target_anga_id=target_anga):
+      (span_jd_start, span_jd_end) = (default_if_none(span.jd_start, jd_start), default_if_none(span.jd_end, jd_end))
+      if not self._may_be_in_month(jd=span_jd_start, fest_rule=fest_rule):
+        continue
+      # Days whose (sunrise to sunrise) periods overlap the span, and their neighbours.
+      (date, last_date) = (self._get_local_date(jd=span_jd_start) - 1, self._get_local_date(jd=span_jd_end) + 1)
+      while date <= last_date:
+        self._apply_anga_event(date=date, fest_rule=fest_rule, target_anga=target_anga, fest_days=fest_days)
+        date = date + 1
+
+    # Remove paraviddha assigned on consecutive days - as FestivalAssigner.cleanup_festivals does.
+    if 'sAyana' not in fest_rule.id:
+      for date in list(fest_days):
+        if date + 1 in fest_days:
+          del fest_days[date]
+    return list(fest_days)
+
+  def _apply_anga_event(self, date, fest_rule, target_anga, fest_days):
+    """Like RuleLookupAssigner.apply_month_anga_events, for a single festival.
+
+    :param fest_days: Maps days to which the festival has been assigned so far to their daily panchaangas - updated here.
+    """
+    timing = fest_rule.timing
+    month_type = timing.month_type
+    anga_type = target_anga.get_type()
+    (p0, p1) = (self.get_daily_panchaanga(date=date - 1), self.get_daily_panchaanga(date=date))
+    month = p1.get_date(month_type=month_type).month
+    # Is the festival relevant to the previous day or the current day? See RuleLookupAssigner._get_relevant_festivals.
+    is_relevant = False
+    for day in (date - 1, date):
+      anga_spans = periodical.get_interval_anga_spans(get_daily_panchaanga=self.get_daily_panchaanga, date=day, interval_id="full_day", anga_type=anga_type)
+      if fest_rule.id in self.rules_collection.get_possibly_relevant_fests(month=month, angas=[span.anga for span in anga_spans], month_type=month_type, anga_type_id=anga_type.name.lower()):
+        is_relevant = True
+    if not is_relevant:
+      return
+
+    decision = priority_decision.decide(p0=p0, p1=p1, target_anga=target_anga, kaala=timing.get_kaala(), ayanaamsha_id=self.computation_system.ayanaamsha_id, priority=timing.get_priority())
+    if decision is None:
+      return
+    p_fday = decision.day_panchaanga
+    if not rule_repo_based.should_assign_festival(p_fday=p_fday, fest_rule=fest_rule, fest_days=fest_days):
+      return
+    if len(fest_days) > 0:
+      previous_fest_day = sorted(fest_days)[-1]
+      if timing.month_number != 0 and p_fday.date - previous_fest_day <= 32 and fest_days[previous_fest_day].get_date(month_type=month_type).month == month:
+        del fest_days[previous_fest_day]
+    fest_days[p_fday.date] = p_fday
@@ -0,0 +1,116 @@
+"""
+Closed-form computation of lagna-s (ascendants).
+
+The tropical longitude λ of the ascendant follows from the local sidereal time (RAMC) θ, the obliquity ε and the latitude φ:
+  tan(λ) = cos(θ) / -(sin(θ) cos(ε) + tan(φ) sin(ε))
+(which is what swe.houses_ex computes). Conversely, the ecliptic point at longitude λ (with right ascension α and declination δ) rises when θ = α - H, where cos(H) = -tan(φ) tan(δ). So, the instants when lagna boundaries rise follow directly from the sidereal time - which is nearly linear in time. A few fixed point iterations take care of the slow variation of the ayanaamsha offset, the obliquity and nutation.
+
+This replaces 13 brentq searches per day (each evaluating swe.houses_ex and the ayanaamsha offset a dozen times or so) with a few numpy operations per lagna.
+"""
+import bisect
+import math
+
+import numpy
+import swisseph as swe
+
+from jyotisha.panchaanga.spatio_temporal import rise_set
+from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+
+NUM_ITERATIONS = 3
+
+
+def _get_ascendants(city, ramcs, obliquities):
+  (ramcs, obliquities) = (numpy.radians(ramcs), numpy.radians(obliquities))
+  ascendants = numpy.degrees(numpy.arctan2(numpy.cos(ramcs), -(numpy.sin(ramcs) * numpy.cos(obliquities) + math.tan(math.radians(city.latitude)) * numpy.sin(obliquities))))
+  # Within the polar circles, the above is the setting point for part of the day - swe.houses_ex then takes the point opposite to it (ie. keeps the ascendant east of the MC).
+  mcs = numpy.degrees(numpy.arctan2(numpy.sin(ramcs), numpy.cos(ramcs) * numpy.cos(obliquities)))
+  is_western = (abs(city.latitude) >= 90 - numpy.degrees(obliquities)) & ((ascendants - mcs + 180) % 360 - 180 < 0)
+  return numpy.where(is_western, ascendants + 180, ascendants)
+
+
+def get_lagna_floats(city, jds, ayanaamsha_id=Ayanamsha.CHITRA_AT_180):
+  """Vectorized version of City.get_lagna_float (with offset 0).
+
+  :param jds: A sequence (preferably a numpy array) of julian days.
+  :return: A numpy array of lagna floats (between 0 and 12), corresponding to jds.
+  """
+  jds = numpy.asarray(jds, dtype=float)
+  ramcs = numpy.array([swe.sidtime(jd) * 15 for jd in jds]) + city.longitude
+  obliquities = numpy.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in jds])
+  return ((_get_ascendants(city=city, ramcs=ramcs, obliquities=obliquities) - Ayanamsha.singleton(ayanaamsha_id).get_offsets(jds)) % 360) / 30
+
+
+def _get_right_ascensions_and_declinations(longitudes, obliquities):
+  (longitudes, obliquities) = (numpy.radians(longitudes), numpy.radians(obliquities))
+  right_ascensions = numpy.degrees(numpy.arctan2(numpy.sin(longitudes) * numpy.cos(obliquities), numpy.cos(longitudes)))
+  return (right_ascensions, numpy.arcsin(numpy.sin(longitudes) * numpy.sin(obliquities)))
+
+
+def _get_rising_ramcs(city, longitudes, obliquities):
+  """Local sidereal times (in degrees) at which the given tropical ecliptic longitudes rise - nan for those which never rise or set (within the polar circles)."""
+  (right_ascensions, declinations) = _get_right_ascensions_and_declinations(longitudes=longitudes, obliquities=obliquities)
+  cos_hour_angles = -math.tan(math.radians(city.latitude)) * numpy.tan(declinations)
+  return right_ascensions - numpy.degrees(numpy.arccos(numpy.where(abs(cos_hour_angles) <= 1, cos_hour_angles, numpy.nan)))
+
+
+def _get_jump_longitudes(city, obliquities):
+  """Within the polar circles, the ascendant jumps by 180 degrees twice a sidereal day - when the ecliptic passes through the north and south points of the horizon. It jumps from the points (returned here) which then culminate on the horizon - so, at their right ascension.
+
+  :return: A tuple of arrays of tropical longitudes, with nan-s outside the polar circles.
+  """
+  # Declination of the point culminating on the horizon: -tan(φ) tan(δ) = 1 .
+  sin_longitudes = numpy.sin(-math.atan(1 / math.tan(math.radians(city.latitude)))) / numpy.sin(numpy.radians(obliquities))
+  longitudes = numpy.degrees(numpy.arcsin(numpy.where(abs(sin_longitudes) <= 1, sin_longitudes, numpy.nan)))
+  return (longitudes, 180 - longitudes)
+
+
+def get_lagna_data(city, jd_start, jd_end, ayanaamsha_id=Ayanamsha.CHITRA_AT_180):
+  """Get lagna-s ending between jd_start and jd_end - for a day or a longer period, in one go.
+
+  The sidereal time, obliquity and ayanaamsha offset are sampled daily and interpolated (see rise_set.InterpolatedSiderealFrame) - so that the cost per lagna is just that of a few numpy operations.
+
+  Within the polar circles, some lagna boundaries never rise; the ascendant moves backwards for part of the day, and jumps across the remaining longitudes (see _get_jump_longitudes) - all as in swe.houses_ex.
+
+  :return: A list of (lagna, end jd) tuples, beginning with the lagna prevailing at jd_start. Same as DailyPanchaanga.get_lagna_data if jd_start and jd_end are consecutive sunrises.
+  """
+  frame = rise_set.InterpolatedSiderealFrame(jd_start=jd_start, jd_end=jd_end)
+  offsets = Ayanamsha.singleton(ayanaamsha_id).get_offsets(frame.grid)
+
+  def get_offsets(jds):
+    return numpy.interp(jds, frame.grid, offsets)
+
+  def get_ramcs(jds):
+    return frame.get_sidereal_angles(jds) + city.longitude
+
+  # Candidate events for every sidereal day: the rising of each of the 12 boundaries (ending the lagna below it, or above it if the ascendant moves backwards), and 2 jumps.
+  num_days = int(math.ceil((jd_end - jd_start) * rise_set.SIDEREAL_RATE / 360))
+  (days, event_ids) = [x.flatten() for x in numpy.meshgrid(numpy.arange(num_days), numpy.arange(14), indexing="ij")]
+  is_jump = event_ids >= 12
+  boundaries = event_ids + 1
+
+  jds = numpy.full(len(days), float(jd_start))
+  for iteration in range(NUM_ITERATIONS):
+    obliquities = frame.get_obliquities(jds)
+    jump_longitudes = numpy.where(event_ids == 12, *_get_jump_longitudes(city=city, obliquities=obliquities))
+    longitudes = numpy.where(is_jump, jump_longitudes, 30.0 * boundaries + get_offsets(jds))
+    event_ramcs = numpy.where(is_jump, _get_right_ascensions_and_declinations(longitudes=longitudes, obliquities=obliquities)[0], _get_rising_ramcs(city=city, longitudes=longitudes, obliquities=obliquities))
+    if iteration == 0:
+      jds = jd_start + ((event_ramcs - get_ramcs(jds)) % 360 + 360.0 * days) / rise_set.SIDEREAL_RATE
+    else:
+      jds = jds + ((event_ramcs - get_ramcs(jds) + 180) % 360 - 180) / rise_set.SIDEREAL_RATE
+
+  occurs = ~numpy.isnan(jds) & (jds > jd_start) & (jds < jd_end)
+  (jds, boundaries, is_jump, longitudes) = (jds[occurs], boundaries[occurs], is_jump[occurs], longitudes[occurs])
+  (ramcs, obliquities) = (get_ramcs(jds), frame.get_obliquities(jds))
+  ascendant_changes = _get_ascendants(city=city, ramcs=ramcs + 0.01, obliquities=obliquities) - _get_ascendants(city=city, ramcs=ramcs - 0.01, obliquities=obliquities)
+  is_backwards = (ascendant_changes + 180) % 360 - 180 < 0
+  jump_lagnas = ((longitudes - get_offsets(jds)) % 360 // 30 + 1).astype(int)
+  lagnas = numpy.where(is_jump, jump_lagnas, numpy.where(is_backwards, boundaries % 12 + 1, boundaries))
+  order = numpy.argsort(jds)
+  return [(int(lagna), float(jd)) for (lagna, jd) in zip(lagnas[order], jds[order])]
+
+
+def get_lagna_data_slice(lagna_data, jd_start, jd_end):
+  """Extract the lagna data for a sub-period (eg. a day) from that of a longer period (see get_lagna_data)."""
+  jd_ends = [jd for (_, jd) in lagna_data]
+  return lagna_data[bisect.bisect_right(jd_ends, jd_start): bisect.bisect_left(jd_ends, jd_end)]
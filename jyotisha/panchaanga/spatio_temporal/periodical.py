@@ -1,20 +1,26 @@
+import collections.abc
+import concurrent.futures
 import copy
 import logging
+import pickle
 import sys
 from collections import defaultdict
+from math import floor
+from numbers import Number
 from typing import Dict
 
-import methodtools
 from timebudget import timebudget
 
-from jyotisha.panchaanga.spatio_temporal import daily
-from jyotisha.panchaanga.temporal import time, set_constants, ComputationSystem, AngaType, era
+from jyotisha.panchaanga.spatio_temporal import daily, rise_set, lagna
+from jyotisha.panchaanga.temporal import time, set_constants, ComputationSystem, AngaType, era, julian_day, apply_steps
 from jyotisha.panchaanga.temporal.festival import FestivalInstance
 from jyotisha.panchaanga.temporal.festival.applier import tithi_festival, ecliptic, solar, vaara, rule_repo_based, \
   FestivalAssigner
 from jyotisha.panchaanga.temporal.time import Date
 from jyotisha.panchaanga.temporal.tithi import ShraddhaTithiAssigner
+from jyotisha.panchaanga.temporal.zodiac import Ayanamsha, AngaTimeline, boundary_store
 from jyotisha.panchaanga.temporal.zodiac.angas import Tithi
+from jyotisha import util
 from jyotisha.util import default_if_none
 from sanskrit_data import collection_helper
 from sanskrit_data.schema import common
@@ -24,6 +30,87 @@ timebudget.set_quiet(True)  # don't show measurements as they happen
 
 set_constants()
 
+def _compute_daily_panchaangas(city, computation_system, dates, sun_rise_set_rows, anga_timelines, previous_day_panchaanga=None):
+  """Compute daily panchaangas for consecutive dates - each (but the first, unless previous_day_panchaanga is given) reusing results for the previous day.
+
+  :param sun_rise_set_rows: Dicts of precomputed sun rise and set times, corresponding to dates (see daily.DailyPanchaanga).
+  """
+  daily_panchaangas = []
+  for (date, sun_rise_set_jds) in zip(dates, sun_rise_set_rows):
+    daily_panchaanga = daily.DailyPanchaanga(city=city, date=date, computation_system=computation_system, previous_day_panchaanga=previous_day_panchaanga, anga_timelines=anga_timelines, sun_rise_set_jds=sun_rise_set_jds)
+    daily_panchaangas.append(daily_panchaanga)
+    previous_day_panchaanga = daily_panchaanga
+  return daily_panchaangas
+
+
+# Attributes set on daily panchaangas after they are computed - by Panchaanga (lagna_data) and festival appliers.
+_DAY_ANNOTATIONS = ("lagna_data", "festival_id_to_instance", "shraaddha_tithi")
+
+
+def _recompute_leading_daily_panchaangas(city, computation_system, previous_day_panchaanga, daily_panchaangas, anga_timelines):
+  """Recompute the initial days of daily_panchaangas (the first of which was computed without previous_day_panchaanga) with their actual predecessors - till one agrees with what was computed earlier. The remaining days are then exactly what a serial computation would yield. Usually, just one day needs to be recomputed.
+
+  :return: The resulting daily panchaangas, and the number of days recomputed.
+  """
+  recomputed_daily_panchaangas = []
+  for (index, daily_panchaanga) in enumerate(daily_panchaangas):
+    # Computed with the precomputed sun rise and set times, daily panchaangas retain them.
+    sun_rise_set_jds = {key: getattr(daily_panchaanga, key) for key in ("jd_sunrise", "jd_sunset", "jd_previous_sunset", "jd_next_sunrise")}
+    [recomputed_daily_panchaanga] = _compute_daily_panchaangas(city=city, computation_system=computation_system, dates=[daily_panchaanga.date], sun_rise_set_rows=[sun_rise_set_jds], anga_timelines=anga_timelines, previous_day_panchaanga=previous_day_panchaanga)
+    for attribute in _DAY_ANNOTATIONS:
+      setattr(recomputed_daily_panchaanga, attribute, getattr(daily_panchaanga, attribute))
+    recomputed_daily_panchaangas.append(recomputed_daily_panchaanga)
+    if recomputed_daily_panchaanga == daily_panchaanga:
+      return (recomputed_daily_panchaangas + daily_panchaangas[index + 1:], index + 1)
+    previous_day_panchaanga = recomputed_daily_panchaanga
+  return (recomputed_daily_panchaangas, len(daily_panchaangas))
+
+
+def _compute_daily_panchaangas_in_worker(pickled_kwargs):
+  """Arguments and the result are pickled with util.pickle_dumps."""
+  daily_panchaangas = _compute_daily_panchaangas(**pickle.loads(pickled_kwargs))
+  for daily_panchaanga in daily_panchaangas:
+    # The parent process has these already.
+    (daily_panchaanga.city, daily_panchaanga.computation_system, daily_panchaanga._anga_timelines) = (None, None, None)
+  return util.pickle_dumps(daily_panchaangas)
+
+
+def _to_date(date):
+  """:param date: A Date, or a string like 2019-12-31."""
+  date = Date(*([int(x) for x in date.split('-')])) if isinstance(date, str) else date
+  date.set_time_to_day_start()
+  return date
+
+
+def get_interval_anga_spans(get_daily_panchaanga, date, interval_id, anga_type):
+  """Anga spans within an interval of the given date - with tithis tagged with their lunar months.
+
+  :param get_daily_panchaanga: A function returning the daily panchaanga for a date (or None, if not available).
+  """
+  dp = get_daily_panchaanga(date)
+  (anga_spans, _) = dp.get_interval_anga_spans(interval_id=interval_id, anga_type=anga_type)
+  anga_spans = copy.deepcopy(anga_spans)
+
+  if anga_type == AngaType.TITHI:
+    for span in anga_spans:
+      if span.anga.index in (1, 2):
+        # The below is necessary because tithi 1 or 2 may start after sunrise.
+        dp_next = get_daily_panchaanga(date + 1)
+        # Lunar month below may be incorrect (adhika mAsa complication) if dp_next is not available (eg when the next day is beyond this panchaanga duration). Downstream code should be aware of that case.
+        month = dp_next.lunar_month_sunrise if dp_next is not None else dp.lunar_month_sunrise + 1
+        span.anga = Tithi.from_anga(anga=span.anga, month=month)
+      else:
+        span.anga = Tithi.from_anga(anga=span.anga, month=dp.lunar_month_sunrise)
+
+  return anga_spans
+
+
+# Julian days within this many days of a local midnight are mapped to dates the slow (but exact) way - see Panchaanga.day_at.
+MIDNIGHT_TOLERANCE_DAYS = 1e-9
+
+# Festival appliers run (in this order) after RuleLookupAssigner - see Panchaanga.update_festival_details.
+FESTIVAL_ASSIGNER_CLASSES = [ecliptic.EclipticFestivalAssigner, tithi_festival.TithiFestivalAssigner, solar.SolarFestivalAssigner, vaara.VaraFestivalAssigner]
+
 
 class Panchaanga(common.JsonObject):
   """This class enables the construction of a panchaanga for arbitrary periods, with festival_id_to_instance.
@@ -32,20 +119,28 @@ class Panchaanga(common.JsonObject):
     """
   LATEST_VERSION = "0.0.4"
 
-  def __init__(self, city, start_date, end_date, year_type = None, computation_system: ComputationSystem = None, recompute_festivals=True):
+  def __init__(self, city, start_date, end_date, year_type = None, computation_system: ComputationSystem = None, recompute_festivals=True, workers=None):
     """Constructor for the panchaanga.
+
+    :param workers: If more than 1, daily panchaangas are computed with these many processes (see compute_angas).
         """
     super(Panchaanga, self).__init__()
     self.version = Panchaanga.LATEST_VERSION
     self.city = city
-    self.start_date = Date(*([int(x) for x in start_date.split('-')])) if isinstance(start_date, str) else start_date
-    self.start_date.set_time_to_day_start()
-    self.end_date = Date(*([int(x) for x in end_date.split('-')])) if isinstance(end_date, str) else end_date
-    self.end_date.set_time_to_day_start()
+    self._set_period(start_date=start_date, end_date=end_date)
     self.year_type = year_type
 
     self.computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
 
+    self.festival_id_to_days = defaultdict(set, {})
+    self.compute_angas(compute_lagnas=self.computation_system.festival_options.set_lagnas, workers=workers)
+    if not self.computation_system.festival_options.no_fests and recompute_festivals:
+      self.update_festival_details()
+
+  def _set_period(self, start_date, end_date):
+    self.start_date = _to_date(start_date)
+    self.end_date = _to_date(end_date)
+
     self.jd_start = time.utc_gregorian_to_jd(self.start_date)
     self.jd_end = time.utc_gregorian_to_jd(self.end_date)
 
@@ -53,55 +148,261 @@ class Panchaanga(common.JsonObject):
 
     # For accurate festival assignment, we sometimes need panchaanga information about succeeding or preceding days. 
     # For example, consider a festival to be selebrated during naxatra 27 in solar sideral month 9. If naxatra 27 occurs twice in sidereal_solar_month 9 (gap of 27+ daus), the latter occurence is to be selected - the former day will not get a festival. 
+    # Posterior padding days are computed only as far as they are accessed (see daily_panchaangas_on_demand) - which is all of them, if festivals are assigned (see RuleLookupAssigner.get_steps).
     self.duration_posterior_padding = int(self.duration + 30)
     self.duration_prior_padding = 2
 
     self.weekday_start = time.get_weekday(self.jd_start)
 
-    self.festival_id_to_days = defaultdict(set, {})
-    self.compute_angas(compute_lagnas=self.computation_system.festival_options.lagnas)
-    if not self.computation_system.festival_options.no_fests and recompute_festivals:
-      self.update_festival_details()
+  def _get_num_padded_days(self):
+    return self.duration_prior_padding + self.duration_posterior_padding - 1
+
+  def _get_padded_dates(self, start_index=0, end_index=None):
+    """
+    
+    :return: Dates of the padded period, from the start_index-th till (excluding) the end_index-th (default: all). 
+    """
+    end_index = default_if_none(end_index, self._get_num_padded_days())
+    dates = []
+    for d in range(start_index - self.duration_prior_padding, end_index - self.duration_prior_padding):
+      # The below block is temporary code to make the transition seamless.
+      date_d = time.jd_to_utc_gregorian(self.jd_start + d)
+      date_d.set_time_to_day_start()
+      dates.append(date_d)
+    return dates
 
   @timebudget
-  def compute_angas(self, compute_lagnas=True):
-    """Compute the entire panchaanga
+  def compute_angas(self, compute_lagnas=True, workers=None):
+    """Compute the entire panchaanga - daily panchaangas for the prior padding days and the period proper. Posterior padding days are computed only when (and if) they are accessed (see day_at).
+
+    :param workers: If more than 1, the period is split into as many chunks, computed in parallel by a pool of these many processes. The result is the same as that of the serial computation (see _compute_daily_panchaangas_in_parallel).
     """
 
     # INITIALISE VARIABLES
     self.date_str_to_panchaanga: Dict[str, daily.DailyPanchaanga] = {}
+    # Retained (but not serialized) for computing posterior padding days later.
+    self._anga_timelines = self._get_anga_timelines()
+    self._lagna_data = None
 
 
     #############################################################
     # Compute all parameters -- sun/moon latitude/longitude etc #
     #############################################################
 
-    for d in range(-self.duration_prior_padding, self.duration_posterior_padding - 1):
-      # The below block is temporary code to make the transition seamless.
-      date_d = time.jd_to_utc_gregorian(self.jd_start + d)
-      date_d.set_time_to_day_start()
-      previous_daily_panchaanga = self.date_str_to_panchaanga.get(date_d.offset_date(days=-1).get_date_str(), None)
-      daily_panchaanga = daily.DailyPanchaanga(city=self.city, date=date_d,
-                                               computation_system=self.computation_system,
-                                               previous_day_panchaanga=previous_daily_panchaanga)
-      if compute_lagnas:
-        daily_panchaanga.get_lagna_data()
-      self.date_str_to_panchaanga[date_d.get_date_str()] = daily_panchaanga
-
-  @methodtools.lru_cache(maxsize=10)
+    dates = self._get_padded_dates(end_index=self.duration_prior_padding + self.duration)
+    sun_rise_set_rows = self._get_sun_rise_set_rows(dates=dates)
+    self._first_day_ordinal = dates[0].to_ordinal_date().ordinal
+
+    # The same daily panchaangas (as in date_str_to_panchaanga), in a list indexed by day offset from the first (padding) day - see _get_day_store.
+    if workers is not None and workers > 1:
+      self._days = self._compute_daily_panchaangas_in_parallel(dates=dates, sun_rise_set_rows=sun_rise_set_rows, anga_timelines=self._anga_timelines, workers=workers)
+    else:
+      self._days = _compute_daily_panchaangas(city=self.city, computation_system=self.computation_system, dates=dates, sun_rise_set_rows=sun_rise_set_rows, anga_timelines=self._anga_timelines)
+    for daily_panchaanga in self._days:
+      self.date_str_to_panchaanga[daily_panchaanga.date.get_date_str()] = daily_panchaanga
+    if compute_lagnas:
+      self._set_lagna_data(daily_panchaangas=self._days)
+
+  @timebudget
+  def _compute_days_till(self, index):
+    """Compute (posterior padding) days till the index-th day of the padded period - continuing from the last computed day. The days are the same as those computed along with the rest of the period."""
+    days = self._get_day_store()
+    if index < len(days):
+      return
+    if getattr(self, "_anga_timelines", None) is None:
+      # Eg. after deserialization.
+      self._anga_timelines = self._get_anga_timelines()
+    dates = self._get_padded_dates(start_index=len(days), end_index=index + 1)
+    new_days = _compute_daily_panchaangas(city=self.city, computation_system=self.computation_system, dates=dates, sun_rise_set_rows=self._get_sun_rise_set_rows(dates=dates), anga_timelines=self._anga_timelines, previous_day_panchaanga=days[-1])
+    for daily_panchaanga in new_days:
+      self.date_str_to_panchaanga[daily_panchaanga.date.get_date_str()] = daily_panchaanga
+    if self.computation_system.festival_options.set_lagnas:
+      self._set_lagna_data(daily_panchaangas=new_days)
+    days.extend(new_days)
+
+  @timebudget
+  def _compute_daily_panchaangas_in_parallel(self, dates, sun_rise_set_rows, anga_timelines, workers):
+    """Compute daily panchaangas for chunks of dates in worker processes - the first day of each chunk without its predecessor.
+
+    A day depends (besides the shared anga_timelines and sun rise/set times) only on its predecessor. So, the initial days of each chunk are recomputed here (in sequence) with the actual predecessor, till one agrees with what the worker computed - the remaining days of the chunk are then exactly what the serial computation would yield. Usually, just one day needs to be recomputed per chunk.
+    """
+    num_chunks = min(workers, len(dates))
+    chunk_boundaries = [len(dates) * chunk_index // num_chunks for chunk_index in range(num_chunks + 1)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+      futures = [executor.submit(_compute_daily_panchaangas_in_worker, util.pickle_dumps(dict(city=self.city, computation_system=self.computation_system, dates=dates[start:end], sun_rise_set_rows=sun_rise_set_rows[start:end], anga_timelines=anga_timelines))) for (start, end) in zip(chunk_boundaries[:-1], chunk_boundaries[1:])]
+      chunks = [pickle.loads(future.result()) for future in futures]
+
+    daily_panchaangas = []
+    for chunk in chunks:
+      for daily_panchaanga in chunk:
+        (daily_panchaanga.city, daily_panchaanga.computation_system, daily_panchaanga._anga_timelines) = (self.city, self.computation_system, anga_timelines)
+      if len(daily_panchaangas) > 0:
+        (chunk, num_recomputed) = _recompute_leading_daily_panchaangas(city=self.city, computation_system=self.computation_system, previous_day_panchaanga=daily_panchaangas[-1], daily_panchaangas=chunk, anga_timelines=anga_timelines)
+        if num_recomputed > 1:
+          logging.debug("Recomputed %d days at the start of a chunk.", num_recomputed)
+      daily_panchaangas.extend(chunk)
+    return daily_panchaangas
+
+  def extend_to(self, end_date, recompute_festivals=True):
+    """Extend the panchaanga till end_date (a Date or a string like 2019-12-31) - computing only the new days, continuing from the current last (padding) day.
+
+    The result is the same as that of constructing the panchaanga afresh for the longer period - except that graha raashi transit times, which are searched for over the padded period (see AngaTimeline.from_transits), may differ within the root finding tolerance (as they do between panchaangas for different periods). Festival assignment is period-wide (eg. festival numbers are counted from the start of the period), so it is redone for the whole period.
+    """
+    end_date = _to_date(end_date)
+    if end_date < self.end_date:
+      raise ValueError("Cannot extend %s back to %s." % (self.end_date, end_date))
+    self._extend_period(start_date=self.start_date, end_date=end_date, recompute_festivals=recompute_festivals)
+
+  def prepend_from(self, start_date, recompute_festivals=True):
+    """Extend the panchaanga back to start_date (a Date or a string like 2019-01-01) - computing only the new days (see extend_to).
+
+    The current first (padding) day, computed without its predecessor, is recomputed with it - as are any subsequent days which then turn out different.
+    """
+    start_date = _to_date(start_date)
+    if self.start_date < start_date:
+      raise ValueError("Cannot extend %s forward to %s." % (self.start_date, start_date))
+    self._extend_period(start_date=start_date, end_date=self.end_date, recompute_festivals=recompute_festivals)
+
+  @timebudget
+  def _extend_period(self, start_date, end_date, recompute_festivals):
+    # Since padding on either side does not shrink as the period grows, the current days are a part of the new padded period.
+    old_days = self._get_day_store()
+    old_first_day_ordinal = self._first_day_ordinal
+    self._set_period(start_date=start_date, end_date=end_date)
+    [first_date] = self._get_padded_dates(end_index=1)
+    self._first_day_ordinal = first_date.to_ordinal_date().ordinal
+    leading_dates = self._get_padded_dates(end_index=old_first_day_ordinal - self._first_day_ordinal)
+    self._anga_timelines = self._get_anga_timelines()
+    self._lagna_data = None
+
+    leading_days = _compute_daily_panchaangas(city=self.city, computation_system=self.computation_system, dates=leading_dates, sun_rise_set_rows=self._get_sun_rise_set_rows(dates=leading_dates), anga_timelines=self._anga_timelines)
+    if len(leading_days) > 0:
+      (old_days, _) = _recompute_leading_daily_panchaangas(city=self.city, computation_system=self.computation_system, previous_day_panchaanga=leading_days[-1], daily_panchaangas=old_days, anga_timelines=self._anga_timelines)
+
+    self._days = leading_days + old_days
+    self.date_str_to_panchaanga = {daily_panchaanga.date.get_date_str(): daily_panchaanga for daily_panchaanga in self._days}
+    if self.computation_system.festival_options.set_lagnas:
+      self._set_lagna_data(daily_panchaangas=self._days)
+    # Trailing days of the period proper - padding days follow as they are accessed.
+    self._compute_days_till(index=self.duration_prior_padding + self.duration - 1)
+    if not self.computation_system.festival_options.no_fests and recompute_festivals:
+      self.update_festival_details()
+
+  @timebudget
+  def _get_lagna_data(self, ayanaamsha_id=Ayanamsha.CHITRA_AT_180):
+    """Compute lagnas for the entire padded period in one go (once)."""
+    if getattr(self, "_lagna_data", None) is None:
+      [last_day_sun_rise_set_jds] = self._get_sun_rise_set_rows(dates=self._get_padded_dates(start_index=self._get_num_padded_days() - 1))
+      self._lagna_data = lagna.get_lagna_data(city=self.city, jd_start=self._get_day_store()[0].jd_sunrise, jd_end=last_day_sun_rise_set_jds["jd_next_sunrise"], ayanaamsha_id=ayanaamsha_id)
+    return self._lagna_data
+
+  def _set_lagna_data(self, daily_panchaangas):
+    """Distribute lagnas for the padded period to the given daily panchaangas (see DailyPanchaanga.get_lagna_data)."""
+    lagna_data = self._get_lagna_data()
+    for daily_panchaanga in daily_panchaangas:
+      daily_panchaanga.lagna_data = lagna.get_lagna_data_slice(lagna_data=lagna_data, jd_start=daily_panchaanga.jd_sunrise, jd_end=daily_panchaanga.jd_next_sunrise)
+
+  @timebudget
+  def _get_sun_rise_set_rows(self, dates):
+    """Compute sun rise and set times for all given dates in one go (see rise_set.get_sunrise_sunset_table).
+    
+    :return: A list of dicts (corresponding to dates). 
+    """
+    if len(dates) == 0:
+      return []
+    timezone = self.city.get_timezone_obj()
+    jd_starts = [timezone.local_time_to_julian_day(date=date) for date in dates]
+    sun_rise_set_table = {key: jds[0].tolist() for (key, jds) in rise_set.get_sunrise_sunset_table(cities=[self.city], jd_starts=jd_starts).items()}
+    return [{key: jds[index] for (key, jds) in sun_rise_set_table.items()} for index in range(len(dates))]
+
+  @timebudget
+  def _get_anga_timelines(self):
+    """Get boundaries of all angas needed by daily panchaangas in the padded period - from the process-wide boundary store, which is shared with panchaangas for other cities and periods.
+    """
+    # A day's margin on either side to cover the sunrises, whatever the timezone.
+    jd_start = self.jd_start - self.duration_prior_padding - 1
+    jd_end = self.jd_start + self.duration_posterior_padding + 1
+    ayanaamsha_id = self.computation_system.ayanaamsha_id
+    anga_timelines = {}
+    for anga_type in [AngaType.NAKSHATRA, AngaType.YOGA, AngaType.KARANA, AngaType.RASHI, AngaType.SIDEREAL_MONTH, AngaType.SOLAR_NAKSH]:
+      # Tithi-like (ie. karaNa) timelines from the store are computed with ASHVINI_STARTING_0, but are no different for other ayanaamsha-s.
+      anga_timelines[(ayanaamsha_id, anga_type.name)] = boundary_store.DEFAULT_STORE.get_timeline(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=jd_start, jd_end=jd_end)
+    # Every tithi boundary is a karaNa boundary. Daily panchaangas look up tithis with ASHVINI_STARTING_0 (since tithi is independent of ayanAmsha).
+    anga_timelines[(Ayanamsha.ASHVINI_STARTING_0, AngaType.TITHI.name)] = anga_timelines[(ayanaamsha_id, AngaType.KARANA.name)].get_coarser_timeline(anga_type=AngaType.TITHI, ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0)
+    # Graha raashi-s change rarely, but possibly backwards (retrograde motion) - which a forward sweep would miss.
+    for anga_type in AngaType.GRAHA_RASHI.values():
+      anga_timelines[(ayanaamsha_id, anga_type.name)] = AngaTimeline.from_transits(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=jd_start, jd_end=jd_end)
+    return anga_timelines
+
+  def _get_day_store(self):
+    """Get daily panchaangas in a list indexed by day offset from the first (padding) day.
+
+    date_str_to_panchaanga is what is serialized - the list is rebuilt from it when necessary (eg. after deserialization).
+    """
+    if getattr(self, "_days", None) is None:
+      daily_panchaangas = sorted(self.date_str_to_panchaanga.values())
+      self._first_day_ordinal = daily_panchaangas[0].date.to_ordinal_date().ordinal
+      self._days = [None] * (daily_panchaangas[-1].date.to_ordinal_date().ordinal - self._first_day_ordinal + 1)
+      for daily_panchaanga in daily_panchaangas:
+        self._days[daily_panchaanga.date.to_ordinal_date().ordinal - self._first_day_ordinal] = daily_panchaanga
+    return self._days
+
+  def day_at(self, date_or_jd):
+    """Get the daily panchaanga for a (local) date - or for the local date of a julian day. Posterior padding days are computed as they are asked for.
+
+    :return: None if out of range.
+    """
+    days = self._get_day_store()
+    if isinstance(date_or_jd, Number):
+      ordinal = self._get_local_day_ordinal(jd=date_or_jd)
+    else:
+      ordinal = date_or_jd.to_ordinal_date().ordinal
+    index = ordinal - self._first_day_ordinal
+    if 0 <= index < len(days):
+      return days[index]
+    elif len(days) <= index < self._get_num_padded_days():
+      self._compute_days_till(index=index)
+      return self._days[index]
+    return None
+
+  def _get_local_day_ordinal(self, jd):
+    timezone = self.city.get_timezone_obj()
+    local_jd = jd + timezone.get_timezone_offset_hours_from_jd(jd) / 24.0 + 0.5
+    day_number = floor(local_jd)
+    if local_jd - day_number < MIDNIGHT_TOLERANCE_DAYS or day_number + 1 - local_jd < MIDNIGHT_TOLERANCE_DAYS:
+      # Let julian_day_to_local_time (which rounds to microseconds) decide.
+      return timezone.julian_day_to_local_time(julian_day=jd).to_ordinal_date().ordinal
+    return day_number - julian_day.ORDINAL_0_JULIAN_DAY_NUMBER
+
   def daily_panchaangas_sorted(self, skip_padding_days=False):
+    """
+    
+    :return: A list of daily panchaangas - computing any remaining (posterior padding) days first. See daily_panchaangas_on_demand for an alternative.
+    """
+    if skip_padding_days:
+      self._compute_days_till(index=self.duration_prior_padding + self.duration - 1)
+    else:
+      self._compute_days_till(index=self._get_num_padded_days() - 1)
+    days = self._get_day_store()
+    if None in days:
+      days = [x for x in days if x is not None]
     if not skip_padding_days:
-      return sorted(self.date_str_to_panchaanga.values())
+      return days
     else:
-      full_list = sorted(self.date_str_to_panchaanga.values())
-      return [x for x in full_list if self.start_date <= x.date and x.date <= self.end_date]
+      return [x for x in days if self.start_date <= x.date and x.date <= self.end_date]
+
+  def daily_panchaangas_on_demand(self):
+    """
+    
+    :return: A sequence of the same daily panchaangas as daily_panchaangas_sorted(), whose (posterior padding) days are computed only as they are accessed.  
+    """
+    return DailyPanchaangaSequence(panchaanga=self)
 
   def daily_panchaanga_for_jd(self, jd):
-    date = self.city.get_timezone_obj().julian_day_to_local_time(julian_day=jd)
-    return self.daily_panchaanga_for_date(date=date)
+    return self.day_at(jd)
 
   def daily_panchaanga_for_date(self, date):
-    return self.date_str_to_panchaanga.get(date.get_date_str(), None)
+    return self.day_at(date)
 
   def pre_sunset_daily_panchaanga_for_jd(self, jd):
     panchaanga = self.daily_panchaanga_for_jd(jd=jd)
@@ -122,30 +423,15 @@ class Panchaanga(common.JsonObject):
       return self.daily_panchaanga_for_date(date=panchaanga.date - 1)
 
   def get_interval_anga_spans(self, date, interval_id, anga_type):
-    dp = self.daily_panchaanga_for_date(date)
-    (anga_spans, _) = dp.get_interval_anga_spans(interval_id=interval_id, anga_type=anga_type)
-    anga_spans = copy.deepcopy(anga_spans)
-
-    if anga_type == AngaType.TITHI:
-      for span in anga_spans:
-        if span.anga.index in (1, 2):
-          # The below is necessary because tithi 1 or 2 may start after sunrise.
-          dp_next = self.daily_panchaanga_for_date(date + 1)
-          # Lunar month below may be incorrect (adhika mAsa complication) if dp_next is not available (eg when the next day is beyond this panchaanga duration). Downstream code should be aware of that case.
-          month = dp_next.lunar_month_sunrise if dp_next is not None else dp.lunar_month_sunrise + 1
-          span.anga = Tithi.from_anga(anga=span.anga, month=month)
-        else:
-          span.anga = Tithi.from_anga(anga=span.anga, month=dp.lunar_month_sunrise)
-
-    return anga_spans
+    return get_interval_anga_spans(get_daily_panchaanga=self.daily_panchaanga_for_date, date=date, interval_id=interval_id, anga_type=anga_type)
 
   def clear_padding_day_festivals(self):
     """Festival assignments for padding days are not trustworthy - since one would need to look-ahead or before into further days for accurate festival assignment. They were computed only to ensure accurate computation of the core days in this panchaanga. To avoid misleading, we ought to clear festivals provisionally assigned to the padding days."""
-    daily_panchaangas = self.daily_panchaangas_sorted()
-    for dp in daily_panchaangas[:self.duration_prior_padding]:
-      self.delete_festivals_on_date(date=dp.date)
-    for dp in daily_panchaangas[self.duration_prior_padding + self.duration:]:
-      self.delete_festivals_on_date(date=dp.date)
+    # Padding days yet to be computed have no festivals.
+    daily_panchaangas = self._get_day_store()
+    for dp in daily_panchaangas[:self.duration_prior_padding] + daily_panchaangas[self.duration_prior_padding + self.duration:]:
+      if dp is not None:
+        self.delete_festivals_on_date(date=dp.date)
 
   @timebudget
   def update_festival_details(self, compute_shraadha_tithis=False):
@@ -156,18 +442,16 @@ class Panchaanga(common.JsonObject):
     """
     self._reset_festivals()
     rule_lookup_assigner = rule_repo_based.RuleLookupAssigner(panchaanga=self)
-    rule_lookup_assigner.apply_festival_from_rules_repos()
+    steps = rule_lookup_assigner.get_steps()
     if compute_shraadha_tithis:
-      ShraddhaTithiAssigner(panchaanga=self).assign_shraaddha_tithi()
-    ecliptic.EclipticFestivalAssigner(panchaanga=self).assign_all()
-    tithi_festival.TithiFestivalAssigner(panchaanga=self).assign_all()
-    solar.SolarFestivalAssigner(panchaanga=self).assign_all()
-    vaara.VaraFestivalAssigner(panchaanga=self).assign_all()
+      steps.append(ShraddhaTithiAssigner(panchaanga=self).assign_shraaddha_tithi)
+    for applier_class in FESTIVAL_ASSIGNER_CLASSES:
+      steps.extend(applier_class(panchaanga=self).get_steps())
     generic_assigner = FestivalAssigner(panchaanga=self)
-    generic_assigner.cleanup_festivals()
-    rule_lookup_assigner.assign_relative_festivals()
+    steps.extend([generic_assigner.cleanup_festivals, rule_lookup_assigner.assign_relative_festivals, generic_assigner.assign_festival_numbers])
+    # Consecutive DayHook-s (per-day assignments) are applied together, in a single pass over the days.
+    apply_steps(panchaanga=self, steps=steps)
     # self._sync_festivals_dict_and_daily_festivals(here_to_daily=True, daily_to_here=True)
-    generic_assigner.assign_festival_numbers()
     self.clear_padding_day_festivals()
 
 
@@ -177,9 +461,9 @@ class Panchaanga(common.JsonObject):
         for fest_day in days:
           if not isinstance(fest_day, Date):
             logging.fatal(festival_id + " " + str(days))
-          fest_day_str = fest_day.get_date_str()
-          if fest_day_str in self.date_str_to_panchaanga and festival_id not in self.date_str_to_panchaanga[fest_day_str].festival_id_to_instance:
-            self.date_str_to_panchaanga[fest_day_str].festival_id_to_instance[festival_id] =  FestivalInstance(name=festival_id)
+          fest_day_panchaanga = self.day_at(fest_day)
+          if fest_day_panchaanga is not None and festival_id not in fest_day_panchaanga.festival_id_to_instance:
+            fest_day_panchaanga.festival_id_to_instance[festival_id] =  FestivalInstance(name=festival_id)
 
     if daily_to_here:
       for dp in self.date_str_to_panchaanga.values():
@@ -196,18 +480,19 @@ class Panchaanga(common.JsonObject):
 
   def delete_festival(self, fest_id):
     for date in self.festival_id_to_days.pop(fest_id, []):
-      self.date_str_to_panchaanga[date.get_date_str()].festival_id_to_instance.pop(fest_id, None)
+      self.day_at(date).festival_id_to_instance.pop(fest_id, None)
 
   def add_festival(self, fest_id, date, interval_id="full_day"):
-    if date.get_date_str() not in self.date_str_to_panchaanga:
+    daily_panchaanga = self.day_at(date)
+    if daily_panchaanga is None:
       return 
-    interval = self.date_str_to_panchaanga[date.get_date_str()].get_interval(interval_id=interval_id)
+    interval = daily_panchaanga.get_interval(interval_id=interval_id)
     self.add_festival_instance(date=date, festival_instance=FestivalInstance(name=fest_id, interval=interval))
 
   def add_festival_instance(self, festival_instance, date):
     from jyotisha.panchaanga.temporal.festival import rules
     festival_instance.name = rules.clean_id(id=festival_instance.name)
-    p_fday = self.date_str_to_panchaanga.get(date.get_date_str(), None)
+    p_fday = self.day_at(date)
     if p_fday is not None:
       p_fday.festival_id_to_instance[festival_instance.name] = festival_instance
     self.festival_id_to_days[festival_instance.name].add(date)
@@ -217,11 +502,11 @@ class Panchaanga(common.JsonObject):
     if len(self.festival_id_to_days[fest_id]) == 0:
       # Avoid empty items (when serializing).
       self.delete_festival(fest_id=fest_id)
-    self.date_str_to_panchaanga[date.get_date_str()].festival_id_to_instance.pop(fest_id, None)
+    self.day_at(date).festival_id_to_instance.pop(fest_id, None)
 
   def delete_festivals_on_date(self, date):
     # Reason for casting to list below: Avoid RuntimeError: dictionary changed size during iteration
-    dp = self.date_str_to_panchaanga[date.get_date_str()]
+    dp = self.day_at(date)
     for fest_id in list(dp.festival_id_to_instance.keys()):
       self.delete_festival_date(fest_id=fest_id, date=dp.date)
 
@@ -245,8 +530,24 @@ class Panchaanga(common.JsonObject):
     self._refill_daily_panchaangas()
     self.festival_id_to_days = collection_helper.lists_to_sets(self.festival_id_to_days)
 
+  def to_json_map(self, floating_point_precision=None):
+    # The serialized form includes all padding days, however many were accessed.
+    self._compute_days_till(index=self._get_num_padded_days() - 1)
+    return super(Panchaanga, self).to_json_map(floating_point_precision=floating_point_precision)
+
+  def compute_graha_rise_set_jds(self, bodies=None):
+    """See DailyPanchaanga.compute_graha_rise_set_jds."""
+    for daily_panchaanga in self.daily_panchaangas_sorted():
+      daily_panchaanga.compute_graha_rise_set_jds(bodies=bodies)
+
   @timebudget
-  def dump_to_file(self, filename, floating_point_precision=None, sort_keys=True):
+  def dump_to_file(self, filename, floating_point_precision=None, sort_keys=True, graha_rise_set_bodies=()):
+    """
+    
+    :param graha_rise_set_bodies: Bodies whose rise and set times are to be included for every day (see compute_graha_rise_set_jds; None means all) - besides those already computed.
+    """
+    self._compute_days_till(index=self._get_num_padded_days() - 1)
+    self.compute_graha_rise_set_jds(bodies=graha_rise_set_bodies)
     self._force_non_redundancy_in_daily_panchaangas()
     self.festival_id_to_days = collection_helper.sets_to_lists(self.festival_id_to_days)
     super(Panchaanga, self).dump_to_file(filename=filename, floating_point_precision=floating_point_precision,
@@ -255,5 +556,24 @@ class Panchaanga(common.JsonObject):
     self._refill_daily_panchaangas()
 
 
+class DailyPanchaangaSequence(collections.abc.Sequence):
+  """Daily panchaangas of a Panchaanga (including padding days), as in daily_panchaangas_sorted() - with (posterior padding) days computed only as they are accessed (see Panchaanga.day_at)."""
+  def __init__(self, panchaanga):
+    self.panchaanga = panchaanga
+
+  def __len__(self):
+    return self.panchaanga._get_num_padded_days()
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("Day %d is out of range." % index)
+    self.panchaanga._compute_days_till(index=index)
+    return self.panchaanga._get_day_store()[index]
+
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
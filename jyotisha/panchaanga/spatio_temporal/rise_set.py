@@ -0,0 +1,189 @@
+"""
+Batch computation of rising and setting times, for many days and many cities at once.
+
+City.get_rising_time and City.get_setting_time call swe.rise_trans once per event. Here, with the same (Hindu rising - see CALC_RISE) convention of the centre of the disc (without refraction, ignoring ecliptic latitude) crossing the geocentric horizon, an event is where the hour angle H of the body satisfies cos(H) = -tan(latitude) tan(declination). We sample the ephemeris once per day (over the whole date range, shared by all cities), interpolate it, and solve the above equation for all (city, day) pairs simultaneously with a few secant iterations on numpy arrays. The result (within a few milliseconds of the exact solution for the moon, and much closer for the sun) is then refined with a Newton iteration evaluating swisseph at the solution - ie. 3 cheap swisseph calls per event rather than a swe.rise_trans call.
+
+Results agree with swe.rise_trans (over 2019, for Chennai and Orinda) to within ~0.5 millisecond for the sun, and ~35 milliseconds for the moon. At higher latitudes, swe.rise_trans is itself less accurate.
+"""
+import math
+
+import numpy
+import swisseph as swe
+
+from jyotisha.panchaanga.temporal.body import Graha
+
+# Degrees per (UT) day - the rate of the earth rotation angle.
+SIDEREAL_RATE = 360.98564736629
+MAX_ITERATIONS = 8
+TOLERANCE_DAYS = 1e-10
+RATE_STEP_DAYS = 1e-3
+
+
+def _get_right_ascensions_and_declinations(longitudes, obliquities):
+  # For points on the ecliptic (ie. ignoring the ecliptic latitude).
+  (longitudes, obliquities) = (numpy.radians(longitudes), numpy.radians(obliquities))
+  right_ascensions = numpy.degrees(numpy.arctan2(numpy.sin(longitudes) * numpy.cos(obliquities), numpy.cos(longitudes)))
+  declinations = numpy.degrees(numpy.arcsin(numpy.sin(longitudes) * numpy.sin(obliquities)))
+  return (right_ascensions, declinations)
+
+
+class _ExactEphemeris(object):
+  """Evaluates swisseph at every instant."""
+
+  def __init__(self, body):
+    self.body_id = Graha.singleton(body)._get_swisseph_id()
+
+  def get_right_ascensions_and_declinations(self, jds):
+    # Bypassing Graha.get_longitude (and its caching), for speed.
+    longitudes = numpy.array([swe.calc_ut(jd, self.body_id)[0][0] for jd in jds.flat]).reshape(jds.shape)
+    obliquities = numpy.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in jds.flat]).reshape(jds.shape)
+    return _get_right_ascensions_and_declinations(longitudes=longitudes, obliquities=obliquities)
+
+  def get_sidereal_angles(self, jds):
+    """Greenwich apparent sidereal time, in degrees."""
+    return numpy.array([swe.sidtime(jd) * 15 for jd in jds.flat]).reshape(jds.shape)
+
+
+class InterpolatedSiderealFrame(object):
+  """Daily samples of the obliquity and the sidereal time - interpolated for arbitrary instants. Also used for computing lagna-s."""
+
+  def __init__(self, jd_start, jd_end):
+    self.jd_start = math.floor(jd_start) - 1
+    self.grid = self.jd_start + numpy.arange(int(math.ceil(jd_end)) + 2 - self.jd_start)
+    self.obliquities = numpy.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in self.grid])
+    # Sidereal time less the uniform rotation - varies slowly (due to nutation).
+    self.sidereal_offsets = numpy.unwrap((numpy.array([swe.sidtime(jd) * 15 for jd in self.grid]) - SIDEREAL_RATE * (self.grid - self.jd_start)) % 360, period=360)
+
+  def get_obliquities(self, jds):
+    (indices, x) = self._get_indices_and_fractions(jds)
+    return self.obliquities[indices] * (1 - x) + self.obliquities[indices + 1] * x
+
+  def get_sidereal_angles(self, jds):
+    """Greenwich apparent sidereal time, in degrees."""
+    (indices, x) = self._get_indices_and_fractions(jds)
+    offsets = self.sidereal_offsets[indices] * (1 - x) + self.sidereal_offsets[indices + 1] * x
+    return offsets + SIDEREAL_RATE * (jds - self.jd_start)
+
+  def _get_indices_and_fractions(self, jds):
+    # nan-s (for events which do not occur) are mapped to arbitrary indices.
+    indices = numpy.clip(numpy.floor(numpy.nan_to_num(jds - self.jd_start)).astype(int), 0, len(self.grid) - 2)
+    return (indices, jds - self.grid[indices])
+
+
+class _InterpolatedEphemeris(InterpolatedSiderealFrame):
+  """Daily samples of the longitude (and speed) of a body, the obliquity and the sidereal time - interpolated for arbitrary instants."""
+
+  def __init__(self, body, jd_start, jd_end):
+    super(_InterpolatedEphemeris, self).__init__(jd_start=jd_start, jd_end=jd_end)
+    graha = Graha.singleton(body)
+    longitudes_and_speeds = numpy.array([graha.get_longitude_and_speed(jd=jd) for jd in self.grid])
+    self.longitudes = numpy.unwrap(longitudes_and_speeds[:, 0], period=360)
+    self.speeds = longitudes_and_speeds[:, 1]
+    # Degrees per day, roughly.
+    self.mean_hour_angle_rate = SIDEREAL_RATE - numpy.mean(self.speeds)
+
+  def get_right_ascensions_and_declinations(self, jds):
+    (indices, x) = self._get_indices_and_fractions(jds)
+    # Cubic Hermite interpolation of the longitude.
+    (l_0, l_1) = (self.longitudes[indices], self.longitudes[indices + 1])
+    (s_0, s_1) = (self.speeds[indices], self.speeds[indices + 1])
+    longitudes = (2 * x ** 3 - 3 * x ** 2 + 1) * l_0 + (x ** 3 - 2 * x ** 2 + x) * s_0 + (-2 * x ** 3 + 3 * x ** 2) * l_1 + (x ** 3 - x ** 2) * s_1
+    return _get_right_ascensions_and_declinations(longitudes=longitudes, obliquities=self.get_obliquities(jds))
+
+
+def _get_event_times(ephemeris, exact_ephemeris, latitudes, longitudes, jd_starts, rising):
+  """Solve for the first rising (or setting) after jd_starts - using the interpolated ephemeris, and then refining with a Newton iteration with exact_ephemeris.
+
+  :param latitudes: Array (broadcastable against jd_starts).
+  :param longitudes: Array (broadcastable against jd_starts).
+  :return: An array with the shape of jd_starts - nan where the body does not rise or set.
+  """
+  sign = -1 if rising else 1
+  tan_latitudes = numpy.tan(numpy.radians(latitudes))
+
+  def get_hour_angle_error(jds, ephemeris=ephemeris):
+    # Positive values are degrees by which the hour angle overshoots that of the event.
+    (right_ascensions, declinations) = ephemeris.get_right_ascensions_and_declinations(jds)
+    with numpy.errstate(invalid="ignore"):
+      event_hour_angles = sign * numpy.degrees(numpy.arccos(-tan_latitudes * numpy.tan(numpy.radians(declinations))))
+    return ephemeris.get_sidereal_angles(jds) + longitudes - right_ascensions - event_hour_angles
+
+  def solve(jds):
+    # Secant iterations (with errors wrapped to [-180, 180)). Note that the body moves eastward by ~1°/day (sun) to ~15°/day (moon).
+    errors = (get_hour_angle_error(jds) + 180) % 360 - 180
+    jds_next = jds - errors / ephemeris.mean_hour_angle_rate
+    for _ in range(MAX_ITERATIONS):
+      errors_next = (get_hour_angle_error(jds_next) + 180) % 360 - 180
+      with numpy.errstate(invalid="ignore", divide="ignore"):
+        rates = numpy.where(jds_next != jds, (errors_next - errors) / (jds_next - jds), ephemeris.mean_hour_angle_rate)
+      (jds, errors) = (jds_next, errors_next)
+      jds_next = jds - errors / rates
+      if not numpy.any(numpy.abs(jds_next - jds) > TOLERANCE_DAYS):
+        break
+    return jds_next
+
+  period = 360 / ephemeris.mean_hour_angle_rate
+  # First guess - wait for the required hour angle, ignoring the motion of the body.
+  jds = solve(jd_starts + (-get_hour_angle_error(jd_starts) % 360) / ephemeris.mean_hour_angle_rate)
+  # The motion of the body may make us converge to an event before jd_starts, or skip one just after jd_starts.
+  jds = numpy.where(jds < jd_starts, solve(jds + period), jds)
+  earlier_jds = solve(jds - period)
+  jds = numpy.where((earlier_jds >= jd_starts) & (earlier_jds < jds - period / 2), earlier_jds, jds)
+  # Refine with a Newton step - with the (interpolated) local rate of change. The exact ephemeris cannot be evaluated at nan-s (for events which do not occur), so it is evaluated at the start of the ephemeris instead for those.
+  is_finite = numpy.isfinite(jds)
+  jds_to_refine = numpy.where(is_finite, jds, ephemeris.jd_start)
+  rates = (get_hour_angle_error(jds_to_refine + RATE_STEP_DAYS) - get_hour_angle_error(jds_to_refine)) / RATE_STEP_DAYS
+  refined_jds = jds_to_refine - ((get_hour_angle_error(jds_to_refine, ephemeris=exact_ephemeris) + 180) % 360 - 180) / rates
+  return numpy.where(is_finite, refined_jds, numpy.nan)
+
+
+def get_rising_times(cities, jd_starts, body=Graha.SUN):
+  """Vectorized version of City.get_rising_time.
+
+  :param cities: A list of cities.
+  :param jd_starts: Array of shape (len(cities), num_days), or (num_days) if common to all cities.
+  :return: Array of shape (len(cities), num_days) - with the first rising after the corresponding jd_start (nan where there is none - unlike the 0.0 of City.get_rising_time).
+  """
+  return _get_rise_or_set_times(cities=cities, jd_starts=jd_starts, body=body, rising=True)
+
+
+def get_setting_times(cities, jd_starts, body=Graha.SUN):
+  """Vectorized version of City.get_setting_time.
+
+  :param cities: A list of cities.
+  :param jd_starts: Array of shape (len(cities), num_days), or (num_days) if common to all cities.
+  :return: Array of shape (len(cities), num_days) - with the first setting after the corresponding jd_start (nan where there is none - unlike the 0.0 of City.get_setting_time).
+  """
+  return _get_rise_or_set_times(cities=cities, jd_starts=jd_starts, body=body, rising=False)
+
+
+def _get_rise_or_set_times(cities, jd_starts, body, rising):
+  if body == Graha.KETU:
+    # Ketu rises when rahu sets.
+    return _get_rise_or_set_times(cities=cities, jd_starts=jd_starts, body=Graha.RAHU, rising=not rising)
+  jd_starts = numpy.broadcast_to(numpy.asarray(jd_starts, dtype=float), (len(cities), numpy.shape(jd_starts)[-1]))
+  # jd_starts may themselves be nan-s - eg. settings after sunrises which do not occur.
+  if not numpy.any(numpy.isfinite(jd_starts)):
+    return numpy.full(jd_starts.shape, numpy.nan)
+  # Events fall within a couple of days after jd_starts.
+  ephemeris = _InterpolatedEphemeris(body=body, jd_start=numpy.nanmin(jd_starts), jd_end=numpy.nanmax(jd_starts) + 2)
+  latitudes = numpy.array([[city.latitude] for city in cities])
+  longitudes = numpy.array([[city.longitude] for city in cities])
+  return _get_event_times(ephemeris=ephemeris, exact_ephemeris=_ExactEphemeris(body=body), latitudes=latitudes, longitudes=longitudes, jd_starts=jd_starts, rising=rising)
+
+
+def get_sunrise_sunset_table(cities, jd_starts):
+  """Get sun rise and set times needed by daily panchaangas (see DailyPanchaanga.compute_graha_transitions).
+
+  :param cities: A list of cities.
+  :param jd_starts: Array of shape (len(cities), num_days), or (num_days) if common to all cities - typically local midnights.
+  :return: A dict of arrays of shape (len(cities), num_days) - with keys jd_sunrise (first sunrise after jd_starts), jd_sunset, jd_next_sunrise and jd_previous_sunset.
+  """
+  jd_sunrises = get_rising_times(cities=cities, jd_starts=jd_starts)
+  jd_sunsets = get_setting_times(cities=cities, jd_starts=jd_sunrises)
+  return {
+    "jd_sunrise": jd_sunrises,
+    "jd_sunset": jd_sunsets,
+    "jd_next_sunrise": get_rising_times(cities=cities, jd_starts=jd_sunsets),
+    "jd_previous_sunset": get_setting_times(cities=cities, jd_starts=jd_sunrises - 1),
+  }
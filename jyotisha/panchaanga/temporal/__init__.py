@@ -21,15 +21,87 @@ MAX_SZ = MAX_DAYS_PER_YEAR + 6  # plus one and minus one are usually necessary
 
 class PeriodicPanchaangaApplier(JsonObject):
   """Objects of this type apply various temporal attributes to panchAnga-s."""
+
   def __init__(self, panchaanga):
     super().__init__()
     self.panchaanga = panchaanga
     self.computation_system = panchaanga.computation_system
-    self.daily_panchaangas = self.panchaanga.daily_panchaangas_sorted()
+    self.daily_panchaangas = self.panchaanga.daily_panchaangas_on_demand()
     self.ayanaamsha_id = panchaanga.computation_system.ayanaamsha_id
 
+  def get_steps(self):
+    """
+    
+    :return: The steps assign_all applies (in order) - DayHook-s and functions to be applied to the whole period. See apply_steps.
+    """
+    return []
+
   def assign_all(self):
-    pass
+    apply_steps(panchaanga=self.panchaanga, steps=self.get_steps())
+
+
+class DayHook(object):
+  """A function which assigns attributes (eg. festivals) for a single day, given its index d in panchaanga.daily_panchaangas_sorted(). apply_steps applies consecutive hooks together, in a single pass over the days.
+  
+  The function may read or write festivals only on days d - look_behind to d + look_ahead - other than festivals which it alone assigns (in that pass). Other attributes of days may be read anywhere.
+  """
+  def __init__(self, function, look_behind=0, look_ahead=0, prior_padding_days=False, posterior_padding_days=False, setup=None):
+    """
+
+    :param function: Called with the day index d.
+    :param prior_padding_days: Whether to apply the function to the prior padding days as well (not just to days in the period).
+    :param posterior_padding_days: Whether to apply the function to the posterior padding days as well.
+    :param setup: Called before the function is applied to the first day - to initialize any state kept across days.
+    """
+    self.function = function
+    self.look_behind = look_behind
+    self.look_ahead = look_ahead
+    self.prior_padding_days = prior_padding_days
+    self.posterior_padding_days = posterior_padding_days
+    self.setup = setup
+
+  def get_day_range(self, panchaanga):
+    start = 0 if self.prior_padding_days else panchaanga.duration_prior_padding
+    end = panchaanga.duration_prior_padding + panchaanga.duration
+    if self.posterior_padding_days:
+      end = len(panchaanga.daily_panchaangas_on_demand())
+    return range(start, end)
+
+
+def _apply_day_hooks(panchaanga, day_hooks):
+  """Apply the hooks in one pass over the days - with the same result as applying them one after another over all days.
+  
+  Hook i trails the pass by lag_i days, so that every day it may access is done with by the preceding hooks (and untouched by them hereafter): lag_i = max over j < i of (lag_j + look_behind_j) + look_ahead_i.
+  """
+  lags = []
+  for hook in day_hooks:
+    lags.append(max([lag + earlier_hook.look_behind + hook.look_ahead for (lag, earlier_hook) in zip(lags, day_hooks)], default=0))
+  day_ranges = [hook.get_day_range(panchaanga=panchaanga) for hook in day_hooks]
+  for hook in day_hooks:
+    if hook.setup is not None:
+      hook.setup()
+  for position in range(min(day_range.start for day_range in day_ranges), max(day_range.stop + lag for (day_range, lag) in zip(day_ranges, lags))):
+    for (hook, day_range, lag) in zip(day_hooks, day_ranges, lags):
+      if position - lag in day_range:
+        hook.function(position - lag)
+
+
+def apply_steps(panchaanga, steps):
+  """Apply the steps in order - consecutive DayHook-s being applied together, in a single pass over the days (see _apply_day_hooks). Other steps are functions applied to the whole period (taking no arguments).
+
+  Padding days are computed as hooks reach them (see Panchaanga.daily_panchaangas_on_demand).
+  """
+  day_hooks = []
+  for step in steps:
+    if isinstance(step, DayHook):
+      day_hooks.append(step)
+      continue
+    if len(day_hooks) > 0:
+      _apply_day_hooks(panchaanga=panchaanga, day_hooks=day_hooks)
+      day_hooks = []
+    step()
+  if len(day_hooks) > 0:
+    _apply_day_hooks(panchaanga=panchaanga, day_hooks=day_hooks)
 
 
 def get_2_day_interval_boundary_angas(kaala, anga_type, p0, p1):
@@ -52,7 +124,7 @@ def get_2_day_interval_boundary_angas(kaala, anga_type, p0, p1):
 
 
 class FestivalOptions(JsonObject):
-  def __init__(self, set_lagnas=None, no_fests=None, fest_repos=None, fest_ids_included_unimplemented=None, fest_ids_excluded_unimplemented=None, fest_repos_excluded_patterns=None, aparaahna_as_second_half=False, prefer_eight_fold_day_division=False, set_pancha_paxi_activities=None, julian_handling=RulesCollection.JULIAN_TO_GREGORIAN):
+  def __init__(self, set_lagnas=None, no_fests=None, fest_repos=None, fest_ids_included_unimplemented=None, fest_ids_excluded_unimplemented=None, fest_repos_excluded_patterns=None, aparaahna_as_second_half=False, prefer_eight_fold_day_division=False, set_pancha_paxi_activities=None, julian_handling=RulesCollection.JULIAN_TO_GREGORIAN, graha_rise_set_bodies=None):
     """
     
     :param set_lagnas: 
@@ -64,6 +136,7 @@ class FestivalOptions(JsonObject):
     :param prefer_eight_fold_day_division: 
     :param set_pancha_paxi_activities: 
     :param julian_handling: 
+    :param graha_rise_set_bodies: Bodies whose rise and set times are computed along with daily panchaangas (and hence serialized). None (the default) means none - rise and set times are computed upon access (see DailyPanchaanga.get_graha_rise_jd). To serialize all of them, see periodical.Panchaanga.dump_to_file.
     """
     super().__init__()
     self.set_lagnas = set_lagnas
@@ -79,6 +152,7 @@ class FestivalOptions(JsonObject):
 
     self.prefer_eight_fold_day_division = prefer_eight_fold_day_division
     self.julian_handling = julian_handling
+    self.graha_rise_set_bodies = graha_rise_set_bodies
 
   def init_repos(self):
     if not hasattr(self, "repos") or self.repos is None:
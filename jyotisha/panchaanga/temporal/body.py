@@ -3,12 +3,18 @@ import math
 import sys
 
 import methodtools
+import numpy
 import swisseph as swe
 from scipy.optimize import brentq
 
 from sanskrit_data.schema import common
 from sanskrit_data.schema.common import JsonObject
 
+from jyotisha.util import default_if_none
+
+# About 0.1 milliseconds.
+DEFAULT_ROOT_TOLERANCE_DAYS = 1e-9
+
 
 class Transit(JsonObject):
   def __init__(self, body, jd, anga_type, value_1, value_2):
@@ -34,6 +40,11 @@ class Graha(JsonObject):
 
   BODY_TO_ANGULAR_DIA_DEGREES = {SUN: .53, JUPITER: 0.0147222, VENUS: 0.0183333, SATURN: 0.005583, MARS: 0.006972, MERCURY: 0.00361111}
 
+  # Transit searches (see get_transits) - steps shorter than half the shortest retrograde (or direct) phase, so that a step never spans two stations. The sun, the moon and the mean nodes have no stations.
+  MAX_TRANSIT_STEP_DAYS = {SUN: 30, MOON: 30, MERCURY: 8, VENUS: 15, MARS: 25, JUPITER: 45, SATURN: 45, RAHU: 360, KETU: 360}
+  DEFAULT_MAX_TRANSIT_STEP_DAYS = 1.0
+  MAX_TRANSIT_ARC_DEGREES = 90
+
   @methodtools.lru_cache(maxsize=None)
   @classmethod
   def singleton(cls, body_name):
@@ -71,14 +82,62 @@ class Graha(JsonObject):
     :param ayanaamsha_id: 
     Default value of ayanaamsha_id here is deliberately None.
     :return: 
+    
+    Uses fitted polynomials (see chebyshev_ephemeris module) if jd falls within a fitted span.
     """
+    if chebyshev_ephemeris.is_active():
+      longitude = chebyshev_ephemeris.get_longitude(body_name=self.body_name, jd=jd, ayanaamsha_id=ayanaamsha_id)
+      if longitude is not None:
+        return longitude
     if ayanaamsha_id is not None:
       from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
       return (self.get_longitude(jd=jd) - Ayanamsha.singleton(ayanaamsha_id).get_offset(jd)) % 360
+    else:
+      # Speed comes for free with the ephemeris computation; and root finders need it at the same instants.  
+      return self.get_longitude_and_speed(jd=jd)[0]
+
+  @methodtools.lru_cache(maxsize=10)
+  def get_longitude_and_speed(self, jd, ayanaamsha_id=None):
+    """
+    
+    :param jd: 
+    :param ayanaamsha_id: 
+    Default value of ayanaamsha_id here is deliberately None.
+    :return: (longitude, speed in degrees per day). The (~50"/year) rate of change of the ayanaamsha is ignored. 
+    """
+    if chebyshev_ephemeris.is_active():
+      longitude_and_speed = chebyshev_ephemeris.get_longitude_and_speed(body_name=self.body_name, jd=jd, ayanaamsha_id=ayanaamsha_id)
+      if longitude_and_speed is not None:
+        return longitude_and_speed
+    if ayanaamsha_id is not None:
+      from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+      (longitude, speed) = self.get_longitude_and_speed(jd=jd)
+      return ((longitude - Ayanamsha.singleton(ayanaamsha_id).get_offset(jd)) % 360, speed)
     else:
       if self.body_name == Graha.KETU:
-        return (swe.calc_ut(jd, swe._RAHU)[0][0] + 180) % 360
-      return swe.calc_ut(jd, self._get_swisseph_id())[0][0]
+        position = _calc_ut(jd, swe._RAHU)
+        return ((position[0] + 180) % 360, position[3])
+      position = _calc_ut(jd, self._get_swisseph_id())
+      return (position[0], position[3])
+
+  def get_longitudes(self, jds, ayanaamsha_id=None):
+    """Vectorized version of get_longitude - useful for evaluating many instants in one go (bracketing scans, plotting, analytics).
+    
+    :param jds: A sequence (preferably a numpy array) of julian days.
+    :param ayanaamsha_id: 
+    Default value of ayanaamsha_id here is deliberately None.
+    :return: A numpy array of longitudes, corresponding to jds.
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    if self.body_name == Graha.KETU:
+      longitudes = (_calc_longitudes(jds=jds, body_id=swe._RAHU) + 180) % 360
+    else:
+      longitudes = _calc_longitudes(jds=jds, body_id=self._get_swisseph_id())
+    if ayanaamsha_id is not None:
+      from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+      return (longitudes - Ayanamsha.singleton(ayanaamsha_id).get_offsets(jds)) % 360
+    else:
+      return longitudes
 
   @methodtools.lru_cache(maxsize=10)
   def get_longitude_anga(self, jd):
@@ -86,62 +145,122 @@ class Graha(JsonObject):
     return Anga(index=self.get_longitude(jd=jd) + 1, anga_type_id=AngaType.DEGREE.name)
 
   def get_transits(self, jd_start: float, jd_end: float, ayanaamsha_id: str, anga_type: object) -> [Transit]:
-    """Returns the next transit of the given planet e.g. jupiter
+    """Returns all transits of the given planet e.g. jupiter, across boundaries of anga_type (eg. raashi-s) - including those due to retrograde motion.
 
+    We step by the current speed of the body (never more than MAX_TRANSIT_ARC_DEGREES at a time, nor more than MAX_TRANSIT_STEP_DAYS, so that a step contains at most one station). Stations (where the speed changes sign) are located, so that the longitude is monotonic in every piece searched - and all boundaries crossed in a piece can be found by root finding, however close together they may be. 
+    
       Args:
         float jd_start, jd_end: The Julian Days between which transits must be computed
-        int planet  - e.g. sun, jupiter, ...
     
       Returns:
-        List of tuples [(float jd_transit, int old_rashi, int new_rashi)]
-    
-      
+        List of Transit objects, in chronological order.
     """
-
     transits = []
-    arc_length = anga_type.arc_length
-    MIN_JUMP = min(1.0, jd_end - jd_start)
-    # TODO: Could be tweaked based on planet using a dict?
-
-    curr_L_bracket = jd_start
-    curr_R_bracket = jd_start + MIN_JUMP
-
-    while curr_R_bracket <= jd_end:
-      L_division = math.floor(self.get_longitude(curr_L_bracket,
-                                                     ayanaamsha_id=ayanaamsha_id) / arc_length) + 1
-      R_division = math.floor(self.get_longitude(curr_R_bracket,
-                                                     ayanaamsha_id=ayanaamsha_id) / arc_length) + 1
-
-      if L_division == R_division:
-        curr_R_bracket += MIN_JUMP
+    jd = jd_start
+    (longitude, speed) = self.get_longitude_and_speed(jd=jd, ayanaamsha_id=ayanaamsha_id)
+    while jd < jd_end:
+      step = min(Graha.MAX_TRANSIT_STEP_DAYS.get(self.body_name, Graha.DEFAULT_MAX_TRANSIT_STEP_DAYS), Graha.MAX_TRANSIT_ARC_DEGREES / max(abs(speed), 1e-6))
+      jd_next = min(jd + step, jd_end)
+      (longitude_next, speed_next) = self.get_longitude_and_speed(jd=jd_next, ayanaamsha_id=ayanaamsha_id)
+      if (speed < 0) != (speed_next < 0):
+        # noinspection PyTypeChecker
+        jd_station = brentq(lambda x: self.get_longitude_and_speed(jd=x, ayanaamsha_id=ayanaamsha_id)[1], jd, jd_next)
+        longitude_station = self.get_longitude(jd=jd_station, ayanaamsha_id=ayanaamsha_id)
+        transits += self._get_monotonic_transits(jd_start=jd, jd_end=jd_station, longitude_start=longitude, longitude_end=longitude_station, ayanaamsha_id=ayanaamsha_id, anga_type=anga_type)
+        transits += self._get_monotonic_transits(jd_start=jd_station, jd_end=jd_next, longitude_start=longitude_station, longitude_end=longitude_next, ayanaamsha_id=ayanaamsha_id, anga_type=anga_type)
       else:
-        # We have bracketed a transit!
-        if L_division < R_division:
-          target = R_division
-        else:
-          # retrograde transit
-          target = L_division
-        try:
-          def get_longitude_offset(jd):
-            return self.get_longitude(jd=jd, ayanaamsha_id=ayanaamsha_id) + (-target + 1) * arc_length
-
-          # noinspection PyTypeChecker
-          jd_transit = \
-            brentq(get_longitude_offset,
-                   curr_L_bracket, curr_R_bracket)
-          transits += [Transit(body=self.body_name, jd=jd_transit, anga_type=anga_type.name, value_1=L_division, value_2=R_division)]
-          curr_R_bracket += MIN_JUMP
-          curr_L_bracket = jd_transit + MIN_JUMP
-        except ValueError:
-          logging.error('Unable to compute transit of planet;\
-                                   possibly could not bracket correctly!\n')
-          return None
+        transits += self._get_monotonic_transits(jd_start=jd, jd_end=jd_next, longitude_start=longitude, longitude_end=longitude_next, ayanaamsha_id=ayanaamsha_id, anga_type=anga_type)
+      (jd, longitude, speed) = (jd_next, longitude_next, speed_next)
 
     if len(transits) == 0:
       from jyotisha.panchaanga.temporal.time import ist_timezone
       logging.info("Could not find a transit of %s between %s (%f) and %s (%f)", self.body_name, ist_timezone.julian_day_to_local_time_str(jd_start), jd_start, ist_timezone.julian_day_to_local_time_str(jd_end), jd_end)
     return transits
 
+  def _get_monotonic_transits(self, jd_start, jd_end, longitude_start, longitude_end, ayanaamsha_id, anga_type):
+    """Transits between jd_start and jd_end, assuming that the longitude changes monotonically (by less than 180 degrees) in between."""
+    arc_length = anga_type.arc_length
+    num_angas = anga_type.num_angas
+    # Unwrapped longitude change.
+    longitude_end = longitude_start + (longitude_end - longitude_start + 180) % 360 - 180
+    if longitude_end >= longitude_start:
+      boundary_indices = range(math.floor(longitude_start / arc_length) + 1, math.floor(longitude_end / arc_length) + 1)
+    else:
+      boundary_indices = range(math.floor(longitude_start / arc_length), math.floor(longitude_end / arc_length), -1)
+    transits = []
+    for boundary_index in boundary_indices:
+      boundary = boundary_index * arc_length
+
+      def get_longitude_offset_and_speed(jd):
+        (longitude, speed) = self.get_longitude_and_speed(jd=jd, ayanaamsha_id=ayanaamsha_id)
+        return ((longitude - boundary + 180) % 360 - 180, speed)
+
+      # Linear interpolation is a good first guess.
+      jd_guess = jd_start + (jd_end - jd_start) * (boundary - longitude_start) / (longitude_end - longitude_start)
+      jd_transit = find_root(get_longitude_offset_and_speed, jd_start, jd_end, jd_guess=jd_guess)
+      (anga_before, anga_after) = ((boundary_index - 1) % num_angas + 1, boundary_index % num_angas + 1)
+      if longitude_end < longitude_start:
+        (anga_before, anga_after) = (anga_after, anga_before)
+      transits.append(Transit(body=self.body_name, jd=jd_transit, anga_type=anga_type.name, value_1=anga_before, value_2=anga_after))
+    return transits
+
+
+def find_root(fn, jd1, jd2, jd_guess=None, tolerance=DEFAULT_ROOT_TOLERANCE_DAYS, max_iterations=10):
+  """Find a root of fn in [jd1, jd2] by Newton-Raphson iterations (clamped to the interval), falling back to brentq if they do not converge.
+  
+  Since fn also yields the rate of change (ie. the actual rather than mean motion), the very first step lands within a few minutes of the root; and 3-4 evaluations of fn typically suffice - brentq needs 6-12.
+  
+  :param fn: Returns (value, derivative) at a given jd.
+  :param jd_guess: Initial estimate. Defaults to jd2.
+  :param tolerance: In days. Iterations stop when the Newton step is smaller than this.
+  :return: 
+  :raises ValueError: if falling back to brentq, and fn(jd1) and fn(jd2) have the same sign.
+  """
+  jd = default_if_none(jd_guess, jd2)
+  for _ in range(max_iterations):
+    (value, derivative) = fn(jd)
+    if derivative == 0:
+      break
+    step = value / derivative
+    jd_next = jd - step
+    if abs(step) < tolerance and jd1 <= jd_next <= jd2:
+      return jd_next
+    jd_next = min(max(jd_next, jd1), jd2)
+    if jd_next == jd:
+      # Pushed beyond an end of the interval, once again.
+      break
+    jd = jd_next
+  logging.debug("Newton iterations did not converge between %f and %f. Falling back to brentq.", jd1, jd2)
+  # noinspection PyTypeChecker
+  return brentq(lambda x: fn(x)[0], jd1, jd2)
+
+
+# Imported here to avoid a circular import.
+from jyotisha.panchaanga.temporal import chebyshev_ephemeris
+
+
+# Instrumentation - see get_ephemeris_call_count().
+_ephemeris_call_count = 0
+
+
+def get_ephemeris_call_count():
+  """Number of swe.calc_ut calls made (via this module) so far - useful for measuring the cost of searches independent of machine speed.  
+  """
+  return _ephemeris_call_count
+
+
+def _calc_ut(jd, body_id):
+  # Default flags include FLG_SPEED.
+  global _ephemeris_call_count
+  _ephemeris_call_count += 1
+  return swe.calc_ut(jd, body_id)[0]
+
+
+def _calc_longitudes(jds, body_id):
+  # swe.calc_ut does not accept arrays. We still avoid the per-call overhead of caching and object creation.
+  global _ephemeris_call_count
+  _ephemeris_call_count += len(jds)
+  return numpy.fromiter((swe.calc_ut(jd, body_id)[0][0] for jd in jds), dtype=float, count=len(jds))
 
 
 def longitude_difference(jd, body1, body2):
@@ -161,5 +280,18 @@ def get_star_longitude(star, jd):
   (long, lat, _, _, _, _) = swe.fixstar_ut(star, jd)[0]
   return long
 
+
+def get_star_longitudes(star, jds):
+  """Vectorized version of get_star_longitude.
+  
+  :param star: Example: Spica. 
+  :param jds: A sequence (preferably a numpy array) of julian days.
+  :return: A numpy array of longitudes, corresponding to jds.
+  """
+  from jyotisha.panchaanga.temporal import data
+  import os
+  swe.set_ephe_path(os.path.dirname(data.__file__))
+  return numpy.fromiter((swe.fixstar_ut(star, jd)[0][0] for jd in jds), dtype=float, count=len(jds))
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
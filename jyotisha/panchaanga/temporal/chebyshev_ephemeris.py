@@ -0,0 +1,187 @@
+"""
+Optional piecewise-Chebyshev ephemeris for sun and moon longitudes.
+
+Almost every anga search evaluates the sun and moon longitudes (via swe.calc_ut) dozens of times per day. Within a fitted span, this module lets Graha.get_longitude evaluate a low degree polynomial instead.
+
+Error bound: Longitudes are sampled at Chebyshev nodes of SEGMENT_DAYS long segments (after unwrapping across 360°) and fit with polynomials of degree DEGREE. With the defaults (4 day segments, degree 11), the maximum deviation from swisseph - measured at the time of fitting at intermediate points and stored in ChebyshevEphemeris.max_error - is ~1e-8° for the moon and ~1e-9° for the sun (i.e. below a millisecond of anga end times), which is the noise floor of swisseph itself. Fitting raises a ValueError if the measured error exceeds the tolerance.
+
+Usage:
+  with chebyshev_ephemeris.fitted_span(jd_start=jd_start, jd_end=jd_end, ayanaamsha_ids=[Ayanamsha.CHITRA_AT_180]):
+    panchaanga = periodical.Panchaanga(...)
+"""
+import contextlib
+import logging
+import math
+
+import numpy
+from numpy.polynomial import chebyshev
+
+from jyotisha.panchaanga.temporal.body import Graha
+
+SEGMENT_DAYS = 4
+DEGREE = 11
+DEFAULT_TOLERANCE_DEGREES = 1e-6
+FITTED_BODIES = (Graha.SUN, Graha.MOON)
+
+# (body_name, ayanaamsha_id) -> list of ChebyshevEphemeris objects
+_fits = {}
+
+
+def _get_fit_key(body_name, ayanaamsha_id):
+  from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+  if ayanaamsha_id in (Ayanamsha.VERNAL_EQUINOX_AT_0, Ayanamsha.ASHVINI_STARTING_0):
+    # Zero offset - the tropical fit serves.
+    ayanaamsha_id = None
+  return (body_name, ayanaamsha_id)
+
+
+class ChebyshevEphemeris(object):
+  """Piecewise Chebyshev fit to the (unwrapped) longitude of a body over [jd_start, jd_end]."""
+
+  def __init__(self, body_name, jd_start, jd_end, ayanaamsha_id=None, segment_days=SEGMENT_DAYS, degree=DEGREE, tolerance=DEFAULT_TOLERANCE_DEGREES):
+    """
+
+    :param body_name: Graha.SUN etc..
+    :param ayanaamsha_id: None for tropical longitudes.
+    :param tolerance: Max permissible deviation (in degrees) from swisseph.
+    """
+    self.body_name = body_name
+    self.ayanaamsha_id = ayanaamsha_id
+    self.segment_days = segment_days
+    self.jd_start = jd_start
+    self.num_segments = max(1, int(math.ceil((jd_end - jd_start) / segment_days)))
+    self.jd_end = jd_start + self.num_segments * segment_days
+
+    graha = Graha.singleton(body_name)
+    num_nodes = degree + 1
+    nodes = numpy.cos(numpy.pi * (numpy.arange(num_nodes) + 0.5) / num_nodes)
+    # Check points lie between the nodes, where the interpolation error peaks.
+    check_points = numpy.linspace(-1, 1, 2 * num_nodes + 1)[1::2]
+    segment_starts = jd_start + numpy.arange(self.num_segments) * segment_days
+    node_jds = (segment_starts[:, None] + (nodes[None, :] + 1) * segment_days / 2).ravel()
+    check_jds = (segment_starts[:, None] + (check_points[None, :] + 1) * segment_days / 2).ravel()
+    longitudes = graha.get_longitudes(numpy.concatenate((node_jds, check_jds)), ayanaamsha_id=ayanaamsha_id)
+    node_longitudes = numpy.unwrap(longitudes[:len(node_jds)].reshape(self.num_segments, num_nodes), period=360, axis=1)
+    check_longitudes = longitudes[len(node_jds):].reshape(self.num_segments, len(check_points))
+
+    self.coefficients = numpy.array([chebyshev.chebfit(nodes, segment_longitudes, degree) for segment_longitudes in node_longitudes])
+    # Degrees per day.
+    self.speed_coefficients = numpy.array([chebyshev.chebder(c) * 2 / segment_days for c in self.coefficients])
+    errors = (chebyshev.chebval(check_points, self.coefficients.T) - check_longitudes + 180) % 360 - 180
+    self.max_error = float(numpy.abs(errors).max())
+    if self.max_error > tolerance:
+      raise ValueError("Chebyshev fit error %g for %s exceeds tolerance %g" % (self.max_error, body_name, tolerance))
+
+  def covers(self, jd):
+    return self.jd_start <= jd <= self.jd_end
+
+  def _get_segment_index_and_x(self, jd):
+    segment_index = min(int((jd - self.jd_start) / self.segment_days), self.num_segments - 1)
+    x = 2 * (jd - self.jd_start - segment_index * self.segment_days) / self.segment_days - 1
+    return (segment_index, x)
+
+  def get_longitude(self, jd):
+    (segment_index, x) = self._get_segment_index_and_x(jd)
+    return _evaluate(self.coefficients[segment_index], x) % 360
+
+  def get_longitude_and_speed(self, jd):
+    """
+
+    :return: (longitude, speed in degrees per day)
+    """
+    (segment_index, x) = self._get_segment_index_and_x(jd)
+    return (_evaluate(self.coefficients[segment_index], x) % 360, _evaluate(self.speed_coefficients[segment_index], x))
+
+  def get_longitudes(self, jds):
+    jds = numpy.asarray(jds, dtype=float)
+    segment_indices = numpy.minimum(((jds - self.jd_start) // self.segment_days).astype(int), self.num_segments - 1)
+    x = 2 * (jds - self.jd_start - segment_indices * self.segment_days) / self.segment_days - 1
+    coefficients = self.coefficients[segment_indices]
+    b_1 = b_2 = numpy.zeros(len(jds))
+    for c in coefficients[:, :0:-1].T:
+      b_1, b_2 = 2 * x * b_1 - b_2 + c, b_1
+    return (x * b_1 - b_2 + coefficients[:, 0]) % 360
+
+
+def _evaluate(coefficients, x):
+  # Clenshaw recurrence - faster than chebyshev.chebval for scalars.
+  b_1 = b_2 = 0.0
+  for c in coefficients[:0:-1]:
+    b_1, b_2 = 2 * x * b_1 - b_2 + c, b_1
+  return x * b_1 - b_2 + coefficients[0]
+
+
+def _get_covering_fit(body_name, jd, ayanaamsha_id):
+  for fit in _fits.get(_get_fit_key(body_name=body_name, ayanaamsha_id=ayanaamsha_id), ()):
+    if fit.covers(jd):
+      return fit
+  return None
+
+
+def get_longitude(body_name, jd, ayanaamsha_id=None):
+  """Evaluate a fitted longitude, if available.
+
+  :return: None if jd is not covered by any fit.
+  """
+  fit = _get_covering_fit(body_name=body_name, jd=jd, ayanaamsha_id=ayanaamsha_id)
+  return None if fit is None else fit.get_longitude(jd)
+
+
+def get_longitude_and_speed(body_name, jd, ayanaamsha_id=None):
+  """Evaluate a fitted longitude and its rate of change, if available.
+
+  :return: None if jd is not covered by any fit.
+  """
+  fit = _get_covering_fit(body_name=body_name, jd=jd, ayanaamsha_id=ayanaamsha_id)
+  return None if fit is None else fit.get_longitude_and_speed(jd)
+
+
+def is_active():
+  return len(_fits) > 0
+
+
+def fit_span(jd_start, jd_end, ayanaamsha_ids=(), bodies=FITTED_BODIES, **kwargs):
+  """Fit and register tropical (and sidereal, for the given ayanaamsha_ids) longitudes of bodies over [jd_start, jd_end].
+
+  :return: The list of new ChebyshevEphemeris objects.
+  """
+  new_fits = []
+  for body_name in bodies:
+    for ayanaamsha_id in set([None] + [_get_fit_key(body_name=body_name, ayanaamsha_id=x)[1] for x in ayanaamsha_ids]):
+      fit = ChebyshevEphemeris(body_name=body_name, ayanaamsha_id=ayanaamsha_id, jd_start=jd_start, jd_end=jd_end, **kwargs)
+      _fits.setdefault((body_name, ayanaamsha_id), []).append(fit)
+      new_fits.append(fit)
+      logging.debug("Fit %s (%s) over %f-%f with max error %g", body_name, ayanaamsha_id, jd_start, jd_end, fit.max_error)
+  _clear_longitude_caches()
+  return new_fits
+
+
+def remove_fits(fits):
+  for fit in fits:
+    key = (fit.body_name, fit.ayanaamsha_id)
+    _fits[key].remove(fit)
+    if len(_fits[key]) == 0:
+      del _fits[key]
+  _clear_longitude_caches()
+
+
+def clear():
+  _fits.clear()
+  _clear_longitude_caches()
+
+
+def _clear_longitude_caches():
+  # Cached values would anyway be within the error bound; but results should not depend on evaluation order.
+  for body_name in FITTED_BODIES:
+    Graha.singleton(body_name).get_longitude.cache_clear()
+    Graha.singleton(body_name).get_longitude_and_speed.cache_clear()
+
+
+@contextlib.contextmanager
+def fitted_span(jd_start, jd_end, ayanaamsha_ids=(), bodies=FITTED_BODIES, **kwargs):
+  """Use fitted longitudes within the with block."""
+  fits = fit_span(jd_start=jd_start, jd_end=jd_end, ayanaamsha_ids=ayanaamsha_ids, bodies=bodies, **kwargs)
+  try:
+    yield fits
+  finally:
+    remove_fits(fits)
@@ -0,0 +1,188 @@
+"""
+A global catalogue of eclipses - built once per century (and cached on disk), so that panchaangas for different cities and years need not search for eclipses afresh.
+
+swe.sol_eclipse_when_loc and swe.lun_eclipse_when_loc search forward until they find an eclipse visible at the given location - which may be years away. But the list of candidate eclipses is the same everywhere. So, the catalogue lists all eclipses, along with coarse samples of the geocentric positions of the sun and the moon during each. Eclipses which are clearly invisible at a location are then excluded with a few numpy operations; and the exact local circumstances are computed (with a search starting just before the eclipse) only for the rest - see get_local_eclipses.
+"""
+import json
+import logging
+import os
+from math import ceil, floor
+
+import numpy
+import swisseph as swe
+
+from jyotisha import util
+
+SOLAR = "solar"
+LUNAR = "lunar"
+
+# Centuries are counted from J2000.0.
+EPOCH_JD = 2451545.0
+CENTURY_DAYS = 36525
+SAMPLE_INTERVAL_DAYS = 1 / 96.0
+MAX_HALF_DURATION_DAYS = 0.15
+CATALOGUE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = "~/Documents/jyotisha/eclipses"
+
+EARTH_RADIUS_AU = 6378.137 / 149597870.7
+SUN_RADIUS_AU = 696000 / 149597870.7
+MOON_RADIUS_AU = 1737.4 / 149597870.7
+# Visibility checks are made at samples up to SAMPLE_INTERVAL_DAYS / 2 away from any instant. In the meantime, the topocentric separation of the sun and the moon changes by less than 0.1 degree, and altitudes change by less than 2 degrees. We allow some more margin.
+SEPARATION_MARGIN_DEGREES = 0.15
+ALTITUDE_MARGIN_DEGREES = 3
+
+# Indices (in what swe.*_eclipse_when returns) of the global maximum, and of the beginning and end of the eclipse (penumbral, in case of lunar eclipses).
+_MAX_START_END_INDICES = {SOLAR: (0, 2, 3), LUNAR: (0, 6, 7)}
+
+
+def _get_equatorial_positions(jds, body_id):
+  # (right ascension, declination, distance in AU) for each jd.
+  return [list(swe.calc_ut(jd, body_id, swe.FLG_EQUATORIAL)[0][:3]) for jd in jds]
+
+
+def _compute_eclipses(eclipse_type, century):
+  """Find all eclipses of the given type in the given century, with samples of positions (see _may_be_visible)."""
+  find_next = swe.sol_eclipse_when_glob if eclipse_type == SOLAR else swe.lun_eclipse_when
+  jd = EPOCH_JD + century * CENTURY_DAYS
+  jd_end = jd + CENTURY_DAYS
+  eclipses = []
+  while True:
+    times = find_next(jd)[1]
+    (jd_max, jd_eclipse_start, jd_eclipse_end) = [times[index] for index in _MAX_START_END_INDICES[eclipse_type]]
+    if jd_max >= jd_end:
+      break
+    if jd_eclipse_start == 0 or jd_eclipse_end == 0:
+      # Not reported by swisseph for some marginal partial eclipses.
+      (jd_eclipse_start, jd_eclipse_end) = (jd_max - MAX_HALF_DURATION_DAYS, jd_max + MAX_HALF_DURATION_DAYS)
+    sample_jds = numpy.linspace(jd_eclipse_start, jd_eclipse_end, int(ceil((jd_eclipse_end - jd_eclipse_start) / SAMPLE_INTERVAL_DAYS)) + 1).tolist()
+    eclipse = {"jd_max": jd_max, "jd_start": jd_eclipse_start, "jd_end": jd_eclipse_end, "sample_jds": sample_jds, "sidereal_angles": [swe.sidtime(sample_jd) * 15 for sample_jd in sample_jds], "moon": _get_equatorial_positions(jds=sample_jds, body_id=swe.MOON)}
+    if eclipse_type == SOLAR:
+      eclipse["sun"] = _get_equatorial_positions(jds=sample_jds, body_id=swe.SUN)
+    eclipses.append(eclipse)
+    # Consecutive eclipses of a type are at least ~2 weeks apart.
+    jd = jd_eclipse_end + 1
+  return eclipses
+
+
+class EclipseCatalogue(object):
+  def __init__(self, cache_dir=None):
+    """
+
+    :param cache_dir: If not None, centuries are also persisted to (and read from) this directory.
+    """
+    self.cache_dir = cache_dir
+    self._centuries = {}
+
+  def get_eclipses(self, eclipse_type, jd_start, jd_end):
+    """Get eclipses with (global) maxima between jd_start and jd_end, in chronological order.
+
+    :param eclipse_type: SOLAR or LUNAR.
+    :return: A list of dicts with keys jd_max, jd_start, jd_end (the global beginning and end), and samples used by _may_be_visible.
+    """
+    eclipses = []
+    for century in range(int(floor((jd_start - EPOCH_JD) / CENTURY_DAYS)), int(floor((jd_end - EPOCH_JD) / CENTURY_DAYS)) + 1):
+      eclipses.extend([eclipse for eclipse in self._get_century(eclipse_type=eclipse_type, century=century) if jd_start <= eclipse["jd_max"] <= jd_end])
+    return eclipses
+
+  def _get_century(self, eclipse_type, century):
+    key = (eclipse_type, century)
+    if key not in self._centuries:
+      eclipses = self._read_century(key=key)
+      if eclipses is None:
+        logging.info("Building the %s eclipse catalogue for century %d (from J2000).", eclipse_type, century)
+        eclipses = _compute_eclipses(eclipse_type=eclipse_type, century=century)
+        self._write_century(key=key, eclipses=eclipses)
+      self._centuries[key] = eclipses
+    return self._centuries[key]
+
+  def _get_century_path(self, key):
+    return os.path.join(os.path.expanduser(self.cache_dir), "%s__%d.json" % key)
+
+  def _read_century(self, key):
+    if self.cache_dir is None:
+      return None
+    path = self._get_century_path(key=key)
+    if not os.path.exists(path):
+      return None
+    try:
+      with open(path) as f:
+        catalogue_dict = json.load(f)
+      if catalogue_dict["version"] != CATALOGUE_FORMAT_VERSION:
+        return None
+      return catalogue_dict["eclipses"]
+    except (ValueError, KeyError):
+      logging.warning("Ignoring corrupt eclipse catalogue file %s", path)
+      return None
+
+  def _write_century(self, key, eclipses):
+    if self.cache_dir is None:
+      return
+    path = self._get_century_path(key=key)
+    try:
+      util.write_file_atomically(filename=path, content=json.dumps({"version": CATALOGUE_FORMAT_VERSION, "eclipses": eclipses}))
+    except EnvironmentError:
+      logging.warning("Not able to save the eclipse catalogue to %s.", path)
+
+  def clear(self):
+    """Clear the in-memory catalogue (not the on-disk one)."""
+    self._centuries.clear()
+
+
+# The process-wide catalogue.
+DEFAULT_CATALOGUE = EclipseCatalogue(cache_dir=DEFAULT_CACHE_DIR)
+
+
+def _get_vectors(positions):
+  # Geocentric equatorial cartesian coordinates (in AU) from (right ascension, declination, distance) rows.
+  positions = numpy.array(positions)
+  (right_ascensions, declinations) = (numpy.radians(positions[:, 0]), numpy.radians(positions[:, 1]))
+  return positions[:, 2:3] * numpy.stack([numpy.cos(declinations) * numpy.cos(right_ascensions), numpy.cos(declinations) * numpy.sin(right_ascensions), numpy.sin(declinations)], axis=1)
+
+
+def _get_angles(vectors_1, vectors_2):
+  cosines = numpy.sum(vectors_1 * vectors_2, axis=1) / (numpy.linalg.norm(vectors_1, axis=1) * numpy.linalg.norm(vectors_2, axis=1))
+  return numpy.degrees(numpy.arccos(numpy.clip(cosines, -1, 1)))
+
+
+def _may_be_visible(eclipse, eclipse_type, latitude, longitude):
+  """A conservative check - False only if the eclipse is certainly not visible at the given location.
+
+  A lunar eclipse is visible wherever the moon is above the horizon (at some point during the penumbral phase). A solar eclipse is visible where (at some point) the sun is above the horizon, and the discs of the sun and the moon (as seen from there) overlap.
+  """
+  local_sidereal_angles = numpy.radians(numpy.array(eclipse["sidereal_angles"]) + longitude)
+  latitude = numpy.radians(latitude)
+  # Unit vectors towards the zenith.
+  zenith_vectors = numpy.stack([numpy.cos(latitude) * numpy.cos(local_sidereal_angles), numpy.cos(latitude) * numpy.sin(local_sidereal_angles), numpy.full(len(local_sidereal_angles), numpy.sin(latitude))], axis=1)
+  moon_vectors = _get_vectors(eclipse["moon"])
+  if eclipse_type == LUNAR:
+    # Geocentric altitudes exceed topocentric ones.
+    return bool(numpy.any(90 - _get_angles(moon_vectors, zenith_vectors) > -ALTITUDE_MARGIN_DEGREES))
+  sun_vectors = _get_vectors(eclipse["sun"]) - EARTH_RADIUS_AU * zenith_vectors
+  moon_vectors = moon_vectors - EARTH_RADIUS_AU * zenith_vectors
+  radii_sums = numpy.degrees(numpy.arcsin(SUN_RADIUS_AU / numpy.linalg.norm(sun_vectors, axis=1)) + numpy.arcsin(MOON_RADIUS_AU / numpy.linalg.norm(moon_vectors, axis=1)))
+  overlapping = _get_angles(sun_vectors, moon_vectors) < radii_sums + SEPARATION_MARGIN_DEGREES
+  sun_up = 90 - _get_angles(sun_vectors, zenith_vectors) > -ALTITUDE_MARGIN_DEGREES
+  return bool(numpy.any(overlapping & sun_up))
+
+
+def get_local_eclipses(eclipse_type, latitude, longitude, jd_start, jd_end, catalogue=None):
+  """Get eclipses visible at the given location, with (local) maxima between jd_start and jd_end.
+
+  :param eclipse_type: SOLAR or LUNAR.
+  :param catalogue: Defaults to DEFAULT_CATALOGUE.
+  :return: A list of local circumstances - each as returned by swe.sol_eclipse_when_loc (or swe.lun_eclipse_when_loc).
+  """
+  if catalogue is None:
+    catalogue = DEFAULT_CATALOGUE
+  find_next = swe.sol_eclipse_when_loc if eclipse_type == SOLAR else swe.lun_eclipse_when_loc
+  local_eclipses = []
+  # Local maxima are within hours of the global maxima.
+  for eclipse in catalogue.get_eclipses(eclipse_type=eclipse_type, jd_start=jd_start - 1, jd_end=jd_end + 1):
+    if not _may_be_visible(eclipse=eclipse, eclipse_type=eclipse_type, latitude=latitude, longitude=longitude):
+      continue
+    local_eclipse = find_next(eclipse["jd_start"] - 1, lon=longitude, lat=latitude)
+    jd_max = local_eclipse[1][0]
+    # If the eclipse is not visible after all, the search would have proceeded to a later one.
+    if jd_max <= eclipse["jd_end"] and jd_start <= jd_max <= jd_end:
+      local_eclipses.append(local_eclipse)
+  return local_eclipses
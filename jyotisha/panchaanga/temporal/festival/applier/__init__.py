@@ -14,6 +14,9 @@ DATA_ROOT = os.path.join(os.path.dirname(festival.__file__), "data")
 
 
 class FestivalAssigner(PeriodicPanchaangaApplier):
+  # Festivals with rules which RuleLookupAssigner assigns - but which methods of this class (eg. cleanup_festivals) also assign by their own logic, rename or remove. See festival_query.OVERRIDDEN_FEST_IDS.
+  OVERRIDDEN_FEST_IDS = {'mahA~kArttikI'}
+
   def __init__(self, panchaanga):
     super(FestivalAssigner, self).__init__(panchaanga=panchaanga)
     self.festival_id_to_days = panchaanga.festival_id_to_days
@@ -70,7 +73,7 @@ class FestivalAssigner(PeriodicPanchaangaApplier):
             logging.debug('Festival %s is only in the future!' % festival_name)
             self.panchaanga.delete_festival_date(fest_id=festival_name, date=assigned_day)
           else:
-            self.panchaanga.date_str_to_panchaanga[assigned_day.get_date_str()].festival_id_to_instance[festival_name].ordinal = fest_num
+            self.panchaanga.day_at(assigned_day).festival_id_to_instance[festival_name].ordinal = fest_num
 
   def cleanup_festivals(self):
     # If tripurotsava coincides with maha kArttikI (kRttikA nakShatram)
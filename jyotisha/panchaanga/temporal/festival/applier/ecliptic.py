@@ -13,10 +13,8 @@ from sanskrit_data.schema import common
 from indic_transliteration import sanscript
 
 class EclipticFestivalAssigner(FestivalAssigner):
-  def assign_all(self):
-    self.set_jupiter_transits()
-    self.compute_solar_eclipses()
-    self.compute_lunar_eclipses()
+  def get_steps(self):
+    return [self.set_jupiter_transits, self.compute_solar_eclipses, self.compute_lunar_eclipses]
     # for graha1 in [Graha.MOON, Graha.JUPITER, Graha.VENUS, Graha.MERCURY, Graha.MARS, Graha.SATURN, Graha.RAHU]:
     #   for graha2 in [Graha.MOON, Graha.JUPITER, Graha.VENUS, Graha.MERCURY, Graha.MARS, Graha.SATURN, Graha.RAHU]:
     #     if graha1 > graha2:
@@ -69,64 +67,46 @@ class EclipticFestivalAssigner(FestivalAssigner):
   def compute_solar_eclipses(self):
     if 'sUrya-grahaNam' not in self.rules_collection.name_to_rule:
       return 
-    jd = self.panchaanga.jd_start
-    while 1:
-      next_eclipse_sol = self.panchaanga.city.get_solar_eclipse_time(jd_start=jd)
-      # compute offset from UTC
-      jd = next_eclipse_sol[1][0]
+    # Local circumstances of eclipses in the (global) catalogue - see City.get_solar_eclipses_in_period.
+    for next_eclipse_sol in self.panchaanga.city.get_solar_eclipses_in_period(jd_start=self.panchaanga.jd_start, jd_end=self.panchaanga.jd_end + 2):
       jd_eclipse_solar_start = next_eclipse_sol[1][1]
       jd_eclipse_solar_end = next_eclipse_sol[1][4]
       # -1 is to not miss an eclipse that occurs after sunset on 31-Dec!
       if jd_eclipse_solar_start > self.panchaanga.jd_end + 1:
         break
+      fday = int(jd_eclipse_solar_end - self.daily_panchaangas[0].julian_day_start)
+      suff = 'a'
+      if (jd_eclipse_solar_start < self.daily_panchaangas[fday].jd_sunrise):
+        # Grastodaya
+        suff = 'Odaya'
+        jd_eclipse_solar_start = self.daily_panchaangas[fday].jd_sunrise
+      if jd_eclipse_solar_end > self.daily_panchaangas[fday].jd_sunset:
+        # Grastastamana
+        suff = 'Astamana'
+        jd_eclipse_solar_end = self.daily_panchaangas[fday].jd_sunset
+      if jd_eclipse_solar_start == 0.0 or jd_eclipse_solar_end == 0.0:
+        continue
+      if abs (Graha.singleton(Graha.SUN).get_longitude(jd_eclipse_solar_end) - Graha.singleton(Graha.RAHU).get_longitude(
+          jd_eclipse_solar_end)) < 5:
+        grasta = 'rAhugrast'
       else:
-        fday = int(jd_eclipse_solar_end - self.daily_panchaangas[0].julian_day_start)
-        suff = 'a'
-        if (jd_eclipse_solar_start < self.daily_panchaangas[fday].jd_sunrise):
-          # Grastodaya
-          suff = 'Odaya'
-          jd_eclipse_solar_start = self.daily_panchaangas[fday].jd_sunrise
-        if jd_eclipse_solar_end > self.daily_panchaangas[fday].jd_sunset:
-          # Grastastamana
-          suff = 'Astamana'
-          jd_eclipse_solar_end = self.daily_panchaangas[fday].jd_sunset
-        if jd_eclipse_solar_start == 0.0 or jd_eclipse_solar_end == 0.0:
-          # Move towards the next eclipse... at least the next new
-          # moon (>=25 days away)
-          jd += MIN_DAYS_NEXT_ECLIPSE
-          continue
-        if abs (Graha.singleton(Graha.SUN).get_longitude(jd_eclipse_solar_end) - Graha.singleton(Graha.RAHU).get_longitude(
-            jd_eclipse_solar_end)) < 5:
-          grasta = 'rAhugrast'
-        else:
-          grasta = 'kEtugrast'
-        solar_eclipse_str = 'sUrya-grahaNaM~(' + grasta + suff + ')'
-        if self.daily_panchaangas[fday].date.get_weekday() == 0:
-          solar_eclipse_str = '★cUDAmaNi-' + solar_eclipse_str
-        fest = FestivalInstance(name=solar_eclipse_str, interval=Interval(jd_start=jd_eclipse_solar_start, jd_end=jd_eclipse_solar_end))
+        grasta = 'kEtugrast'
+      solar_eclipse_str = 'sUrya-grahaNaM~(' + grasta + suff + ')'
+      if self.daily_panchaangas[fday].date.get_weekday() == 0:
+        solar_eclipse_str = '★cUDAmaNi-' + solar_eclipse_str
+      fest = FestivalInstance(name=solar_eclipse_str, interval=Interval(jd_start=jd_eclipse_solar_start, jd_end=jd_eclipse_solar_end))
       self.panchaanga.add_festival_instance(festival_instance=fest, date=self.daily_panchaangas[fday].date)
-      jd = jd + MIN_DAYS_NEXT_ECLIPSE
 
   def compute_lunar_eclipses(self):
     if '★cUDAmaNi-candra-grahaNam' not in self.rules_collection.name_to_rule:
       return
-      # Set location
-    jd = self.panchaanga.jd_start
-    
-    while 1:
-      next_eclipse_lun = self.panchaanga.city.get_lunar_eclipse_time(jd)
-      jd = next_eclipse_lun[1][0]
+    # Local circumstances of eclipses in the (global) catalogue - see City.get_lunar_eclipses_in_period.
+    for next_eclipse_lun in self.panchaanga.city.get_lunar_eclipses_in_period(jd_start=self.panchaanga.jd_start, jd_end=self.panchaanga.jd_end):
       jd_eclipse_lunar_start = next_eclipse_lun[1][2]
       jd_eclipse_lunar_end = next_eclipse_lun[1][3]
 
-      if jd > self.panchaanga.jd_end:
-        break
-
       if jd_eclipse_lunar_start == 0.0 and jd_eclipse_lunar_end == 0.0:
         # 0.0 is returned in case of eclipses when the moon is below the horizon.
-        # Move towards the next eclipse... at least the next full
-        # moon (>=25 days away)
-        jd += MIN_DAYS_NEXT_ECLIPSE
         continue
 
       suff = 'a'
@@ -166,7 +146,6 @@ class EclipticFestivalAssigner(FestivalAssigner):
 
       fest = FestivalInstance(name=lunar_eclipse_str, interval=Interval(jd_start=jd_eclipse_lunar_start, jd_end=jd_eclipse_lunar_end))
       self.panchaanga.add_festival_instance(festival_instance=fest, date=self.daily_panchaangas[fday].date)
-      jd += MIN_DAYS_NEXT_ECLIPSE
 
   def set_jupiter_transits(self):
     if 'guru-saGkrAntiH' not in self.rules_collection.name_to_rule:
@@ -207,8 +186,5 @@ class EclipticFestivalAssigner(FestivalAssigner):
             self.panchaanga.add_festival(
               fest_id='%s-antya-puSkara-ArambhaH' % names.NAMES['PUSHKARA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][rashi1], date=self.daily_panchaangas[fday_pushkara].date - 12)
 
-
-MIN_DAYS_NEXT_ECLIPSE = 25
-
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
@@ -2,11 +2,64 @@ import logging
 
 from timebudget import timebudget
 
-from jyotisha.panchaanga.temporal import Anga, AngaType
+from jyotisha.panchaanga.temporal import Anga, AngaType, DayHook
+from jyotisha.panchaanga.temporal.festival import rules
 from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner
 from jyotisha.panchaanga.temporal.festival.rules import RulesRepo
 
 
+def check_lunar_month_match(fday_date, fest_rule, fest_days):
+  """
+
+  :param fest_days: Days to which the festival has been assigned so far.
+  """
+  month_match = False
+  adhika_maasa_handling = fest_rule.timing.get_adhika_maasa_handling()
+  if adhika_maasa_handling == 'adhika_and_nija':
+    if fday_date.month == fest_rule.timing.month_number - 0.5 or fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0:
+      month_match = True
+  elif adhika_maasa_handling == 'adhika_only':
+    if int(fday_date.month) != fday_date.month and (fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0):
+      month_match = True
+  elif adhika_maasa_handling == 'adhika_if_exists':
+    if fday_date.month == fest_rule.timing.month_number - 0.5 and len(fest_days) == 0:
+      month_match = True
+  elif adhika_maasa_handling == 'nija_only':
+    if fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0:
+      month_match = True
+
+  return month_match
+
+
+def should_assign_festival(p_fday, fest_rule, fest_days):
+  """Whether a festival decided (by priority_decision.decide) to fall on p_fday is to be assigned to it.
+
+  :param fest_days: Days to which the festival has been assigned so far.
+  """
+  if p_fday.date in fest_days:
+    # Already assigned (likely in the previous iteration).
+    return False
+
+  month_type = fest_rule.timing.month_type
+  priority = fest_rule.timing.get_priority()
+  fday_date = p_fday.get_date(month_type=month_type)
+
+  if month_type == RulesRepo.LUNAR_MONTH_DIR:
+    month_match = check_lunar_month_match(fday_date=fday_date, fest_rule=fest_rule, fest_days=fest_days)
+  else:
+    month_match = fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0
+
+
+  if not month_match:
+    # This could legitimately happen in the case indicated in the below negated clause. Example: imagine a "skipped" shukla prathamA tithi.
+    if not (fday_date.day == 30 and month_type == RulesRepo.LUNAR_MONTH_DIR):
+      # Example where False should be returned: Suppose festival is on tithi 27 of solar sidereal month 10; last day of month 9 could have tithi 27, but not day 1 of month 10; though a much later day of month 10 has tithi 27.
+      return False
+
+  return priority not in ('puurvaviddha', 'vyaapti') or \
+                    (p_fday.date - 1 not in fest_days)
+
+
 class RuleLookupAssigner(FestivalAssigner):
   def assign_relative_festivals(self):
     """ Add "RELATIVE" festival_id_to_instance --- festival_id_to_instance that happen before or after another festival with an exact timedelta! Example: 1 day after makara sankrAnti.
@@ -21,30 +74,20 @@ class RuleLookupAssigner(FestivalAssigner):
         self.panchaanga.add_festival(fest_id='varalakSmI-vratam', date=d - ((d.get_weekday() - 5) % 7))
 
     name_to_rule = self.rules_collection.name_to_rule
+    festival_id_to_days = self.panchaanga.festival_id_to_days
+    # Festivals without rules (Eg. sarva-kArttika-amAvAsyA_(alabhyam–anUrAdhA,_puSkalA)) may match anchors approximately too - besides those in self.rules_collection.get_anchor_aliases.
+    unruled_festival_ids = [fest_key for fest_key in festival_id_to_days if fest_key not in name_to_rule]
 
     # Iterate over relative events.
-    for festival_name in name_to_rule:
-      # Skip over non-relative events.
-      if name_to_rule[festival_name].timing is None or name_to_rule[festival_name].timing.offset is None:
-        continue
-
+    for festival_name in self.rules_collection.get_relative_fest_ids():
       offset = int(name_to_rule[festival_name].timing.offset)
       anchor_festival_id = name_to_rule[festival_name].timing.anchor_festival_id
       
-      if anchor_festival_id not in self.panchaanga.festival_id_to_days:
+      if anchor_festival_id not in festival_id_to_days:
         # Sometimes, the recorded anchor_festival_id is not exact (Eg. navama-aparapakSa-samApanam 0 days from sarva-kArttika-amAvAsyA). So, we find an approx. match (Eg. kArttika\-amAvAsyA).
-        matched_festivals = []
-        if 'amAvAsyA' in anchor_festival_id:
-          anchor_festival_id = anchor_festival_id.strip('sarva-')
-        
-        # Generally, we find a matching event by looking for superstring ids.
-        for fest_key in self.panchaanga.festival_id_to_days:
-          if anchor_festival_id in fest_key:
-            # Match bOdhAyana festivals with bOdhAyana anchor ids only.
-            if 'amAvAsyA' in anchor_festival_id:
-              if 'bOdhAyana' not in anchor_festival_id and 'bOdhAyana' in fest_key:
-                continue
-            matched_festivals += [fest_key]
+        matched_festivals = [fest_key for fest_key in self.rules_collection.get_anchor_aliases(anchor_festival_id=anchor_festival_id) if fest_key in festival_id_to_days]
+        matched_festivals += [fest_key for fest_key in unruled_festival_ids if rules.is_approximate_anchor_match(anchor_festival_id=anchor_festival_id, festival_id=fest_key)]
+        anchor_festival_id = rules.get_approximate_anchor_id(anchor_festival_id=anchor_festival_id)
 
         if matched_festivals == []:
           logging.error('Relative festival %s not in festival_id_to_days!' % anchor_festival_id)
@@ -52,23 +95,27 @@ class RuleLookupAssigner(FestivalAssigner):
           logging.error('Relative festival %s not in festival_id_to_days! Found more than one approximate match: %s' % (
             anchor_festival_id, str(matched_festivals)))
         else:
-          for x in self.panchaanga.festival_id_to_days[matched_festivals[0]]:
+          for x in festival_id_to_days[matched_festivals[0]]:
             self.panchaanga.add_festival(fest_id=festival_name, date=x + offset)
       else:
-        for x in self.panchaanga.festival_id_to_days[anchor_festival_id]:
+        for x in festival_id_to_days[anchor_festival_id]:
           self.panchaanga.add_festival(fest_id=festival_name, date=x + offset)
 
-  def apply_festival_from_rules_repos(self):
-    for index, dp in enumerate(self.daily_panchaangas):
-      self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR)
-      self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.TROPICAL_MONTH_DIR)
-      self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.GREGORIAN_MONTH_DIR)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.TITHI)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.NAKSHATRA)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.YOGA)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.TITHI)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.NAKSHATRA)
-      self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.YOGA)
+  def get_steps(self):
+    # A festival (re)assigned on day d - 1 or d displaces one assigned up to 32 days earlier (within the same month). Rules are applied to all days, including all posterior padding days - since a later occurrence (possibly in the padding days) within a month displaces an earlier one, and relative festivals may be more than a month after their anchors.
+    return [DayHook(self.apply_festival_from_rules_repos, look_behind=33, prior_padding_days=True, posterior_padding_days=True)]
+
+  def apply_festival_from_rules_repos(self, d):
+    dp = self.daily_panchaangas[d]
+    self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR)
+    self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.TROPICAL_MONTH_DIR)
+    self.apply_month_day_events(day_panchaanga=dp, month_type=RulesRepo.GREGORIAN_MONTH_DIR)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.TITHI)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.NAKSHATRA)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, anga_type=AngaType.YOGA)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.TITHI)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.NAKSHATRA)
+    self.apply_month_anga_events(day_panchaanga=dp, month_type=RulesRepo.LUNAR_MONTH_DIR, anga_type=AngaType.YOGA)
 
   def apply_month_day_events(self, day_panchaanga, month_type):
     """Apply events set to take place on a given (ordinal) day of a given month. Eg. Jan 1 as per Julian calendar, Aug 15 as per Gregorian calendar, 1st day of sidereal solar month 6. See calls from apply_festival_from_rules_repos().
@@ -126,48 +173,8 @@ class RuleLookupAssigner(FestivalAssigner):
     # Note: The successive days may be in different months! Hence the two calls above.
     return fest_dict
 
-  def _check_lunar_month_match(self, fday_date, fest_rule):
-    month_match = False
-    adhika_maasa_handling = fest_rule.timing.get_adhika_maasa_handling()
-    if adhika_maasa_handling == 'adhika_and_nija':
-      if fday_date.month == fest_rule.timing.month_number - 0.5 or fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0:
-        month_match = True
-    elif adhika_maasa_handling == 'adhika_only':
-      if int(fday_date.month) != fday_date.month and (fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0):
-        month_match = True
-    elif adhika_maasa_handling == 'adhika_if_exists':
-      if fday_date.month == fest_rule.timing.month_number - 0.5 and len(self.festival_id_to_days[fest_rule.id]) == 0:
-        month_match = True
-    elif adhika_maasa_handling == 'nija_only':
-      if fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0:
-        month_match = True
-
-    return month_match
-
   def _should_assign_festival(self, p_fday, fest_rule):
-    if p_fday.date in self.festival_id_to_days[fest_rule.id]:
-      # Already assigned (likely in the previous iteration).
-      return False
-
-    month_type = fest_rule.timing.month_type
-    priority = fest_rule.timing.get_priority()
-    fday_date = p_fday.get_date(month_type=month_type)
-
-    if month_type == RulesRepo.LUNAR_MONTH_DIR:
-      month_match = self._check_lunar_month_match(fday_date=fday_date, fest_rule=fest_rule)
-    else:
-      month_match = fday_date.month == fest_rule.timing.month_number or fest_rule.timing.month_number == 0
-
-
-    if not month_match:
-      # This could legitimately happen in the case indicated in the below negated clause. Example: imagine a "skipped" shukla prathamA tithi.
-      if not (fday_date.day == 30 and month_type == RulesRepo.LUNAR_MONTH_DIR):
-        # Example where False should be returned: Suppose festival is on tithi 27 of solar sidereal month 10; last day of month 9 could have tithi 27, but not day 1 of month 10; though a much later day of month 10 has tithi 27.
-        return False
-
-    return priority not in ('puurvaviddha', 'vyaapti') or \
-                      (p_fday.date - 1 not in self.festival_id_to_days[fest_rule.id])
-
+    return should_assign_festival(p_fday=p_fday, fest_rule=fest_rule, fest_days=self.festival_id_to_days[fest_rule.id])
 
   @timebudget
   def apply_month_anga_events(self, day_panchaanga, anga_type, month_type):
@@ -182,7 +189,7 @@ class RuleLookupAssigner(FestivalAssigner):
     date = day_panchaanga.date
     month = day_panchaanga.get_date(month_type=month_type).month
     
-    panchaangas = [self.panchaanga.date_str_to_panchaanga.get((date-2).get_date_str(), None), self.panchaanga.date_str_to_panchaanga.get((date-1).get_date_str(), None), day_panchaanga]
+    panchaangas = [self.panchaanga.day_at(date - 2), self.panchaanga.day_at(date - 1), day_panchaanga]
     if panchaangas[1] is None:
       # We require atleast 1 day history.
       return
@@ -205,7 +212,7 @@ class RuleLookupAssigner(FestivalAssigner):
         if assign_festival:
           if len(self.festival_id_to_days[fest_id]) > 0:
             previous_fest_day = sorted(self.festival_id_to_days[fest_id])[-1]
-            p_previous_fday = self.panchaanga.date_str_to_panchaanga[previous_fest_day.get_date_str()]
+            p_previous_fday = self.panchaanga.day_at(previous_fest_day)
             # Regarding the fest_rule.timing.month_number != 0 below:
             # This is required so as to avoid omissions as in the following case: sthAlIpAka_1 (which occurs every lunar month on tithi 1 at pUrvaviddha pUrvAhNa) occurs within the same "sunrise lunar month" but on different "pUrvAhNa lunar months" on 2019-07-03 and 2019-08-01.
             # Plus, a gap of not much more than 1 month is desirable for monthly festivals even otherwise - https://github.com/jyotisham/jyotisha/issues/54#issuecomment-735355325 . 
@@ -1,3 +1,4 @@
+import functools
 import sys
 import os
 import logging
@@ -6,7 +7,7 @@ from datetime import datetime
 from math import floor
 
 from jyotisha.panchaanga.temporal import names
-from jyotisha.panchaanga.temporal import zodiac, tithi
+from jyotisha.panchaanga.temporal import zodiac, tithi, DayHook, apply_steps
 from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner
 from jyotisha.panchaanga.temporal.festival import FestivalInstance
 from jyotisha.panchaanga.temporal.interval import Interval
@@ -24,169 +25,170 @@ logging.basicConfig(
 )
 
 
-class SolarFestivalAssigner(FestivalAssigner):
-  def assign_all(self):
-    self.assign_gajachhaya_yoga()
-    self.assign_sidereal_sankranti_punyakaala()
-    self.assign_tropical_sankranti_punyakaala()
-    self.assign_tropical_sankranti()
-    self.assign_mahodaya_ardhodaya()
-    self.assign_month_day_kaaradaiyan()
-    self.assign_month_day_muDavan_muzhukku()
-    self.assign_month_day_tulA_kAvErI_snAna_ArambhaH()
-    self.assign_month_day_kuchela()
-    self.assign_month_day_mesha_sankraanti()
-    self.assign_vishesha_vyatipata()
-    self.assign_saayana_vyatipata_vaidhrti()
-    self.assign_agni_nakshatra()
-    self.assign_garbhottam()
-    self.assign_padmaka_yoga()
+@functools.lru_cache()
+def _get_punya_kaala():
+  fname = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/misc_data/sankranti_punyakaala.toml')
+  with open(fname) as f:
+    import toml
+    punyakaala_dict = toml.load(f)
+  return {int(s): punyakaala_dict['PUNYA_KAALA'][s] for s in punyakaala_dict['PUNYA_KAALA']}
+
 
+class SolarFestivalAssigner(FestivalAssigner):
+  # See assign_vishesha_vyatipata and assign_month_day_tulA_kAvErI_snAna_ArambhaH.
+  OVERRIDDEN_FEST_IDS = FestivalAssigner.OVERRIDDEN_FEST_IDS | {'vyatIpAta-zrAddham', 'tulA-kAvErI-snAna-ArambhaH'}
+
+  def get_steps(self):
+    return [
+      self.assign_gajachhaya_yoga,
+      DayHook(self.assign_sidereal_sankranti_punyakaala, look_ahead=1),
+      DayHook(self.assign_tropical_sankranti_punyakaala, look_behind=1, look_ahead=1),
+      DayHook(self.assign_tropical_sankranti, look_behind=1),
+      DayHook(self.assign_mahodaya_ardhodaya, prior_padding_days=True, posterior_padding_days=True),
+      DayHook(self.assign_month_day_kaaradaiyan, look_behind=1, prior_padding_days=True, posterior_padding_days=True),
+      DayHook(self.assign_month_day_muDavan_muzhukku, look_ahead=1, prior_padding_days=True, posterior_padding_days=True),
+      DayHook(self.assign_month_day_tulA_kAvErI_snAna_ArambhaH, look_ahead=1, prior_padding_days=True, posterior_padding_days=True, setup=self._reset_tulA_kAvErI_snAna_ArambhaH),
+      DayHook(self.assign_month_day_kuchela, prior_padding_days=True, posterior_padding_days=True),
+      DayHook(self.assign_month_day_mesha_sankraanti, prior_padding_days=True, posterior_padding_days=True),
+      self.assign_vishesha_vyatipata,
+      self.assign_saayana_vyatipata_vaidhrti,
+      self.assign_agni_nakshatra,
+      self.assign_garbhottam,
+      self.assign_padmaka_yoga,
+    ]
 
   def assign_pitr_dina(self):
-    self.assign_gajachhaya_yoga()
-    self.assign_sidereal_sankranti_punyakaala()
-    self.assign_mahodaya_ardhodaya()
-    self.assign_vishesha_vyatipata()
+    apply_steps(panchaanga=self.panchaanga, steps=[
+      self.assign_gajachhaya_yoga,
+      DayHook(self.assign_sidereal_sankranti_punyakaala, look_ahead=1),
+      DayHook(self.assign_mahodaya_ardhodaya, prior_padding_days=True, posterior_padding_days=True),
+      self.assign_vishesha_vyatipata,
+    ])
 
 
-  def assign_sidereal_sankranti_punyakaala(self):
+  def assign_sidereal_sankranti_punyakaala(self, d):
     if 'mESa-viSu-puNyakAlaH' not in self.rules_collection.name_to_rule:
       return 
 
-    fname = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/misc_data/sankranti_punyakaala.toml')
-    with open(fname) as f:
-      import toml
-      punyakaala_dict = toml.load(f)
-
-      PUNYA_KAALA = {int(s): punyakaala_dict['PUNYA_KAALA'][s] for s in punyakaala_dict['PUNYA_KAALA']}
-   
+    PUNYA_KAALA = _get_punya_kaala()
     is_puurva_half_day = True
-    for d in range(self.panchaanga.duration_prior_padding, self.panchaanga.duration + self.panchaanga.duration_prior_padding):
-      if self.daily_panchaangas[d].solar_sidereal_date_sunset.month_transition is not None:
-        sankranti_id = self.daily_panchaangas[d + 1].solar_sidereal_date_sunset.month
-        
-        punya_kaala_str = names.NAMES['SANKRANTI_PUNYAKALA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][sankranti_id] + '-puNyakAlaH'
-        jd_transition = self.daily_panchaangas[d].solar_sidereal_date_sunset.month_transition
-        # TODO: convert carefully to relative nadikas!
-        punya_kaala_start_jd = jd_transition - PUNYA_KAALA[sankranti_id][0] * 1/60
-        punya_kaala_end_jd = jd_transition + PUNYA_KAALA[sankranti_id][1] * 1/60
-        
-        if jd_transition < self.daily_panchaangas[d].day_length_based_periods.fifteen_fold_division.aahneya.jd_end:
-          fday = d
-          is_puurva_half_day = jd_transition < self.daily_panchaangas[d].day_length_based_periods.puurvaahna.jd_end
-          if sankranti_id == 10:
-            if jd_transition < self.daily_panchaangas[d].jd_sunset:
-              fday = d
-              is_puurva_half_day = jd_transition < self.daily_panchaangas[d].day_length_based_periods.puurvaahna.jd_end
-            else:
-              fday = d + 1
-              is_puurva_half_day = True
-        else:
-          if sankranti_id == 4:
-            fday = d # Previous day only for Kataka Sankramana
+    if self.daily_panchaangas[d].solar_sidereal_date_sunset.month_transition is not None:
+      sankranti_id = self.daily_panchaangas[d + 1].solar_sidereal_date_sunset.month
+      
+      punya_kaala_str = names.NAMES['SANKRANTI_PUNYAKALA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][sankranti_id] + '-puNyakAlaH'
+      jd_transition = self.daily_panchaangas[d].solar_sidereal_date_sunset.month_transition
+      # TODO: convert carefully to relative nadikas!
+      punya_kaala_start_jd = jd_transition - PUNYA_KAALA[sankranti_id][0] * 1/60
+      punya_kaala_end_jd = jd_transition + PUNYA_KAALA[sankranti_id][1] * 1/60
+      
+      if jd_transition < self.daily_panchaangas[d].day_length_based_periods.fifteen_fold_division.aahneya.jd_end:
+        fday = d
+        is_puurva_half_day = jd_transition < self.daily_panchaangas[d].day_length_based_periods.puurvaahna.jd_end
+        if sankranti_id == 10:
+          if jd_transition < self.daily_panchaangas[d].jd_sunset:
+            fday = d
             is_puurva_half_day = jd_transition < self.daily_panchaangas[d].day_length_based_periods.puurvaahna.jd_end
           else:
             fday = d + 1
             is_puurva_half_day = True
-        
-        if is_puurva_half_day:
-          half_day = 'pUrvAhNa'
-          half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.puurvaahna
-        else:
-          half_day = 'aparAhNa'
-          half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.aparaahna
-        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='saGkramaNa-dina-%s-puNyakAlaH' % half_day, interval=half_day_interval), date=self.daily_panchaangas[fday].date)
-
-        punya_kaala_start_jd = max(punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
-        punya_kaala_end_jd = min(punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
-        if punya_kaala_end_jd > punya_kaala_start_jd:
-          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=punya_kaala_start_jd, jd_end=punya_kaala_end_jd)),
-                                                date=self.daily_panchaangas[fday].date)
+      else:
+        if sankranti_id == 4:
+          fday = d # Previous day only for Kataka Sankramana
+          is_puurva_half_day = jd_transition < self.daily_panchaangas[d].day_length_based_periods.puurvaahna.jd_end
         else:
-          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=None, jd_end=None)),
-                                                date=self.daily_panchaangas[fday].date)
+          fday = d + 1
+          is_puurva_half_day = True
+      
+      if is_puurva_half_day:
+        half_day = 'pUrvAhNa'
+        half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.puurvaahna
+      else:
+        half_day = 'aparAhNa'
+        half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.aparaahna
+      self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='saGkramaNa-dina-%s-puNyakAlaH' % half_day, interval=half_day_interval), date=self.daily_panchaangas[fday].date)
+
+      punya_kaala_start_jd = max(punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
+      punya_kaala_end_jd = min(punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
+      if punya_kaala_end_jd > punya_kaala_start_jd:
+        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=punya_kaala_start_jd, jd_end=punya_kaala_end_jd)),
+                                              date=self.daily_panchaangas[fday].date)
+      else:
+        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=None, jd_end=None)),
+                                              date=self.daily_panchaangas[fday].date)
 
-        if sankranti_id not in [2, 5, 8, 11]: # these cases are redundant!
-          saamaanya_punya_kaala_start_jd = jd_transition - 16 * 1/60
-          saamaanya_punya_kaala_end_jd = jd_transition + 16 * 1/60
-          saamaanya_punya_kaala_start_jd = max(saamaanya_punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
-          saamaanya_punya_kaala_end_jd = min(saamaanya_punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
-          if saamaanya_punya_kaala_end_jd > saamaanya_punya_kaala_start_jd: 
-            self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='ravi-saGkramaNa-puNyakAlaH', interval=Interval(jd_start=saamaanya_punya_kaala_start_jd, jd_end=saamaanya_punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
+      if sankranti_id not in [2, 5, 8, 11]: # these cases are redundant!
+        saamaanya_punya_kaala_start_jd = jd_transition - 16 * 1/60
+        saamaanya_punya_kaala_end_jd = jd_transition + 16 * 1/60
+        saamaanya_punya_kaala_start_jd = max(saamaanya_punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
+        saamaanya_punya_kaala_end_jd = min(saamaanya_punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
+        if saamaanya_punya_kaala_end_jd > saamaanya_punya_kaala_start_jd: 
+          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='ravi-saGkramaNa-puNyakAlaH', interval=Interval(jd_start=saamaanya_punya_kaala_start_jd, jd_end=saamaanya_punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
 
 
-  def assign_tropical_sankranti_punyakaala(self):
+  def assign_tropical_sankranti_punyakaala(self, d):
     if 'mESa-viSu-puNyakAlaH' not in self.rules_collection.name_to_rule:
       return 
 
-    fname = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/misc_data/sankranti_punyakaala.toml')
-    with open(fname) as f:
-      import toml
-      punyakaala_dict = toml.load(f)
-
-      PUNYA_KAALA = {int(s): punyakaala_dict['PUNYA_KAALA'][s] for s in punyakaala_dict['PUNYA_KAALA']}
+    PUNYA_KAALA = _get_punya_kaala()
+    if self.daily_panchaangas[d].tropical_date_sunset.month_transition is not None:
+      sankranti_id = self.daily_panchaangas[d + 1].tropical_date_sunset.month
+      punya_kaala_str = '(sAyana)~' + names.NAMES['TROPICAL_SANKRANTI_PUNYAKALA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][sankranti_id] + '-puNyakAlaH'
+      jd_transition = self.daily_panchaangas[d].tropical_date_sunset.month_transition
+      # TODO: convert carefully to relative nadikas!
+      punya_kaala_start_jd = jd_transition - PUNYA_KAALA[sankranti_id][0] * 1/60
+      punya_kaala_end_jd = jd_transition + PUNYA_KAALA[sankranti_id][1] * 1/60
+      
+      if self.daily_panchaangas[d - 1].jd_sunset < jd_transition < self.daily_panchaangas[d].jd_sunrise:
+        fday = d - 1
+      else:
+        fday = d
+      
+      if sankranti_id == 10:
+        if jd_transition > self.daily_panchaangas[fday].jd_sunset:
+          fday += 1
+          is_puurva_half_day = True
+        else:
+          is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
+      elif sankranti_id == 4:
+        if jd_transition > self.daily_panchaangas[fday].jd_sunset:
+          is_puurva_half_day = False
+        else:
+          is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
+      else:
+          is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
+      
+      if is_puurva_half_day:
+        half_day = 'pUrvAhNa'
+        half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.puurvaahna
+      else:
+        half_day = 'aparAhNa'
+        half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.aparaahna
+      self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='sAyana-saGkramaNa-dina-%s-puNyakAlaH' % half_day, interval=half_day_interval), date=self.daily_panchaangas[fday].date)
+
+      punya_kaala_start_jd = max(punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
+      punya_kaala_end_jd = min(punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
+      if punya_kaala_end_jd > punya_kaala_start_jd:
+        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=punya_kaala_start_jd, jd_end=punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
+      else:
+        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=None, jd_end=None)),
+                                              date=self.daily_panchaangas[fday].date)
 
-    for d in range(self.panchaanga.duration_prior_padding, self.panchaanga.duration + self.panchaanga.duration_prior_padding):
-      if self.daily_panchaangas[d].tropical_date_sunset.month_transition is not None:
-        sankranti_id = self.daily_panchaangas[d + 1].tropical_date_sunset.month
-        punya_kaala_str = '(sAyana)~' + names.NAMES['TROPICAL_SANKRANTI_PUNYAKALA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][sankranti_id] + '-puNyakAlaH'
-        jd_transition = self.daily_panchaangas[d].tropical_date_sunset.month_transition
-        # TODO: convert carefully to relative nadikas!
-        punya_kaala_start_jd = jd_transition - PUNYA_KAALA[sankranti_id][0] * 1/60
-        punya_kaala_end_jd = jd_transition + PUNYA_KAALA[sankranti_id][1] * 1/60
+      if sankranti_id not in [2, 5, 8, 11]: # these cases are redundant!
+        saamaanya_punya_kaala_start_jd = jd_transition - 16 * 1/60
+        saamaanya_punya_kaala_end_jd = jd_transition + 16 * 1/60
         
-        if self.daily_panchaangas[d - 1].jd_sunset < jd_transition < self.daily_panchaangas[d].jd_sunrise:
-          fday = d - 1
-        else:
-          fday = d
+        saamaanya_punya_kaala_start_jd = max(saamaanya_punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
+        # if sankranti_id == 10 and saamaanya_punya_kaala_start_jd < jd_transition < saamaanya_punya_kaala_end_jd:
+        #   saamaanya_punya_kaala_start_jd = jd_transition
         
-        if sankranti_id == 10:
-          if jd_transition > self.daily_panchaangas[fday].jd_sunset:
-            fday += 1
-            is_puurva_half_day = True
-          else:
-            is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
-        elif sankranti_id == 4:
-          if jd_transition > self.daily_panchaangas[fday].jd_sunset:
-            is_puurva_half_day = False
-          else:
-            is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
-        else:
-            is_puurva_half_day = jd_transition < self.daily_panchaangas[fday].day_length_based_periods.puurvaahna.jd_end
+        saamaanya_punya_kaala_end_jd = min(saamaanya_punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
+        # if sankranti_id == 4 and saamaanya_punya_kaala_start_jd < jd_transition < saamaanya_punya_kaala_end_jd:
+        #   saamaanya_punya_kaala_end_jd = jd_transition
         
-        if is_puurva_half_day:
-          half_day = 'pUrvAhNa'
-          half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.puurvaahna
-        else:
-          half_day = 'aparAhNa'
-          half_day_interval = self.daily_panchaangas[fday].day_length_based_periods.aparaahna
-        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='sAyana-saGkramaNa-dina-%s-puNyakAlaH' % half_day, interval=half_day_interval), date=self.daily_panchaangas[fday].date)
-
-        punya_kaala_start_jd = max(punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
-        punya_kaala_end_jd = min(punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
-        if punya_kaala_end_jd > punya_kaala_start_jd:
-          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=punya_kaala_start_jd, jd_end=punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
-        else:
-          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=punya_kaala_str, interval=Interval(jd_start=None, jd_end=None)),
-                                                date=self.daily_panchaangas[fday].date)
-
-        if sankranti_id not in [2, 5, 8, 11]: # these cases are redundant!
-          saamaanya_punya_kaala_start_jd = jd_transition - 16 * 1/60
-          saamaanya_punya_kaala_end_jd = jd_transition + 16 * 1/60
-          
-          saamaanya_punya_kaala_start_jd = max(saamaanya_punya_kaala_start_jd, self.daily_panchaangas[fday].jd_sunrise) 
-          # if sankranti_id == 10 and saamaanya_punya_kaala_start_jd < jd_transition < saamaanya_punya_kaala_end_jd:
-          #   saamaanya_punya_kaala_start_jd = jd_transition
-          
-          saamaanya_punya_kaala_end_jd = min(saamaanya_punya_kaala_end_jd, self.daily_panchaangas[fday].jd_sunset) 
-          # if sankranti_id == 4 and saamaanya_punya_kaala_start_jd < jd_transition < saamaanya_punya_kaala_end_jd:
-          #   saamaanya_punya_kaala_end_jd = jd_transition
-          
-          if saamaanya_punya_kaala_end_jd > saamaanya_punya_kaala_start_jd:
-            self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='ravi-saGkramaNa-puNyakAlaH', interval=Interval(jd_start=saamaanya_punya_kaala_start_jd, jd_end=saamaanya_punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
-
-  def assign_tropical_sankranti(self):
+        if saamaanya_punya_kaala_end_jd > saamaanya_punya_kaala_start_jd:
+          self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='ravi-saGkramaNa-puNyakAlaH', interval=Interval(jd_start=saamaanya_punya_kaala_start_jd, jd_end=saamaanya_punya_kaala_end_jd)), date=self.daily_panchaangas[fday].date)
+
+  def assign_tropical_sankranti(self, d):
     if 'mESa-viSu-puNyakAlaH' not in self.rules_collection.name_to_rule:
       return 
     RTU_MASA_TAGS = {
@@ -204,18 +206,17 @@ class SolarFestivalAssigner(FestivalAssigner):
         12: "",
     }
 
-    for d in range(self.panchaanga.duration_prior_padding, self.panchaanga.duration + self.panchaanga.duration_prior_padding):
-      if self.daily_panchaangas[d].tropical_date_sunset.month_transition is not None:
-        jd_transition = self.daily_panchaangas[d].tropical_date_sunset.month_transition
-
-        # Addsankranti
-        masa_id = (self.daily_panchaangas[d + 1].tropical_date_sunset.month - 1) % 12 + 1
-        masa_name = names.NAMES['RTU_MASA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][masa_id] + RTU_MASA_TAGS[masa_id]
-        if jd_transition < self.daily_panchaangas[d].jd_sunrise:
-          fday = d - 1
-        else:
-          fday = d
-        self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=masa_name, interval=Interval(jd_start=jd_transition, jd_end=None)), date=self.daily_panchaangas[fday].date)
+    if self.daily_panchaangas[d].tropical_date_sunset.month_transition is not None:
+      jd_transition = self.daily_panchaangas[d].tropical_date_sunset.month_transition
+
+      # Addsankranti
+      masa_id = (self.daily_panchaangas[d + 1].tropical_date_sunset.month - 1) % 12 + 1
+      masa_name = names.NAMES['RTU_MASA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][masa_id] + RTU_MASA_TAGS[masa_id]
+      if jd_transition < self.daily_panchaangas[d].jd_sunrise:
+        fday = d - 1
+      else:
+        fday = d
+      self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=masa_name, interval=Interval(jd_start=jd_transition, jd_end=None)), date=self.daily_panchaangas[fday].date)
 
 
   def assign_agni_nakshatra(self):
@@ -329,55 +330,59 @@ class SolarFestivalAssigner(FestivalAssigner):
       fday -= 1
     self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name='garbhOTTam-muDivu', interval=Interval(jd_start=None, jd_end=anga.jd_end)), date=self.daily_panchaangas[fday].date)
 
-  def assign_month_day_kaaradaiyan(self):
+  def assign_month_day_kaaradaiyan(self, d):
     if 'kAraDaiyAn2_nOn2bu' not in self.rules_collection.name_to_rule:
       return
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-      if daily_panchaanga.solar_sidereal_date_sunset.month == 12 and daily_panchaanga.solar_sidereal_date_sunset.day == 1:
-        festival_name = 'kAraDaiyAn2 nOn2bu'
-        if NakshatraDivision(daily_panchaanga.jd_sunrise - (1 / 15.0) * (daily_panchaanga.jd_sunrise - self.daily_panchaangas[d - 1].jd_sunrise),
-                             ayanaamsha_id=self.ayanaamsha_id).get_solar_raashi().index == 12:
-          # If kumbha prevails two ghatikAs before sunrise, nombu can be done in the early morning itself, else, previous night.
-          self.panchaanga.add_festival(
-            fest_id=festival_name, date=self.daily_panchaangas[d - 1].date)
-        else:
-          self.panchaanga.add_festival(
-            fest_id=festival_name, date=daily_panchaanga.date)
+    daily_panchaanga = self.daily_panchaangas[d]
+    if daily_panchaanga.solar_sidereal_date_sunset.month == 12 and daily_panchaanga.solar_sidereal_date_sunset.day == 1:
+      festival_name = 'kAraDaiyAn2 nOn2bu'
+      if NakshatraDivision(daily_panchaanga.jd_sunrise - (1 / 15.0) * (daily_panchaanga.jd_sunrise - self.daily_panchaangas[d - 1].jd_sunrise),
+                           ayanaamsha_id=self.ayanaamsha_id).get_solar_raashi().index == 12:
+        # If kumbha prevails two ghatikAs before sunrise, nombu can be done in the early morning itself, else, previous night.
+        self.panchaanga.add_festival(
+          fest_id=festival_name, date=self.daily_panchaangas[d - 1].date)
+      else:
+        self.panchaanga.add_festival(
+          fest_id=festival_name, date=daily_panchaanga.date)
 
-  def assign_month_day_kuchela(self):
+  def assign_month_day_kuchela(self, d):
     if 'kucEla-dinam' not in self.rules_collection.name_to_rule:
       return
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-      # KUCHELA DINAM
-      if daily_panchaanga.solar_sidereal_date_sunset.month == 9 and daily_panchaanga.solar_sidereal_date_sunset.day <= 7 and daily_panchaanga.date.get_weekday() == 3:
-        self.panchaanga.add_festival(
-          fest_id='kucEla-dinam', date=daily_panchaanga.date)
+    daily_panchaanga = self.daily_panchaangas[d]
+    # KUCHELA DINAM
+    if daily_panchaanga.solar_sidereal_date_sunset.month == 9 and daily_panchaanga.solar_sidereal_date_sunset.day <= 7 and daily_panchaanga.date.get_weekday() == 3:
+      self.panchaanga.add_festival(
+        fest_id='kucEla-dinam', date=daily_panchaanga.date)
 
-  def assign_month_day_muDavan_muzhukku(self):
+  def assign_month_day_muDavan_muzhukku(self, d):
     if 'muDavan2_muzhukku' not in self.rules_collection.name_to_rule:
       return
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-      if daily_panchaanga.solar_sidereal_date_sunset.month == 8 and daily_panchaanga.solar_sidereal_date_sunset.day == 1:
-        if daily_panchaanga.solar_sidereal_date_sunset.month_transition is None or daily_panchaanga.solar_sidereal_date_sunset.month_transition < daily_panchaanga.jd_sunrise:
-          self.panchaanga.add_festival(fest_id='muDavan2_muzhukku', date=daily_panchaanga.date)
-        else:
-          self.panchaanga.add_festival(fest_id='muDavan2_muzhukku', date=self.daily_panchaangas[d + 1].date)
+    daily_panchaanga = self.daily_panchaangas[d]
+    if daily_panchaanga.solar_sidereal_date_sunset.month == 8 and daily_panchaanga.solar_sidereal_date_sunset.day == 1:
+      if daily_panchaanga.solar_sidereal_date_sunset.month_transition is None or daily_panchaanga.solar_sidereal_date_sunset.month_transition < daily_panchaanga.jd_sunrise:
+        self.panchaanga.add_festival(fest_id='muDavan2_muzhukku', date=daily_panchaanga.date)
+      else:
+        self.panchaanga.add_festival(fest_id='muDavan2_muzhukku', date=self.daily_panchaangas[d + 1].date)
 
-  def assign_month_day_tulA_kAvErI_snAna_ArambhaH(self):
-    if 'tulA-kAvErI-snAna-ArambhaH' not in self.rules_collection.name_to_rule:
+  def assign_month_day_tulA_kAvErI_snAna_ArambhaH(self, d):
+    if 'tulA-kAvErI-snAna-ArambhaH' not in self.rules_collection.name_to_rule or self._tulA_kAvErI_snAna_ArambhaH_assigned:
       return
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-      if daily_panchaanga.solar_sidereal_date_sunset.month_transition is not None:
-        if daily_panchaanga.solar_sidereal_date_sunset.month == 7 or (daily_panchaanga.solar_sidereal_date_sunset.month == 6 and daily_panchaanga.solar_sidereal_date_sunset.day > 28):
-          tula_sankramana_jd = daily_panchaanga.solar_sidereal_date_sunset.month_transition
-          fday = d
+    daily_panchaanga = self.daily_panchaangas[d]
+    if daily_panchaanga.solar_sidereal_date_sunset.month_transition is not None:
+      if daily_panchaanga.solar_sidereal_date_sunset.month == 7 or (daily_panchaanga.solar_sidereal_date_sunset.month == 6 and daily_panchaanga.solar_sidereal_date_sunset.day > 28):
+        tula_sankramana_jd = daily_panchaanga.solar_sidereal_date_sunset.month_transition
+        fday = d
+
+        if tula_sankramana_jd < self.daily_panchaangas[fday].day_length_based_periods.fifteen_fold_division.braahma.jd_start:
+          self.panchaanga.add_festival(fest_id='tulA-kAvErI-snAna-ArambhaH', date=self.daily_panchaangas[fday].date)
+        else:
+          self.panchaanga.add_festival(fest_id='tulA-kAvErI-snAna-ArambhaH', date=self.daily_panchaangas[fday + 1].date)
 
-          if tula_sankramana_jd < self.daily_panchaangas[fday].day_length_based_periods.fifteen_fold_division.braahma.jd_start:
-            self.panchaanga.add_festival(fest_id='tulA-kAvErI-snAna-ArambhaH', date=self.daily_panchaangas[fday].date)
-          else:
-            self.panchaanga.add_festival(fest_id='tulA-kAvErI-snAna-ArambhaH', date=self.daily_panchaangas[fday + 1].date)
+        # Only the first one is assigned.
+        self._tulA_kAvErI_snAna_ArambhaH_assigned = True
 
-          return
+  def _reset_tulA_kAvErI_snAna_ArambhaH(self):
+    self._tulA_kAvErI_snAna_ArambhaH_assigned = False
 
   def _assign_yoga(self, yoga_name, intersect_list, jd_start=None, jd_end=None):
     if jd_start is None:
@@ -418,29 +423,29 @@ class SolarFestivalAssigner(FestivalAssigner):
         self.panchaanga.add_festival_instance(festival_instance=FestivalInstance(name=yoga_name, interval=Interval(jd_start=jd_start, jd_end=jd_end)), date=self.daily_panchaangas[fday].date)
 
 
-  def assign_month_day_mesha_sankraanti(self):
+  def assign_month_day_mesha_sankraanti(self, d):
     if 'mESa-saGkrAntiH' not in self.rules_collection.name_to_rule:
       return 
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-      # MESHA SANKRANTI
-      if daily_panchaanga.solar_sidereal_date_sunset.month == 1 and self.daily_panchaangas[d - 1].solar_sidereal_date_sunset.month == 12:
-        # distance from prabhava
-        samvatsara_id = (daily_panchaanga.date.year - 1568) % 60 + 1
-        yname = names.NAMES['SAMVATSARA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][(samvatsara_id % 60) + 1]
-        # Manual cleaning of name - dropping visarga etc.
-        yname = yname.rstrip('H')
-        if yname[-1] == 'I':
-          yname = yname[:-1] + 'i'
-        new_yr = 'mESa-saGkrAntiH' + '~(' + yname + \
-                 '-' + 'saMvatsaraH' + ')'
-        # self.panchaanga.festival_id_to_days[new_yr] = [d]
-        self.panchaanga.add_festival(fest_id=new_yr, date=self.daily_panchaangas[d].date)
-        self.panchaanga.add_festival(fest_id='paJcAGga-paThanam', date=self.daily_panchaangas[d].date)
-        self.panchaanga.add_festival(fest_id='viSukkan2i', date=self.daily_panchaangas[d].date)
-        # if daily_panchaanga.solar_sidereal_date_sunset.month_transition is None or daily_panchaanga.solar_sidereal_date_sunset.month_transition < daily_panchaanga.jd_sunrise:
-        #   self.panchaanga.add_festival(fest_id='viSukkan2i', date=daily_panchaanga.date)
-        # else:
-        #   self.panchaanga.add_festival(fest_id='viSukkan2i', date=self.daily_panchaangas[d + 1].date)
+    daily_panchaanga = self.daily_panchaangas[d]
+    # MESHA SANKRANTI
+    if daily_panchaanga.solar_sidereal_date_sunset.month == 1 and self.daily_panchaangas[d - 1].solar_sidereal_date_sunset.month == 12:
+      # distance from prabhava
+      samvatsara_id = (daily_panchaanga.date.year - 1568) % 60 + 1
+      yname = names.NAMES['SAMVATSARA_NAMES']['sa'][sanscript.roman.HK_DRAVIDIAN][(samvatsara_id % 60) + 1]
+      # Manual cleaning of name - dropping visarga etc.
+      yname = yname.rstrip('H')
+      if yname[-1] == 'I':
+        yname = yname[:-1] + 'i'
+      new_yr = 'mESa-saGkrAntiH' + '~(' + yname + \
+               '-' + 'saMvatsaraH' + ')'
+      # self.panchaanga.festival_id_to_days[new_yr] = [d]
+      self.panchaanga.add_festival(fest_id=new_yr, date=self.daily_panchaangas[d].date)
+      self.panchaanga.add_festival(fest_id='paJcAGga-paThanam', date=self.daily_panchaangas[d].date)
+      self.panchaanga.add_festival(fest_id='viSukkan2i', date=self.daily_panchaangas[d].date)
+      # if daily_panchaanga.solar_sidereal_date_sunset.month_transition is None or daily_panchaanga.solar_sidereal_date_sunset.month_transition < daily_panchaanga.jd_sunrise:
+      #   self.panchaanga.add_festival(fest_id='viSukkan2i', date=daily_panchaanga.date)
+      # else:
+      #   self.panchaanga.add_festival(fest_id='viSukkan2i', date=self.daily_panchaangas[d + 1].date)
 
   def assign_saayana_vyatipata_vaidhrti(self):
     if 'sAyana-vyatIpAtaH' not in self.rules_collection.name_to_rule:
@@ -470,11 +475,11 @@ class SolarFestivalAssigner(FestivalAssigner):
   def assign_vishesha_vyatipata(self):
     vs_list = copy(self.panchaanga.festival_id_to_days.get('vyatIpAta-zrAddham', []))
     for date in vs_list:
-      if self.panchaanga.date_str_to_panchaanga[date.get_date_str()].solar_sidereal_date_sunset.month == 9:
+      if self.panchaanga.day_at(date).solar_sidereal_date_sunset.month == 9:
         self.panchaanga.delete_festival_date(fest_id='vyatIpAta-zrAddham', date=date)
         festival_name = 'mahAdhanurvyatIpAta-zrAddham'
         self.panchaanga.add_festival(fest_id=festival_name, date=date)
-      elif self.panchaanga.date_str_to_panchaanga[date.get_date_str()].lunar_month_sunrise.index == 6:
+      elif self.panchaanga.day_at(date).lunar_month_sunrise.index == 6:
         self.panchaanga.delete_festival_date(fest_id='vyatIpAta-zrAddham', date=date)
         self.panchaanga.add_festival(fest_id='mahAvyatIpAta-zrAddham', date=date)
 
@@ -516,27 +521,27 @@ class SolarFestivalAssigner(FestivalAssigner):
     self._assign_yoga('padmaka-yOgaH-3', [(zodiac.AngaType.SOLAR_NAKSH, 16), (zodiac.AngaType.NAKSHATRA, 3)],
                       jd_start=self.panchaanga.jd_start, jd_end=self.panchaanga.jd_end)
 
-  def assign_mahodaya_ardhodaya(self):
-    for d, daily_panchaanga in enumerate(self.daily_panchaangas):
-
-      # MAHODAYAM
-      # Can also refer youtube video https://youtu.be/0DBIwb7iaLE?list=PL_H2LUtMCKPjh63PRk5FA3zdoEhtBjhzj&t=6747
-      # 4th pada of vyatipatam, 1st pada of Amavasya, 2nd pada of Shravana, Suryodaya, Bhanuvasara = Ardhodayam
-      # 4th pada of vyatipatam, 1st pada of Amavasya, 2nd pada of Shravana, Suryodaya, Somavasara = Mahodayam
-      sunrise_zodiac = NakshatraDivision(daily_panchaanga.jd_sunrise, ayanaamsha_id=self.computation_system.ayanaamsha_id)
-      sunset_zodiac = NakshatraDivision(daily_panchaanga.jd_sunset, ayanaamsha_id=self.computation_system.ayanaamsha_id)
-      if daily_panchaanga.lunar_month_sunrise.index in [10, 11] and (daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index == 30 or tithi.get_tithi(daily_panchaanga.jd_sunrise).index == 30):
-        if (sunrise_zodiac.get_anga(zodiac.AngaType.YOGA).index == 17 or sunset_zodiac.get_anga(zodiac.AngaType.YOGA).index == 17) and \
-            (sunrise_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 22 or  sunset_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 22):
-          if daily_panchaanga.date.get_weekday() == 1:
-            festival_name = 'mahOdaya-puNyakAlaH'
-            self.panchaanga.add_festival(fest_id=festival_name, date=self.daily_panchaangas[d].date)
-            # logging.debug('* %d-%02d-%02d> %s!' % (y, m, dt, festival_name))
-          elif daily_panchaanga.date.get_weekday() == 0:
-            festival_name = 'ardhOdaya-puNyakAlaH'
-            self.panchaanga.add_festival(fest_id=festival_name, date=self.daily_panchaangas[d].date)
-            # logging.debug('* %d-%02d-%02d> %s!' % (y, m, dt, festival_name))
-      
+  def assign_mahodaya_ardhodaya(self, d):
+    daily_panchaanga = self.daily_panchaangas[d]
+
+    # MAHODAYAM
+    # Can also refer youtube video https://youtu.be/0DBIwb7iaLE?list=PL_H2LUtMCKPjh63PRk5FA3zdoEhtBjhzj&t=6747
+    # 4th pada of vyatipatam, 1st pada of Amavasya, 2nd pada of Shravana, Suryodaya, Bhanuvasara = Ardhodayam
+    # 4th pada of vyatipatam, 1st pada of Amavasya, 2nd pada of Shravana, Suryodaya, Somavasara = Mahodayam
+    sunrise_zodiac = NakshatraDivision(daily_panchaanga.jd_sunrise, ayanaamsha_id=self.computation_system.ayanaamsha_id)
+    sunset_zodiac = NakshatraDivision(daily_panchaanga.jd_sunset, ayanaamsha_id=self.computation_system.ayanaamsha_id)
+    if daily_panchaanga.lunar_month_sunrise.index in [10, 11] and (daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index == 30 or tithi.get_tithi(daily_panchaanga.jd_sunrise).index == 30):
+      if (sunrise_zodiac.get_anga(zodiac.AngaType.YOGA).index == 17 or sunset_zodiac.get_anga(zodiac.AngaType.YOGA).index == 17) and \
+          (sunrise_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 22 or  sunset_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 22):
+        if daily_panchaanga.date.get_weekday() == 1:
+          festival_name = 'mahOdaya-puNyakAlaH'
+          self.panchaanga.add_festival(fest_id=festival_name, date=self.daily_panchaangas[d].date)
+          # logging.debug('* %d-%02d-%02d> %s!' % (y, m, dt, festival_name))
+        elif daily_panchaanga.date.get_weekday() == 0:
+          festival_name = 'ardhOdaya-puNyakAlaH'
+          self.panchaanga.add_festival(fest_id=festival_name, date=self.daily_panchaangas[d].date)
+          # logging.debug('* %d-%02d-%02d> %s!' % (y, m, dt, festival_name))
+    
 
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
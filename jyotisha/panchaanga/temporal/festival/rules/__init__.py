@@ -1,6 +1,9 @@
 import codecs
+import hashlib
+import heapq
 import logging
 import os
+import pickle
 import sys
 from pathlib import Path
 
@@ -13,7 +16,7 @@ from sanskrit_data import collection_helper
 from sanskrit_data.schema import common
 from timebudget import timebudget
 
-from jyotisha import custom_transliteration
+from jyotisha import custom_transliteration, util
 from jyotisha.panchaanga.temporal import names
 
 
@@ -307,6 +310,27 @@ def get_festival_rules_map(dir_path, julian_handling, repo=None):
 
 DATA_ROOT = os.path.join(os.path.dirname(__file__), "../data")
 _ADYATITHI_REPOS_PATH = os.path.join(DATA_ROOT, "repos.toml")
+# Parsed rules are cached here - one file per (repos, julian_handling) - since parsing thousands of toml files dominates the start-up time of every process.
+DEFAULT_CACHE_DIR = "~/Documents/jyotisha/festival_rules"
+RULES_CACHE_FORMAT_VERSION = 1
+
+
+# The code which parses rule files and builds the tree. Cached rules are reparsed whenever it changes.
+PARSER_SOURCE_PATHS = [__file__]
+
+
+def get_rule_files_fingerprint(dir_paths):
+  """A digest of the parsing code (see PARSER_SOURCE_PATHS) and of the paths, sizes and modification times of all rule files under dir_paths - which changes whenever the parser is updated or a rule is added, removed or edited."""
+  digest = hashlib.sha256()
+  for source_path in PARSER_SOURCE_PATHS:
+    with open(source_path, "rb") as f:
+      digest.update(f.read())
+  for dir_path in dir_paths:
+    digest.update(("%s\n" % dir_path).encode("utf-8"))
+    for file_path in sorted(Path(dir_path).glob("**/*.toml")):
+      stat = file_path.stat()
+      digest.update(("%s\t%d\t%d\n" % (file_path, stat.st_size, stat.st_mtime_ns)).encode("utf-8"))
+  return digest.hexdigest()
 
 
 class RulesRepo(common.JsonObject):
@@ -338,12 +362,16 @@ class RulesCollection(common.JsonObject):
   JULIAN_TO_GREGORIAN = "converted to Gregorian"
 
 
-  def __init__(self, repos, julian_handling=JULIAN_TO_GREGORIAN):
+  def __init__(self, repos, julian_handling=JULIAN_TO_GREGORIAN, cache_dir=DEFAULT_CACHE_DIR):
+    """
+
+    :param cache_dir: If not None, parsed rules are read from (and saved to) this directory - see set_rule_dicts.
+    """
     super().__init__()
     self.repos = repos
     self.name_to_rule = {}
     self.tree = None 
-    self.set_rule_dicts(julian_handling=julian_handling)
+    self.set_rule_dicts(julian_handling=julian_handling, cache_dir=cache_dir)
 
   @methodtools.lru_cache()  # the order is important!
   @classmethod
@@ -386,32 +414,129 @@ class RulesCollection(common.JsonObject):
       file_helper.remove_empty_dirs(path=os.path.join(DATA_ROOT, repo.get_path()))
 
   @timebudget
-  def set_rule_dicts(self, julian_handling):
-    for repo in self.repos:
-      self.name_to_rule.update(get_festival_rules_map(
-        os.path.join(DATA_ROOT, repo.get_path()), repo=repo, julian_handling=julian_handling))
-
-    from sanskrit_data import collection_helper
-    self.tree = collection_helper.tree_maker(leaves=self.name_to_rule.values(), path_fn=lambda x: x.get_storage_file_name(base_dir="", undo_conversions=False).replace(".toml", ""))
+  def set_rule_dicts(self, julian_handling, cache_dir=None):
+    """Parse the rules in self.repos, and arrange them in self.tree.
+
+    :param cache_dir: If not None, the result is read from a cache file here - so long as neither the parser nor any rule file has changed since (see get_rule_files_fingerprint). Else, it is computed and saved there.
+    """
+    dir_paths = [os.path.join(DATA_ROOT, repo.get_path()) for repo in self.repos]
+    cache_path = None
+    if cache_dir is not None:
+      cache_path = self._get_cache_path(cache_dir=cache_dir, dir_paths=dir_paths, julian_handling=julian_handling)
+      fingerprint = get_rule_files_fingerprint(dir_paths=dir_paths)
+    if cache_path is None or not self._read_cache(cache_path=cache_path, fingerprint=fingerprint):
+      for (repo, dir_path) in zip(self.repos, dir_paths):
+        self.name_to_rule.update(get_festival_rules_map(dir_path, repo=repo, julian_handling=julian_handling))
+
+      from sanskrit_data import collection_helper
+      self.tree = collection_helper.tree_maker(leaves=self.name_to_rule.values(), path_fn=lambda x: x.get_storage_file_name(base_dir="", undo_conversions=False).replace(".toml", ""))
+      if cache_path is not None:
+        self._write_cache(cache_path=cache_path, fingerprint=fingerprint)
+    self._set_month_anga_index()
+    self._set_relative_event_graph()
+
+  def _get_cache_path(self, cache_dir, dir_paths, julian_handling):
+    key = repr([(repo.name, repo.base_url, os.path.abspath(dir_path)) for (repo, dir_path) in zip(self.repos, dir_paths)] + [julian_handling])
+    return os.path.join(os.path.expanduser(cache_dir), "%s.pickle" % hashlib.sha256(key.encode("utf-8")).hexdigest()[:32])
+
+  def _read_cache(self, cache_path, fingerprint):
+    if not os.path.exists(cache_path):
+      return False
+    try:
+      with open(cache_path, "rb") as f:
+        cache = pickle.load(f)
+      if cache["version"] != RULES_CACHE_FORMAT_VERSION or cache["fingerprint"] != fingerprint:
+        return False
+    except (EnvironmentError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+      logging.warning("Ignoring corrupt festival rules cache file %s", cache_path)
+      return False
+    # Rules should refer to (the same objects as) self.repos.
+    name_to_repo = {repo.name: repo for repo in self.repos}
+    for rule in cache["name_to_rule"].values():
+      if rule.repo is not None:
+        rule.repo = name_to_repo.get(rule.repo.name, rule.repo)
+    self.name_to_rule = cache["name_to_rule"]
+    self.tree = cache["tree"]
+    return True
+
+  def _write_cache(self, cache_path, fingerprint):
+    try:
+      util.write_file_atomically(filename=cache_path, content=util.pickle_dumps({"version": RULES_CACHE_FORMAT_VERSION, "fingerprint": fingerprint, "name_to_rule": self.name_to_rule, "tree": self.tree}))
+    except EnvironmentError:
+      logging.warning("Not able to save the festival rules cache to %s.", cache_path)
+
+  def _set_month_anga_index(self):
+    """Flatten the month_type/anga_type/month/anga levels of self.tree into self._month_anga_index - so that get_possibly_relevant_fests needs just one lookup per month and anga.
+
+    Keys are (month_type, anga_type_id, month, anga, is_adhika); values are tuples of (festival id, rule) pairs. Entries with is_adhika None have all festivals; the others (only for lunar months) only those relevant in adhika (or nija) maasas.
+    """
+    self._month_anga_index = {}
+    for (month_type, month_type_tree) in self.tree.items():
+      if month_type == collection_helper.LEAVES_KEY:
+        continue
+      for (anga_type_id, anga_type_tree) in month_type_tree.items():
+        if anga_type_id == collection_helper.LEAVES_KEY:
+          continue
+        for (month_str, month_tree) in anga_type_tree.items():
+          month = _parse_index_key(key=month_str, format_fn=_get_month_key)
+          if month is None:
+            continue
+          for (anga_str, anga_tree) in month_tree.items():
+            anga = _parse_index_key(key=anga_str, format_fn=lambda anga: "%02d" % anga)
+            if anga is None:
+              continue
+            fests = tuple((fest_id, fest_tree[collection_helper.LEAVES_KEY][0]) for (fest_id, fest_tree) in anga_tree.items() if fest_id != collection_helper.LEAVES_KEY and len(fest_tree[collection_helper.LEAVES_KEY]) > 0)
+            self._month_anga_index[(month_type, anga_type_id, month, anga, None)] = fests
+            if month_type == RulesRepo.LUNAR_MONTH_DIR:
+              for is_adhika in (False, True):
+                self._month_anga_index[(month_type, anga_type_id, month, anga, is_adhika)] = tuple((fest_id, fest_rule) for (fest_id, fest_rule) in fests if _is_relevant_in_maasa(fest_rule=fest_rule, is_adhika=is_adhika))
+
+  def _set_relative_event_graph(self):
+    """Arrange relative events (ie. those with timing.offset) for RuleLookupAssigner.assign_relative_festivals.
+
+    self._anchor_to_dependents maps anchor festival ids to ids of events relative to them. self._relative_fest_ids lists relative events in topological order - anchors before events relative to them, else in the order of self.name_to_rule. self._anchor_to_aliases maps anchor festival ids to ids of events which approximately match them (see is_approximate_anchor_match).
+    """
+    self._anchor_to_dependents = {}
+    for (fest_id, fest_rule) in self.name_to_rule.items():
+      if fest_rule.timing is not None and fest_rule.timing.offset is not None:
+        self._anchor_to_dependents.setdefault(fest_rule.timing.anchor_festival_id, []).append(fest_id)
+
+    fest_id_to_position = {fest_id: position for (position, fest_id) in enumerate(self.name_to_rule)}
+    relative_fest_ids = sorted([fest_id for dependents in self._anchor_to_dependents.values() for fest_id in dependents], key=lambda fest_id: fest_id_to_position[fest_id])
+    # An event is ready once its anchor (if a relative event itself) is placed.
+    is_anchor_pending = {fest_id: False for fest_id in relative_fest_ids}
+    for fest_id in relative_fest_ids:
+      is_anchor_pending[fest_id] = self.name_to_rule[fest_id].timing.anchor_festival_id in is_anchor_pending
+    ready_positions = [fest_id_to_position[fest_id] for fest_id in relative_fest_ids if not is_anchor_pending[fest_id]]
+    heapq.heapify(ready_positions)
+    fest_ids = list(self.name_to_rule)
+    self._relative_fest_ids = []
+    while len(ready_positions) > 0:
+      fest_id = fest_ids[heapq.heappop(ready_positions)]
+      self._relative_fest_ids.append(fest_id)
+      for dependent_id in self._anchor_to_dependents.get(fest_id, []):
+        is_anchor_pending[dependent_id] = False
+        heapq.heappush(ready_positions, fest_id_to_position[dependent_id])
+    if len(self._relative_fest_ids) < len(relative_fest_ids):
+      cyclic_fest_ids = [fest_id for fest_id in relative_fest_ids if is_anchor_pending[fest_id]]
+      logging.warning("Relative festivals with cyclic anchors: %s", str(cyclic_fest_ids))
+      self._relative_fest_ids.extend(cyclic_fest_ids)
+
+    self._anchor_to_aliases = {anchor_festival_id: tuple(fest_id for fest_id in self.name_to_rule if is_approximate_anchor_match(anchor_festival_id=anchor_festival_id, festival_id=fest_id)) for anchor_festival_id in self._anchor_to_dependents}
+
+  def get_relative_fest_ids(self):
+    """Ids of relative events - each after its anchor, if that is a relative event too."""
+    return self._relative_fest_ids
+
+  def get_anchor_aliases(self, anchor_festival_id):
+    """Ids of events which approximately match the given anchor festival id (of some relative event)."""
+    return self._anchor_to_aliases.get(anchor_festival_id, ())
 
   def get_month_anga_fests(self, month_type, month, anga_type_id, anga):
-    if int(month) != month and month != 0:
-      # Deal with adhika mAsas
-      month_str = "%02d.5" % month
-    else:
-      month_str = "%02d" % month
     from jyotisha.panchaanga.temporal.zodiac import Anga
     if isinstance(anga, Anga):
       anga = anga.index
-    try:
-      subtree = self.tree[month_type.lower()][anga_type_id.lower()][month_str]["%02d" % anga]
-      tree_out = {}
-      for x, y in subtree.items():
-        if x != collection_helper.LEAVES_KEY:
-          tree_out[x] = y[collection_helper.LEAVES_KEY][0]
-      return tree_out
-    except KeyError:
-      return {}
+    return dict(self._month_anga_index.get((month_type.lower(), anga_type_id.lower(), month, anga, None), ()))
 
   def get_possibly_relevant_fests(self, month_type, month, anga_type_id, angas):
     def _get_month(anga):
@@ -420,6 +545,8 @@ class RulesCollection(common.JsonObject):
       else:
         return month
       
+    from jyotisha.panchaanga.temporal.zodiac import Anga
+    (month_type_id, anga_type_id) = (month_type.lower(), anga_type_id.lower())
     fest_dict = {}
     for anga in angas:
       from jyotisha.panchaanga.temporal.zodiac.angas import Tithi
@@ -445,15 +572,15 @@ class RulesCollection(common.JsonObject):
           # Previous maasa is also not relevant!
           months_list.remove(month - 0.5)
 
+      anga_index = anga.index if isinstance(anga, Anga) else anga
       for m in months_list:
-        new_fests = self.get_month_anga_fests(month_type=month_type, month=m, anga_type_id=anga_type_id, anga=anga)
         if month_type == RulesRepo.LUNAR_MONTH_DIR:
-          if m == 0:
-            _filter_by_adhikamaasa_relevance(month=month, fest_dict=new_fests)
-          else:
-            m = _get_month(anga=anga)
-            _filter_by_adhikamaasa_relevance(month=m, fest_dict=new_fests)
-        fest_dict.update(new_fests)
+          # Festivals irrelevant in the adhika (or nija) maasa at hand are excluded.
+          maasa = month if m == 0 else _get_month(anga=anga)
+          is_adhika = int(maasa) != maasa
+        else:
+          is_adhika = None
+        fest_dict.update(self._month_anga_index.get((month_type_id, anga_type_id, m, anga_index, is_adhika), ()))
 
     def _check_month_tithi_match(month, angas):
       for anga in angas:
@@ -475,17 +602,50 @@ class RulesCollection(common.JsonObject):
     return fest_dict
   
 
-def _filter_by_adhikamaasa_relevance(month, fest_dict):
-  del_fests = []  # adhika fests to be deleted in nija masas, and nija festivals to be deleted in adhika masas!
-  is_adhika = int(month) != month
-  for fest in fest_dict:
-    adhika_maasa_handling = fest_dict[fest].timing.get_adhika_maasa_handling()
-    if adhika_maasa_handling == 'adhika_only' and not is_adhika:
-      del_fests.append(fest)
-    elif adhika_maasa_handling == 'nija_only' and is_adhika:
-      del_fests.append(fest)
-  for fest in del_fests:
-    del fest_dict[fest]
+def _get_month_key(month):
+  if int(month) != month and month != 0:
+    # Deal with adhika mAsas
+    return "%02d.5" % month
+  else:
+    return "%02d" % month
+
+
+def _parse_index_key(key, format_fn):
+  # The number which format_fn maps to key, if any.
+  try:
+    number = float(key)
+    if int(number) == number:
+      number = int(number)
+  except (ValueError, OverflowError):
+    return None
+  return number if format_fn(number) == key else None
+
+
+def get_approximate_anchor_id(anchor_festival_id):
+  # Eg. kArttika-amAvAsyA for sarva-kArttika-amAvAsyA.
+  if 'amAvAsyA' in anchor_festival_id:
+    anchor_festival_id = anchor_festival_id.strip('sarva-')
+  return anchor_festival_id
+
+
+def is_approximate_anchor_match(anchor_festival_id, festival_id):
+  """Sometimes, the recorded anchor_festival_id of a relative event is not exact (Eg. navama-aparapakSa-samApanam 0 days from sarva-kArttika-amAvAsyA). So, we look for superstring ids (Eg. of kArttika-amAvAsyA)."""
+  anchor_festival_id = get_approximate_anchor_id(anchor_festival_id=anchor_festival_id)
+  if 'amAvAsyA' in anchor_festival_id:
+    # Match bOdhAyana festivals with bOdhAyana anchor ids only.
+    if 'bOdhAyana' not in anchor_festival_id and 'bOdhAyana' in festival_id:
+      return False
+  return anchor_festival_id in festival_id
+
+
+def _is_relevant_in_maasa(fest_rule, is_adhika):
+  # adhika fests are irrelevant in nija masas, and nija festivals in adhika masas!
+  adhika_maasa_handling = fest_rule.timing.get_adhika_maasa_handling()
+  if adhika_maasa_handling == 'adhika_only' and not is_adhika:
+    return False
+  elif adhika_maasa_handling == 'nija_only' and is_adhika:
+    return False
+  return True
 
 
 # Essential for depickling to work.
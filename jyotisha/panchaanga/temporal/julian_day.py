@@ -0,0 +1,250 @@
+"""
+Closed-form conversions between julian days and (proleptic Gregorian) UTC dates and times.
+
+These replace astropy.time.Time objects (which cost tens of microseconds to construct) in the hot loops of time.jd_to_utc_gregorian, time.utc_gregorian_to_jd, time.get_weekday and Timezone methods. The arithmetic (including the rounding of seconds, and the stretching of UTC days ending with leap seconds) follows ERFA routines (eraJd2cal, eraD2tf, eraD2dtf, eraCal2jd, eraDtf2d), which astropy uses - so results are identical to astropy's. 1960-1971 UTC (with fractional "leap seconds") is delegated to astropy.
+
+Set VERIFY_WITH_ASTROPY (or the JYOTISHA_VERIFY_TIME_WITH_ASTROPY environment variable) to cross-check every conversion against astropy. Run this module for a benchmark.
+"""
+import datetime
+import os
+from math import ceil, floor
+
+VERIFY_WITH_ASTROPY = os.environ.get("JYOTISHA_VERIFY_TIME_WITH_ASTROPY", "") not in ("", "0")
+
+SECONDS_PER_DAY = 86400.0
+MJD_ZERO = 2400000.5
+# The julian day number (of the noon) of a date is this more than its proleptic Gregorian ordinal (as in datetime.date.toordinal()).
+ORDINAL_0_JULIAN_DAY_NUMBER = 1721425
+
+# Days ending with a (positive) leap second. None has been announced since.
+LEAP_SECOND_DAYS = frozenset([
+  (1972, 6, 30), (1972, 12, 31), (1973, 12, 31), (1974, 12, 31), (1975, 12, 31), (1976, 12, 31), (1977, 12, 31), (1978, 12, 31), (1979, 12, 31), (1981, 6, 30), (1982, 6, 30), (1983, 6, 30), (1985, 6, 30), (1987, 12, 31), (1989, 12, 31), (1990, 12, 31), (1992, 6, 30), (1993, 6, 30), (1994, 6, 30), (1995, 12, 31), (1997, 6, 30), (1998, 12, 31), (2005, 12, 31), (2008, 12, 31), (2012, 6, 30), (2015, 6, 30), (2016, 12, 31)
+])
+# Before 1972, UTC had fractional steps and drifts relative to TAI.
+_RUBBER_SECOND_YEARS = range(1960, 1972)
+
+
+def _round(x):
+  # Round half away from zero (ERFA_DNINT).
+  return float(floor(x + 0.5)) if x >= 0 else float(ceil(x - 0.5))
+
+
+def _truncating_division(a, b):
+  # C integer division.
+  quotient = abs(a) // abs(b)
+  return quotient if (a >= 0) == (b > 0) else -quotient
+
+
+def _two_sum(a, b):
+  # Exact sum, as (approximate sum, error) - as in astropy.time.utils.
+  x = a + b
+  eb = x - a
+  ea = x - eb
+  return (x, (a - ea) + (b - eb))
+
+
+def _day_frac(val1, val2):
+  # astropy.time.utils.day_frac (without factor and divisor).
+  (sum12, err12) = _two_sum(val1, val2)
+  day = float(round(sum12))
+  (frac, check) = _two_sum(sum12 - day, err12)
+  if frac * ((check > 0) - (check < 0)) != 0.5:
+    excess = round(frac)
+  else:
+    excess = round(frac + 2 * check)
+  day += excess
+  frac = sum12 - day
+  frac += err12
+  return (day, frac)
+
+
+def _jd_to_calendar(dj1, dj2):
+  """eraJd2cal - (year, month, day, fraction of day)."""
+  d = _round(dj1)
+  f1 = dj1 - d
+  jd = int(d)
+  d = _round(dj2)
+  f2 = dj2 - d
+  jd += int(d)
+
+  # Compute f1+f2+0.5 using compensated summation.
+  s = 0.5
+  cs = 0.0
+  for x in (f1, f2):
+    t = s + x
+    cs += ((s - t) + x) if abs(s) >= abs(x) else ((x - t) + s)
+    s = t
+    if s >= 1.0:
+      jd += 1
+      s -= 1.0
+  f = s + cs
+  cs = f - s
+
+  if f < 0.0:
+    f = s + 1.0
+    cs += (1.0 - f) + s
+    s = f
+    f = s + cs
+    cs = f - s
+    jd -= 1
+
+  if (f - 1.0) >= -2.220446049250313e-16 / 4.0:
+    t = s - 1.0
+    cs += (s - t) - 1.0
+    s = t
+    f = s + cs
+    if -2.220446049250313e-16 / 2.0 < f:
+      jd += 1
+      f = max(f, 0.0)
+
+  l = jd + 68569
+  n = _truncating_division(4 * l, 146097)
+  l -= _truncating_division(146097 * n + 3, 4)
+  i = _truncating_division(4000 * (l + 1), 1461001)
+  l -= _truncating_division(1461 * i, 4) - 31
+  k = _truncating_division(80 * l, 2447)
+  day = l - _truncating_division(2447 * k, 80)
+  l = _truncating_division(k, 11)
+  month = k + 2 - 12 * l
+  year = 100 * (n - 49) + i + l
+  return (year, month, day, f)
+
+
+def _days_to_hmsf(ndp, days):
+  """eraD2tf (for non-negative days, ndp >= 0) - (hours, minutes, seconds, fraction of second in units of 10^-ndp)."""
+  nrs = 10 ** ndp
+  (rs, rm, rh) = (float(nrs), nrs * 60.0, nrs * 3600.0)
+  a = _round(rs * (SECONDS_PER_DAY * abs(days)))
+  ah = float(int(a / rh))
+  a -= ah * rh
+  am = float(int(a / rm))
+  a -= am * rm
+  a_s = float(int(a / rs))
+  af = a - a_s * rs
+  return (int(ah), int(am), int(a_s), int(af))
+
+
+def _calendar_to_mjd(year, month, day):
+  """eraCal2jd."""
+  my = _truncating_division(month - 14, 12)
+  iypmy = year + my
+  return float(_truncating_division(1461 * (iypmy + 4800), 4) + _truncating_division(367 * (month - 2 - 12 * my), 12) - _truncating_division(3 * _truncating_division(iypmy + 4900, 100), 4) + day - 2432076)
+
+
+def _get_next_day(year, month, day):
+  return (datetime.date(year, month, day) + datetime.timedelta(days=1)).timetuple()[:3]
+
+
+def _jd_to_ymdhmsf(jd, ndp):
+  """Like eraD2dtf("UTC", ndp, ...) on astropy's split of jd."""
+  (jd1, jd2) = _day_frac(jd, 0.0)
+  (year, month, day, fraction) = _jd_to_calendar(jd1, jd2)
+  leap = (year, month, day) in LEAP_SECOND_DAYS
+  if leap:
+    fraction += fraction / SECONDS_PER_DAY
+  hmsf = _days_to_hmsf(ndp, fraction)
+  if hmsf[0] > 23:
+    if not leap or hmsf[2] > 0:
+      (year, month, day) = _get_next_day(year, month, day)
+      hmsf = (0, 0, 0, 0)
+    else:
+      hmsf = (23, 59, 60, hmsf[3])
+  return (year, month, day) + hmsf
+
+
+def _ymdhms_to_jd(year, month, day, hour, minute, second):
+  """Like eraDtf2d("UTC", ...), followed by astropy's day_frac."""
+  day_length = SECONDS_PER_DAY + (1 if (year, month, day) in LEAP_SECOND_DAYS else 0)
+  (jd1, jd2) = _day_frac(_calendar_to_mjd(year, month, day) + MJD_ZERO, (60.0 * (60 * hour + minute) + second) / day_length)
+  return jd1 + jd2
+
+
+def _verify(fast_value, astropy_value, description):
+  if fast_value != astropy_value:
+    raise AssertionError("%s: %s (fast) != %s (astropy)" % (description, fast_value, astropy_value))
+
+
+def jd_to_ymdhms(jd):
+  """
+  :return: (year, month, day, hour, minute, second) - UTC, as astropy's ymdhms format (with seconds rounded to nanoseconds).
+  """
+  (year, month, day, hour, minute, second, nanoseconds) = _jd_to_ymdhmsf(jd, 9)
+  if year in _RUBBER_SECOND_YEARS:
+    return astropy_jd_to_ymdhms(jd)
+  result = (year, month, day, hour, minute, second + nanoseconds * 10 ** (-9))
+  if VERIFY_WITH_ASTROPY:
+    _verify(result, astropy_jd_to_ymdhms(jd), "jd_to_ymdhms(%r)" % jd)
+  return result
+
+
+def ymdhms_to_jd(year, month, day, hour=0, minute=0, second=0):
+  """
+  :return: The julian day corresponding to the given UTC date and time.
+  """
+  if year in _RUBBER_SECOND_YEARS:
+    return astropy_ymdhms_to_jd(year, month, day, hour, minute, second)
+  result = _ymdhms_to_jd(year, month, day, hour, minute, second)
+  if VERIFY_WITH_ASTROPY:
+    _verify(result, astropy_ymdhms_to_jd(year, month, day, hour, minute, second), "ymdhms_to_jd%r" % ((year, month, day, hour, minute, second),))
+  return result
+
+
+def jd_to_datetime(jd):
+  """
+  :return: A naive datetime.datetime (UTC, rounded to microseconds) - as astropy's datetime format.
+  """
+  (year, month, day, hour, minute, second, microseconds) = _jd_to_ymdhmsf(jd, 6)
+  if year in _RUBBER_SECOND_YEARS:
+    return astropy_jd_to_datetime(jd)
+  if second >= 60:
+    raise ValueError("%r is within a leap second, which datetime does not support." % jd)
+  result = datetime.datetime(year, month, day, hour, minute, second, microseconds)
+  if VERIFY_WITH_ASTROPY:
+    _verify(result, astropy_jd_to_datetime(jd), "jd_to_datetime(%r)" % jd)
+  return result
+
+
+def datetime_to_jd(dt):
+  """
+  :param dt: A datetime.datetime - naive ones are taken to be in UTC.
+  """
+  if dt.tzinfo is not None:
+    utc_dt = (dt - dt.utcoffset()).replace(tzinfo=None)
+  else:
+    utc_dt = dt
+  return ymdhms_to_jd(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute, utc_dt.second + utc_dt.microsecond / 1e6)
+
+
+# The reference (slower) implementations.
+
+def astropy_jd_to_ymdhms(jd):
+  from astropy.time import Time
+  tm = Time(jd, format='jd')
+  tm.format = "ymdhms"
+  return (int(tm.value["year"]), int(tm.value["month"]), int(tm.value["day"]), int(tm.value["hour"]), int(tm.value["minute"]), float(tm.value["second"]))
+
+
+def astropy_ymdhms_to_jd(year, month, day, hour=0, minute=0, second=0):
+  from astropy.time import Time
+  tm = Time({"year": year, "month": month, "day": day, "hour": hour, "minute": minute, "second": second}, format='ymdhms')
+  tm.format = "jd"
+  return float(tm.value)
+
+
+def astropy_jd_to_datetime(jd):
+  from astropy.time import Time
+  tm = Time(jd, format='jd')
+  tm.format = "datetime"
+  return tm.value
+
+
+if __name__ == '__main__':
+  import timeit
+  jd = 2458434.083333251
+  for (name, fast_fn, astropy_fn) in [
+    ("jd_to_ymdhms", lambda: jd_to_ymdhms(jd), lambda: astropy_jd_to_ymdhms(jd)),
+    ("ymdhms_to_jd", lambda: ymdhms_to_jd(2018, 11, 11, 14, 0, 0), lambda: astropy_ymdhms_to_jd(2018, 11, 11, 14, 0, 0)),
+    ("jd_to_datetime", lambda: jd_to_datetime(jd), lambda: astropy_jd_to_datetime(jd)),
+  ]:
+    (fast_seconds, astropy_seconds) = [min(timeit.repeat(fn, number=1000, repeat=5)) / 1000 for fn in (fast_fn, astropy_fn)]
+    print("%-16s fast: %7.2f µs/call, astropy: %7.2f µs/call (%.0fx)" % (name, fast_seconds * 1e6, astropy_seconds * 1e6, astropy_seconds / fast_seconds))
@@ -3,13 +3,15 @@ import datetime as dt_module
 import logging
 import sys
 import traceback
+from bisect import bisect_right
 from math import modf
 from numbers import Number
 
 import methodtools
+import numpy
 import pytz
-from astropy.time import Time
 
+from jyotisha.panchaanga.temporal import julian_day
 from jyotisha.util import zero_if_none
 from sanskrit_data.schema import common
 from sanskrit_data.schema.common import JsonObject
@@ -164,25 +166,38 @@ class Date(BasicDate):
       dt_diff = self.to_datetime() - other.to_datetime()
       return dt_diff.days + dt_diff.seconds / 3600.0 + dt_diff.microseconds / 60.0 / 1e6
     elif isinstance(other, Number):
-      return self.offset_date(days=-other)
+      return self + (-other)
+
+  def to_ordinal_date(self):
+    return OrdinalDate.from_date(date=self)
+
+  def _get_sort_key(self):
+    # Same order as that of to_datetime(), but cheaper.
+    if self.hour is None and self.minute is None and self.second is None:
+      return (dt_module.date(self.year, self.month, self.day).toordinal(), 0)
+    return (dt_module.date(self.year, self.month, self.day).toordinal(), _get_microseconds_of_day(hour=self.hour, minute=self.minute, second=self.second))
 
   def __lt__(self, other):
-    return self.to_datetime() < other.to_datetime()
+    return self._get_sort_key() < other._get_sort_key()
 
   def __eq__(self, other):
-    return self.to_datetime() == other.to_datetime()
+    return self._get_sort_key() == other._get_sort_key()
 
   def __le__(self, other):
-    return self.__lt__(other) or self.__eq__(other)
+    return self._get_sort_key() <= other._get_sort_key()
 
   def __gt__(self, other):
-    return self.to_datetime() > other.to_datetime()
+    return self._get_sort_key() > other._get_sort_key()
 
   def __ge__(self, other):
-    return self.__gt__(other) or self.__eq__(other)
+    return self._get_sort_key() >= other._get_sort_key()
 
   def __add__(self, other):
     if isinstance(other, Number):
+      if self.hour is None and self.minute is None and self.second is None and int(other) == other:
+        # The common case of whole days - without a datetime round trip.
+        day_date = dt_module.date.fromordinal(dt_module.date(self.year, self.month, self.day).toordinal() + int(other))
+        return Date(year=day_date.year, month=day_date.month, day=day_date.day)
       return self.offset_date(days=other)
 
   @classmethod
@@ -281,7 +296,7 @@ class Date(BasicDate):
     return repr(self.to_datetime())
 
   def __hash__(self):
-    return hash(repr(self))
+    return hash(self._get_sort_key())
 
   def get_hour_str(self, format='hh:mm', rounding=False, reference_date=None):
     hour = self.get_fractional_hour()
@@ -291,48 +306,187 @@ class Date(BasicDate):
     return Hour(hour=hour).to_string(format=format, rounding=rounding)
 
 
+def _get_microseconds_of_day(hour, minute, second):
+  second = zero_if_none(second)
+  return ((zero_if_none(hour) * 60 + zero_if_none(minute)) * 60 + int(second)) * 1000000 + int(second * 1e6 % 1e6)
+
+
+class OrdinalDate(object):
+  """A compact date (with optional time of day) - stored as the proleptic Gregorian ordinal (as in datetime.date.toordinal()) and microseconds since midnight. 
+  
+  Comparison, hashing and offsetting by whole days are just integer operations. Converts to and from the (JSON-serializable) Date; and compares like it.
+  """
+  __slots__ = ("ordinal", "microseconds")
+
+  def __init__(self, ordinal, microseconds=None):
+    """
+
+    :param ordinal: 1 for 0001-01-01.
+    :param microseconds: None if there is no time of day.
+    """
+    self.ordinal = ordinal
+    self.microseconds = microseconds
+
+  @classmethod
+  def from_date(cls, date):
+    if date.hour is None and date.minute is None and date.second is None:
+      return OrdinalDate(ordinal=dt_module.date(date.year, date.month, date.day).toordinal())
+    return OrdinalDate(ordinal=dt_module.date(date.year, date.month, date.day).toordinal(), microseconds=_get_microseconds_of_day(hour=date.hour, minute=date.minute, second=date.second))
+
+  def to_date(self):
+    day_date = dt_module.date.fromordinal(self.ordinal)
+    if self.microseconds is None:
+      return Date(year=day_date.year, month=day_date.month, day=day_date.day)
+    (seconds, microseconds) = divmod(self.microseconds, 1000000)
+    return Date(year=day_date.year, month=day_date.month, day=day_date.day, hour=seconds // 3600, minute=seconds // 60 % 60, second=seconds % 60 + microseconds / float(1e6))
+
+  def _get_sort_key(self):
+    return (self.ordinal, zero_if_none(self.microseconds))
+
+  def __eq__(self, other):
+    return self._get_sort_key() == other._get_sort_key()
+
+  def __lt__(self, other):
+    return self._get_sort_key() < other._get_sort_key()
+
+  def __le__(self, other):
+    return self._get_sort_key() <= other._get_sort_key()
+
+  def __gt__(self, other):
+    return self._get_sort_key() > other._get_sort_key()
+
+  def __ge__(self, other):
+    return self._get_sort_key() >= other._get_sort_key()
+
+  def __hash__(self):
+    return hash(self._get_sort_key())
+
+  def __add__(self, days):
+    return OrdinalDate(ordinal=self.ordinal + days, microseconds=self.microseconds)
+
+  def __sub__(self, other):
+    """
+    
+    :param other: Days (int), or another OrdinalDate (in which case, the difference in days is returned).
+    """
+    if isinstance(other, OrdinalDate):
+      return self.ordinal - other.ordinal + (zero_if_none(self.microseconds) - zero_if_none(other.microseconds)) / 86400e6
+    return OrdinalDate(ordinal=self.ordinal - other, microseconds=self.microseconds)
+
+  def __repr__(self):
+    return "OrdinalDate(%d, %s)" % (self.ordinal, self.microseconds)
+
+
 def jd_to_utc_gregorian(jd):
-  tm = Time(jd, format='jd')
-  tm.format = "ymdhms"
-  return Date(year=int(tm.value["year"]), month=int(tm.value["month"]), day=int(tm.value["day"]),
-              hour=int(tm.value["hour"]), minute=int(tm.value["minute"]), second=tm.value["second"])
+  (year, month, day, hour, minute, second) = julian_day.jd_to_ymdhms(jd)
+  return Date(year=year, month=month, day=day, hour=hour, minute=minute, second=second)
 
 
 def utc_gregorian_to_jd(date):
   if date.hour is None:
     date.set_time_to_day_start()
-  tm = Time(
-    {"year": date.year, "month": date.month, "day": date.day, "hour": zero_if_none(date.hour), "minute": zero_if_none(date.minute), "second": zero_if_none(date.second)},
-    format='ymdhms')
-  tm.format = "jd"
-  return tm.value
+  return julian_day.ymdhms_to_jd(year=date.year, month=date.month, day=date.day, hour=zero_if_none(date.hour), minute=zero_if_none(date.minute), second=zero_if_none(date.second))
 
 
 def get_weekday(jd):
-  tm = Time(jd, format='jd')
-  tm.format = "datetime"
   # Sunday should be 0.
-  return tm.value.isocalendar()[2] % 7
+  return julian_day.jd_to_datetime(jd).isocalendar()[2] % 7
+
+
+class UtcOffsetTable(object):
+  """UTC offsets of a timezone, along with the instants when they change (daylight saving time transitions etc.) - precomputed from the pytz tables (which list transitions till 2037, with the last offset continuing thereafter).
+
+  Conversions then need just a bisection and an addition - rather than a pytz.timezone() lookup followed by fromutc() or (the much slower) localize(). Results are identical to pytz's.
+  """
+
+  def __init__(self, timezone_id):
+    self.tzinfo = pytz.timezone(timezone_id)
+    if hasattr(self.tzinfo, "_utc_transition_times"):
+      # A pytz DstTzInfo. Its first "transition" is at datetime(1, 1, 1).
+      self.transition_datetimes = self.tzinfo._utc_transition_times[1:]
+      self.tzinfos = [self.tzinfo._tzinfos[transition_info] for transition_info in self.tzinfo._transition_info]
+      self.offsets = [transition_info[0] for transition_info in self.tzinfo._transition_info]
+    else:
+      self.transition_datetimes = []
+      self.tzinfos = [self.tzinfo]
+      self.offsets = [self.tzinfo.utcoffset(datetime.datetime(2000, 1, 1))]
+    self.transition_jds = [julian_day.datetime_to_jd(transition_datetime) for transition_datetime in self.transition_datetimes]
+    self.offset_hours = [(offset.days * 86400 + offset.seconds) / 3600.0 for offset in self.offsets]
+    # For vectorized lookups.
+    (self._transition_jd_array, self._offset_hour_array) = (numpy.array(self.transition_jds, dtype=float), numpy.array(self.offset_hours))
+
+  @methodtools.lru_cache(maxsize=None)
+  @classmethod
+  def get_cached(cls, timezone_id):
+    return UtcOffsetTable(timezone_id=timezone_id)
+
+  def get_offset_hours(self, jd):
+    # Unlike utc_to_local_datetime, this does not round jd to microseconds first - which matters only within half a microsecond of a transition.
+    return self.offset_hours[bisect_right(self.transition_jds, jd)]
+
+  def get_offset_hours_array(self, jds):
+    """Vectorized version of get_offset_hours."""
+    return self._offset_hour_array[numpy.searchsorted(self._transition_jd_array, jds, side="right")]
+
+  def utc_to_local_datetime(self, utc_datetime):
+    """Same as pytz's fromutc.
+
+    :param utc_datetime: A naive datetime.datetime.
+    """
+    index = bisect_right(self.transition_datetimes, utc_datetime)
+    return (utc_datetime + self.offsets[index]).replace(tzinfo=self.tzinfos[index])
+
+  def local_to_utc_datetime(self, local_datetime):
+    """Same as pytz's localize (and conversion to UTC).
+
+    :param local_datetime: A naive datetime.datetime.
+    :return: A naive datetime.datetime.
+    """
+    utc_datetimes = set()
+    # Like localize, try the offsets prevailing a day before and after.
+    for delta in (datetime.timedelta(days=-1), datetime.timedelta(days=1)):
+      utc_datetime = local_datetime - self.offsets[bisect_right(self.transition_datetimes, local_datetime + delta)]
+      if utc_datetime + self.offsets[bisect_right(self.transition_datetimes, utc_datetime)] == local_datetime:
+        utc_datetimes.add(utc_datetime)
+    if len(utc_datetimes) == 1:
+      return utc_datetimes.pop()
+    # Ambiguous or non-existent local times (around daylight saving time transitions) are rare - leave them to pytz.
+    aware_datetime = self.tzinfo.localize(local_datetime)
+    return (aware_datetime - aware_datetime.utcoffset()).replace(tzinfo=None)
 
 
 class Timezone:
   def __init__(self, timezone_id):
     self.timezone_id = timezone_id
+    self._utc_offset_table = None
 
   @methodtools.lru_cache(maxsize=None)
   @classmethod
   def get_cached(cls, timezone_id):
     return Timezone(timezone_id=timezone_id)
 
+  @property
+  def utc_offset_table(self):
+    # Shared by all Timezone objects with this timezone_id.
+    if self._utc_offset_table is None:
+      self._utc_offset_table = UtcOffsetTable.get_cached(timezone_id=self.timezone_id)
+    return self._utc_offset_table
+
   def get_timezone_offset_hours_from_jd(self, jd: float):
     """Get timezone offset in hours east of UTC (negative west of UTC)
 
     Timezone offset is dependent both on place and time (yes- time, not just date) - due to Daylight savings time.
     compute offset from UTC in hours
     """
-    local_datetime = self.julian_day_to_local_datetime(jd=jd)
-    return (datetime.datetime.utcoffset(local_datetime).days * 86400 +
-            datetime.datetime.utcoffset(local_datetime).seconds) / 3600.0
+    return self.utc_offset_table.get_offset_hours(jd)
+
+  def get_timezone_offset_hours_from_jds(self, jds):
+    """Vectorized version of get_timezone_offset_hours_from_jd.
+
+    :param jds: A sequence (preferably a numpy array) of julian days.
+    :return: A numpy array of offsets in hours.
+    """
+    return self.utc_offset_table.get_offset_hours_array(jds)
 
   def julian_day_to_local_time(self, julian_day: float, round_seconds: bool = False) -> Date:
     local_datetime = self.julian_day_to_local_datetime(jd=julian_day)
@@ -345,23 +499,15 @@ class Timezone:
     return local_time
 
   def julian_day_to_local_datetime(self, jd):
-    tm = Time(jd, format='jd')
-    tm.format = "datetime"
-    return pytz.timezone(self.timezone_id).fromutc(tm.value)
+    return self.utc_offset_table.utc_to_local_datetime(julian_day.jd_to_datetime(jd))
 
   def local_time_to_julian_day(self, date):
     microseconds, _ = modf(zero_if_none(date.second) * 1000000)
-    local_datetime = pytz.timezone(self.timezone_id).localize(
-      datetime.datetime(date.year, date.month, date.day, zero_if_none(date.hour), zero_if_none(date.minute), int(zero_if_none(date.second)), int(microseconds)))
-    tm = Time(local_datetime, format="datetime")
-    tm.format = "jd"
-    return tm.value
+    local_datetime = datetime.datetime(date.year, date.month, date.day, zero_if_none(date.hour), zero_if_none(date.minute), int(zero_if_none(date.second)), int(microseconds))
+    return julian_day.datetime_to_jd(self.utc_offset_table.local_to_utc_datetime(local_datetime))
 
   def julian_day_to_local_time_str(self, jd):
-    tm = Time(jd, format='jd')
-    tm.format = "datetime"
-    local_datetime = pytz.timezone(self.timezone_id).fromutc(tm.value)
-    return str(local_datetime)
+    return str(self.julian_day_to_local_datetime(jd=jd))
 
   def current_time_as_int(self):
     local_datetime = datetime.datetime.now(tz=pytz.timezone(self.timezone_id))    
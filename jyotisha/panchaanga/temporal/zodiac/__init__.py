@@ -1,3 +1,5 @@
+import bisect
+import functools
 import logging
 import sys
 from math import floor
@@ -7,13 +9,14 @@ from typing import Optional
 import methodtools
 import numpy
 import swisseph as swe
+from jyotisha.panchaanga.temporal import body
 from jyotisha.panchaanga.temporal.body import Graha
 from jyotisha.panchaanga.temporal.interval import Interval, AngaSpan
 from jyotisha.panchaanga.temporal.zodiac.angas import AngaType, Anga
 from jyotisha.util import default_if_none
 from sanskrit_data.schema import common
 from sanskrit_data.schema.common import JsonObject
-from scipy.optimize import brentq
+from scipy.interpolate import CubicSpline
 from timebudget import timebudget
 
 
@@ -50,9 +53,7 @@ class Ayanamsha(common.JsonObject):
     if self.ayanaamsha_id == Ayanamsha.VERNAL_EQUINOX_AT_0:
       return 0
     elif self.ayanaamsha_id == Ayanamsha.CHITRA_AT_180:
-      # TODO: The below fails due to https://github.com/astrorigin/pyswisseph/issues/35
-      from jyotisha.panchaanga.temporal import body
-      return body.get_star_longitude(star="Spica", jd=jd) - 180
+      return _get_interpolated_chitra_offset(jd=jd)
     elif self.ayanaamsha_id == Ayanamsha.ASHVINI_STARTING_0:
       return 0
     elif self.ayanaamsha_id == Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING:
@@ -60,6 +61,53 @@ class Ayanamsha(common.JsonObject):
       return swe.get_ayanamsa_ut(jd)
     raise Exception("Bad ayanamsha_id")
 
+  def get_offsets(self, jds):
+    """Vectorized version of get_offset.
+    
+    :param jds: A sequence (preferably a numpy array) of julian days.
+    :return: A numpy array of offsets, corresponding to jds.
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    if self.ayanaamsha_id in (Ayanamsha.VERNAL_EQUINOX_AT_0, Ayanamsha.ASHVINI_STARTING_0):
+      return numpy.zeros(len(jds))
+    elif self.ayanaamsha_id == Ayanamsha.CHITRA_AT_180:
+      return numpy.fromiter((_get_interpolated_chitra_offset(jd=jd) for jd in jds), dtype=float, count=len(jds))
+    elif self.ayanaamsha_id == Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING:
+      swe.set_sid_mode(swe.SIDM_LAHIRI)
+      return numpy.fromiter((swe.get_ayanamsa_ut(jd) for jd in jds), dtype=float, count=len(jds))
+    raise Exception("Bad ayanamsha_id")
+
+
+# Spica positions are sampled every CHITRA_OFFSET_STEP_DAYS and interpolated with cubic splines - max error ~1e-8 degrees (vs ~1e-6 for daily samples, owing to short period nutation terms).
+CHITRA_OFFSET_STEP_DAYS = 0.5
+CHITRA_OFFSET_CHUNK_DAYS = 512
+# Extra samples on either side of a chunk, so that spline end effects do not matter.
+CHITRA_OFFSET_CHUNK_PADDING = 8
+
+
+@functools.lru_cache(maxsize=64)
+def _get_chitra_offset_chunk(chunk_index):
+  """Polynomial coefficients of the offset spline over a CHITRA_OFFSET_CHUNK_DAYS long chunk - computing it costs ~0.1s.
+  
+  :return: (jd of the first knot, coefficients as a list of (c3, c2, c1, c0) tuples, one per step)
+  """
+  num_steps = int(CHITRA_OFFSET_CHUNK_DAYS / CHITRA_OFFSET_STEP_DAYS)
+  jd_chunk_start = chunk_index * CHITRA_OFFSET_CHUNK_DAYS
+  jds = jd_chunk_start + numpy.arange(-CHITRA_OFFSET_CHUNK_PADDING, num_steps + CHITRA_OFFSET_CHUNK_PADDING + 1) * CHITRA_OFFSET_STEP_DAYS
+  # TODO: The below fails due to https://github.com/astrorigin/pyswisseph/issues/35
+  spline = CubicSpline(jds, body.get_star_longitudes(star="Spica", jds=jds) - 180)
+  coefficients = spline.c[:, CHITRA_OFFSET_CHUNK_PADDING: CHITRA_OFFSET_CHUNK_PADDING + num_steps]
+  return (jd_chunk_start, [tuple(x) for x in coefficients.T.tolist()])
+
+
+def _get_interpolated_chitra_offset(jd):
+  chunk_index = int(floor(jd / CHITRA_OFFSET_CHUNK_DAYS))
+  (jd_chunk_start, coefficients) = _get_chitra_offset_chunk(chunk_index)
+  step_index = min(int((jd - jd_chunk_start) / CHITRA_OFFSET_STEP_DAYS), len(coefficients) - 1)
+  dx = jd - jd_chunk_start - step_index * CHITRA_OFFSET_STEP_DAYS
+  (c3, c2, c1, c0) = coefficients[step_index]
+  return ((c3 * dx + c2) * dx + c1) * dx + c0
+
 
 class NakshatraDivision(common.JsonObject):
   """Nakshatra division at a certain time, according to a certain ayanaamsha."""
@@ -128,11 +176,59 @@ class NakshatraDivision(common.JsonObject):
 
     #  Get the lunar longitude, starting at the ayanaamsha point in the ecliptic.
     for body_name, weight in anga_type.body_weights.items():
+      if weight == 0:
+        continue
       longitude = Graha.singleton(body_name=body_name).get_longitude(self.jd, ayanaamsha_id=ayanaamsha_id)
       lcalc += weight * longitude
 
     return self.longitude_to_fractional_division(longitude=lcalc, anga_type=anga_type)
 
+  def get_anga_float_and_rate(self, anga_type):
+    """Like get_anga_float, but also returns the rate of change (angas per day) - useful for Newton-Raphson root finding.
+    """
+    if anga_type == AngaType.TITHI:
+      # For efficiency - avoid lookups.
+      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
+    else:
+      ayanaamsha_id = self.ayanaamsha_id
+
+    lcalc = 0
+    speed = 0
+    for body_name, weight in anga_type.body_weights.items():
+      if weight == 0:
+        continue
+      (longitude, body_speed) = Graha.singleton(body_name=body_name).get_longitude_and_speed(self.jd, ayanaamsha_id=ayanaamsha_id)
+      lcalc += weight * longitude
+      speed += weight * body_speed
+
+    return (self.longitude_to_fractional_division(longitude=lcalc, anga_type=anga_type), speed / anga_type.arc_length)
+
+  @classmethod
+  def get_anga_floats(cls, jds, anga_type, ayanaamsha_id):
+    """Vectorized version of get_anga_float.
+
+      Args:
+        :param jds: A sequence (preferably a numpy array) of julian days.
+        :param anga_type: One of the pre-defined tuple-valued constants in the panchaanga
+        class, such as TITHI, nakshatra, YOGA, KARANA or SIDEREAL_MONTH
+        :param ayanaamsha_id: 
+
+      Returns:
+        numpy array of float angas, corresponding to jds
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    if anga_type == AngaType.TITHI:
+      # For efficiency - avoid lookups.
+      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
+
+    lcalc = numpy.zeros(len(jds))
+    for body_name, weight in anga_type.body_weights.items():
+      if weight == 0:
+        continue
+      lcalc += weight * Graha.singleton(body_name=body_name).get_longitudes(jds, ayanaamsha_id=ayanaamsha_id)
+
+    return (lcalc % 360) / anga_type.arc_length
+
   def get_anga(self, anga_type):
     """Returns the anga prevailing at a particular time. Computed based on lunar and solar longitudes, division of a circle into a certain number of degrees (arc_len).
 
@@ -208,10 +304,16 @@ def ecliptic_to_equatorial(longitude, latitude):
 
 
 class AngaSpanFinder(JsonObject):
+  # A jump of (PREDICTION_SAFETY_FACTOR * angas to go * mean anga span) won't overshoot as long as the actual rate is within 1/PREDICTION_SAFETY_FACTOR times the mean rate.
+  PREDICTION_SAFETY_FACTOR = 0.8
+
   def __init__(self, ayanaamsha_id, anga_type):
     super(AngaSpanFinder, self).__init__()
     self.ayanaamsha_id = ayanaamsha_id
     self.anga_type = anga_type
+    # Instrumentation
+    self._find_calls = 0
+    self._find_ephemeris_calls = 0
 
   @methodtools.lru_cache(maxsize=None)
   @classmethod
@@ -229,14 +331,68 @@ class AngaSpanFinder(JsonObject):
     else:
       return anga_float - (target_anga.index - 1)
 
-  def _interpolate_for_start(self, jd1, jd2, target_anga):
+  def _get_anga_float_offset_and_rate(self, jd, target_anga):
+    (anga_float, rate) = NakshatraDivision(jd, ayanaamsha_id=self.ayanaamsha_id).get_anga_float_and_rate(anga_type=self.anga_type)
+    num_angas = self.anga_type.num_angas
+    if anga_float > target_anga.index:
+      return (anga_float - num_angas, rate) # A negative number
+    else:
+      return (anga_float - (target_anga.index - 1), rate)
+
+  def _interpolate_for_start(self, jd1, jd2, target_anga, tolerance=body.DEFAULT_ROOT_TOLERANCE_DAYS):
     try:
-      # noinspection PyTypeChecker
-      return brentq(lambda x: self._get_anga_float_offset(jd=x, target_anga=target_anga), jd1, jd2)
+      return body.find_root(lambda x: self._get_anga_float_offset_and_rate(jd=x, target_anga=target_anga), jd1, jd2, tolerance=tolerance)
     except ValueError:
       return None
 
+  def _is_predictable(self):
+    # Angas based on the sun and the moon progress at rates within ~20% of the mean rate. Other grahas can even go retrograde.
+    for body_name, weight in self.anga_type.body_weights.items():
+      if weight != 0 and body_name not in (Graha.SUN, Graha.MOON):
+        return False
+    return self.anga_type.mean_period_days is not None
+
   def find_anga_start_between(self, jd1, jd2, target_anga):
+    """Find the first start of target_anga between jd1 and jd2.
+    
+    Rather than walking in fixed steps, we predict the boundary from the current fractional anga and the mean rate - undershooting (by PREDICTION_SAFETY_FACTOR) while far away, and stepping into the target anga once less than an anga away. This needs 2-4 anga evaluations (vs ~2 per anga span for walking), followed by root finding within a tight bracket.
+    """
+    if not self._is_predictable():
+      return self._find_anga_start_between_by_walking(jd1=jd1, jd2=jd2, target_anga=target_anga)
+    num_angas = self.anga_type.num_angas
+    mean_anga_days = self.anga_type.mean_period_days / num_angas
+    jd_bracket_L = None
+    angas_ahead_L = None
+    jd_now = jd1
+    while True:
+      anga_float = NakshatraDivision(jd_now, ayanaamsha_id=self.ayanaamsha_id).get_anga_float(anga_type=self.anga_type)
+      # How far (in angas) is the start of target_anga?
+      angas_ahead = (target_anga.index - 1 - anga_float) % num_angas
+      if angas_ahead > num_angas - 1:
+        # target_anga prevails at jd_now.
+        if jd_bracket_L is not None:
+          jd_start = self._interpolate_for_start(jd1=jd_bracket_L, jd2=jd_now, target_anga=target_anga)
+          if jd_start is None:
+            return self._find_anga_start_between_by_walking(jd1=jd_now, jd2=jd2, target_anga=target_anga)
+          return jd_start
+        # Else, target_anga prevails at jd1 itself. So, we seek its next occurence.
+      else:
+        if jd_bracket_L is not None and angas_ahead > angas_ahead_L:
+          # We have overshot target_anga altogether - unexpected for a sane anga_type.mean_period_days.
+          logging.warning("Overshot %s between %f and %f. Falling back to walking.", target_anga, jd_bracket_L, jd_now)
+          return self._find_anga_start_between_by_walking(jd1=jd_bracket_L, jd2=jd2, target_anga=target_anga)
+        jd_bracket_L = jd_now
+        angas_ahead_L = angas_ahead
+      if jd_now >= jd2:
+        return None
+      if angas_ahead >= 1:
+        # Land short of the target_anga start.
+        jd_now = min(jd_now + angas_ahead * mean_anga_days * AngaSpanFinder.PREDICTION_SAFETY_FACTOR, jd2)
+      else:
+        # Land within target_anga.
+        jd_now = min(jd_now + (angas_ahead + 0.5) * mean_anga_days, jd2)
+
+  def _find_anga_start_between_by_walking(self, jd1, jd2, target_anga):
     jd_start = None
     num_angas = self.anga_type.num_angas
     min_step = 0.5 * self.anga_type.mean_period_days/num_angas  # Min Step for moving - half an anga span.
@@ -276,6 +432,7 @@ class AngaSpanFinder(JsonObject):
     else:
       target_anga = target_anga_id
 
+    ephemeris_call_count_start = body.get_ephemeris_call_count()
     anga_interval = AngaSpan(jd_start=None, jd_end=None, anga=target_anga)
 
     anga_interval.jd_start = self.find_anga_start_between(jd1=jd1, jd2=jd2, target_anga=target_anga)
@@ -284,9 +441,20 @@ class AngaSpanFinder(JsonObject):
     anga_interval.jd_end = self.find_anga_start_between(jd1=default_if_none(anga_interval.jd_start, jd1), jd2=jd2, target_anga=next_anga)
     if anga_interval.jd_start is None and anga_interval.jd_end is None:
       if self._get_anga(jd=jd1) != target_anga:
-        return None
+        anga_interval = None
+    self._record_ephemeris_calls(body.get_ephemeris_call_count() - ephemeris_call_count_start)
     return anga_interval
 
+  def _record_ephemeris_calls(self, count):
+    self._find_calls += 1
+    self._find_ephemeris_calls += count
+
+  def get_mean_ephemeris_calls_per_find(self):
+    """Instrumentation: the mean number of ephemeris calls made per find() call so far."""
+    if self._find_calls == 0:
+      return None
+    return self._find_ephemeris_calls / self._find_calls
+
   @timebudget
   def get_spans_in_period(self, jd_start, jd_end, target_anga_id):
     if jd_start > jd_end:
@@ -324,6 +492,70 @@ class AngaSpanFinder(JsonObject):
     return spans
 
 
+class AngaTimeline(JsonObject):
+  """All boundaries of some anga type over a period - computed in a single forward sweep, so that daily computations (which would otherwise rediscover boundaries around each day seam) can just slice it.
+  """
+  def __init__(self, ayanaamsha_id, anga_type, jd_start, jd_end, angas=None, boundaries=None):
+    """
+    
+    :param angas: Precomputed angas (else computed along with boundaries). 
+    :param boundaries: Precomputed boundaries - angas[i] prevails between boundaries[i-1] and boundaries[i].
+    """
+    super(AngaTimeline, self).__init__()
+    self.ayanaamsha_id = ayanaamsha_id
+    self.anga_type = anga_type
+    self.jd_start = jd_start
+    self.jd_end = jd_end
+    if angas is None:
+      spans = AngaSpanFinder.get_cached(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type).get_all_angas_in_period(jd1=jd_start, jd2=jd_end)
+      angas = [span.anga for span in spans]
+      boundaries = [span.jd_end for span in spans[:-1]]
+    self.angas = angas
+    self.boundaries = boundaries
+
+  @classmethod
+  def from_transits(cls, ayanaamsha_id, anga_type, jd_start, jd_end):
+    """Timeline of an anga type depending on a single body (eg. graha raashi-s) - from Graha.get_transits, which (unlike AngaSpanFinder, which only looks for the next anga) accounts for retrograde motion.
+    """
+    (body_name,) = anga_type.body_weights.keys()
+    graha = Graha.singleton(body_name)
+    transits = graha.get_transits(jd_start=jd_start, jd_end=jd_end, ayanaamsha_id=ayanaamsha_id, anga_type=anga_type)
+    if len(transits) > 0:
+      anga_index = transits[0].value_1
+    else:
+      anga_index = int(graha.get_longitude(jd=jd_start, ayanaamsha_id=ayanaamsha_id) // anga_type.arc_length) + 1
+    angas = [Anga.get_cached(index=anga_index, anga_type_id=anga_type.name)] + [Anga.get_cached(index=transit.value_2, anga_type_id=anga_type.name) for transit in transits]
+    return AngaTimeline(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=jd_start, jd_end=jd_end, angas=angas, boundaries=[transit.jd for transit in transits])
+
+  def get_coarser_timeline(self, anga_type, ayanaamsha_id=None):
+    """Derive the timeline of a coarser anga type, whose angas are exactly subdivided by angas of this timeline - eg. tithi from karana.
+    
+    :param ayanaamsha_id: Defaults to that of this timeline. Tithi-s are independent of ayanaamsha, for example.  
+    """
+    ratio = self.anga_type.num_angas // anga_type.num_angas
+    if ratio * anga_type.num_angas != self.anga_type.num_angas or anga_type.body_weights != self.anga_type.body_weights:
+      raise ValueError("%s does not subdivide %s" % (self.anga_type, anga_type))
+    angas = [Anga.get_cached(index=(self.angas[0].index - 1) // ratio + 1, anga_type_id=anga_type.name)]
+    boundaries = []
+    for (boundary, anga) in zip(self.boundaries, self.angas[1:]):
+      if (anga.index - 1) % ratio == 0:
+        angas.append(Anga.get_cached(index=(anga.index - 1) // ratio + 1, anga_type_id=anga_type.name))
+        boundaries.append(boundary)
+    return AngaTimeline(ayanaamsha_id=default_if_none(ayanaamsha_id, self.ayanaamsha_id), anga_type=anga_type, jd_start=self.jd_start, jd_end=self.jd_end, angas=angas, boundaries=boundaries)
+
+  def covers(self, jd1, jd2):
+    return self.jd_start <= jd1 and jd2 <= self.jd_end
+
+  def get_all_angas_in_period(self, jd1, jd2):
+    """Equivalent to AngaSpanFinder.get_all_angas_in_period (with fresh AngaSpan objects), for periods covered by this timeline.
+    """
+    index_1 = bisect.bisect_right(self.boundaries, jd1)
+    index_2 = bisect.bisect_right(self.boundaries, jd2)
+    jd_ends = self.boundaries[index_1: index_2] + [None]
+    jd_starts = [None] + self.boundaries[index_1: index_2]
+    return [AngaSpan(jd_start=jd_start, jd_end=jd_end, anga=anga) for (jd_start, jd_end, anga) in zip(jd_starts, jd_ends, self.angas[index_1: index_2 + 1])]
+
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
 
@@ -84,8 +84,8 @@ AngaType.TITHI_PADA = AngaType(name='TITHI_PADA', name_hk="tithi-pAdaH", num_ang
 AngaType.NAKSHATRA = AngaType(name='NAKSHATRA', name_hk="nakSatram", num_angas=27, body_weights={Graha.MOON: 1, Graha.SUN: 0}, mean_period_days=27.321661)
 AngaType.NAKSHATRA_PADA = AngaType(name='NAKSHATRA_PADA', name_hk="nakSatra-pAdaH", num_angas=108, body_weights={Graha.MOON: 1, Graha.SUN: 0}, mean_period_days=27.321661)
 AngaType.RASHI = AngaType(name='RASHI', name_hk="rAziH", num_angas=12, body_weights={Graha.MOON: 1, Graha.SUN: 0}, mean_period_days=27.321661)
-AngaType.YOGA = AngaType(name='YOGA', name_hk="yOgaH", num_angas=27, body_weights={Graha.MOON: 1, Graha.SUN: 1}, mean_period_days=29.541)
-AngaType.YOGA_PADA = AngaType(name='YOGA_PADA', name_hk="yOga-pAdaH", num_angas=108, body_weights={Graha.MOON: 1, Graha.SUN: 1}, mean_period_days=29.541)
+AngaType.YOGA = AngaType(name='YOGA', name_hk="yOgaH", num_angas=27, body_weights={Graha.MOON: 1, Graha.SUN: 1}, mean_period_days=25.415)
+AngaType.YOGA_PADA = AngaType(name='YOGA_PADA', name_hk="yOga-pAdaH", num_angas=108, body_weights={Graha.MOON: 1, Graha.SUN: 1}, mean_period_days=25.415)
 AngaType.KARANA = AngaType(name='KARANA', name_hk="karaNam", num_angas=60, body_weights={Graha.MOON: 1, Graha.SUN: -1}, mean_period_days=29.4)
 AngaType.DEGREE = AngaType(name='DEGREE', name_hk=None, num_angas=360)
 AngaType.SIDEREAL_MONTH = AngaType(name='SIDEREAL_MONTH', name_hk="rAzi-mAsaH", num_angas=12, body_weights={Graha.MOON: 0, Graha.SUN: 1}, mean_period_days=365.242)
@@ -0,0 +1,113 @@
+"""
+A process-wide (and optionally on-disk) store of anga boundaries.
+
+Tithi boundaries do not depend on the observer, and nakshatra/ yoga boundaries depend only on the ayanaamsha. So, panchaangas for different cities (computed in the same process or batch) can share them.
+
+Boundaries are stored in chunks of CHUNK_DAYS aligned to multiples of CHUNK_DAYS (so that overlapping requests for different periods share chunks), keyed by (anga_type name, ayanaamsha_id, chunk index), and evicted in least-recently-used order.
+"""
+import json
+import logging
+import os
+from collections import OrderedDict
+from math import floor
+
+from jyotisha import util
+from jyotisha.panchaanga.temporal.zodiac import AngaTimeline, Ayanamsha
+from jyotisha.panchaanga.temporal.zodiac.angas import Anga
+
+CHUNK_DAYS = 64
+# ~80 city-years worth of all anga types.
+DEFAULT_MAX_CHUNKS = 4096
+STORE_FORMAT_VERSION = 1
+
+
+def get_normalized_ayanaamsha_id(anga_type, ayanaamsha_id):
+  """Angas like tithi and karaNa depend only on the difference of longitudes - and hence not on the ayanaamsha."""
+  if sum(anga_type.body_weights.values()) == 0:
+    return Ayanamsha.ASHVINI_STARTING_0
+  return ayanaamsha_id
+
+
+class AngaBoundaryStore(object):
+  def __init__(self, max_chunks=DEFAULT_MAX_CHUNKS, cache_dir=None):
+    """
+
+    :param max_chunks: Max number of chunks kept in memory.
+    :param cache_dir: If not None, chunks are also persisted to (and read from) this directory.
+    """
+    self.max_chunks = max_chunks
+    self.cache_dir = cache_dir
+    self._chunks = OrderedDict()
+    # Instrumentation
+    self.hits = 0
+    self.misses = 0
+
+  def get_timeline(self, ayanaamsha_id, anga_type, jd_start, jd_end):
+    """Get an AngaTimeline covering at least [jd_start, jd_end].
+
+    The timeline ayanaamsha_id is normalized (see get_normalized_ayanaamsha_id).
+    """
+    ayanaamsha_id = get_normalized_ayanaamsha_id(anga_type=anga_type, ayanaamsha_id=ayanaamsha_id)
+    chunk_indices = range(int(floor(jd_start / CHUNK_DAYS)), int(floor(jd_end / CHUNK_DAYS)) + 1)
+    angas = []
+    boundaries = []
+    for chunk_index in chunk_indices:
+      (chunk_angas, chunk_boundaries) = self._get_chunk(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, chunk_index=chunk_index)
+      # The first anga of a chunk is the one prevailing at the end of the previous chunk.
+      angas.extend(chunk_angas if len(angas) == 0 else chunk_angas[1:])
+      boundaries.extend(chunk_boundaries)
+    return AngaTimeline(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=chunk_indices[0] * CHUNK_DAYS, jd_end=(chunk_indices[-1] + 1) * CHUNK_DAYS, angas=angas, boundaries=boundaries)
+
+  def _get_chunk(self, ayanaamsha_id, anga_type, chunk_index):
+    key = (anga_type.name, ayanaamsha_id, chunk_index)
+    chunk = self._chunks.get(key, None)
+    if chunk is not None:
+      self.hits += 1
+      self._chunks.move_to_end(key)
+      return chunk
+    self.misses += 1
+    chunk = self._read_chunk(key=key, anga_type=anga_type)
+    if chunk is None:
+      timeline = AngaTimeline(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, jd_start=chunk_index * CHUNK_DAYS, jd_end=(chunk_index + 1) * CHUNK_DAYS)
+      chunk = (timeline.angas, timeline.boundaries)
+      self._write_chunk(key=key, chunk=chunk)
+    self._chunks[key] = chunk
+    while len(self._chunks) > self.max_chunks:
+      self._chunks.popitem(last=False)
+    return chunk
+
+  def _get_chunk_path(self, key):
+    return os.path.join(os.path.expanduser(self.cache_dir), "%s__%s__%d.json" % key)
+
+  def _read_chunk(self, key, anga_type):
+    if self.cache_dir is None:
+      return None
+    path = self._get_chunk_path(key=key)
+    if not os.path.exists(path):
+      return None
+    try:
+      with open(path) as f:
+        chunk_dict = json.load(f)
+      if chunk_dict["version"] != STORE_FORMAT_VERSION:
+        return None
+      return ([Anga.get_cached(index=index, anga_type_id=anga_type.name) for index in chunk_dict["angas"]], chunk_dict["boundaries"])
+    except (EnvironmentError, ValueError, KeyError):
+      logging.warning("Ignoring corrupt anga boundary file %s", path)
+      return None
+
+  def _write_chunk(self, key, chunk):
+    if self.cache_dir is None:
+      return
+    path = self._get_chunk_path(key=key)
+    try:
+      util.write_file_atomically(filename=path, content=json.dumps({"version": STORE_FORMAT_VERSION, "angas": [anga.index for anga in chunk[0]], "boundaries": chunk[1]}))
+    except EnvironmentError:
+      logging.warning("Not able to save anga boundaries to %s.", path)
+
+  def clear(self):
+    """Clear the in-memory store (not the on-disk one)."""
+    self._chunks.clear()
+
+
+# The process-wide store. Set DEFAULT_STORE.cache_dir to persist boundaries across processes.
+DEFAULT_STORE = AngaBoundaryStore()
@@ -13,7 +13,7 @@ from doc_curation.md.library import metadata_helper
 
 import jyotisha
 from indic_transliteration import sanscript
-from jyotisha.panchaanga.spatio_temporal import annual
+from jyotisha.panchaanga.spatio_temporal import annual, batch
 from jyotisha.panchaanga.temporal import ComputationSystem, era
 from jyotisha.panchaanga.temporal.festival.rules import RulesRepo
 from jyotisha.panchaanga.writer import ics, md
@@ -77,6 +77,14 @@ def dump_summary(year, city, script=sanscript.DEVANAGARI, year_type=era.ERA_GREG
   md_file.dump_to_file(metadata={"title": "%d Summary" % (year)}, content=md, dry_run=False)
 
 
+def dump_summaries(years, cities, script=sanscript.DEVANAGARI, year_type=era.ERA_GREGORIAN, computation_system=ComputationSystem.MULTI_NEW_MOON_SIDEREAL_MONTH_ADHIKA__CHITRA_180, workers=None):
+  """Like dump_summary for each city and year - but the panchaangas are first computed in parallel (see batch.run_jobs)."""
+  jobs = batch.get_jobs(cities=cities, years=years, year_types=[year_type], computation_systems=[computation_system])
+  batch.run_jobs(jobs=jobs, workers=workers)
+  for job in jobs:
+    dump_summary(year=job.year, city=job.city, script=script, year_type=year_type, computation_system=computation_system, allow_precomputed=True)
+
+
 def get_canonical_path(city, computation_system_str, year, year_type=era.ERA_GREGORIAN, output_dir=output_dir):
   if isinstance(year, str):
     year = int(year)
@@ -1,5 +1,67 @@
+import copyreg
+import io
+import os
+import pickle
+
+from sanskrit_data.schema.common import JsonObject
+
+
 def zero_if_none(x):
   return default_if_none(x=x, default=0)
 
 def default_if_none(x, default):
   return default if x is None else x
+
+
+def _set_dict(obj, state):
+  obj.__dict__.update(state)
+
+
+class _JsonObjectPickler(pickle.Pickler):
+  def reducer_override(self, obj):
+    # JsonObject.__getattr__ returns None for any missing attribute (__setstate__ included) - which breaks default unpickling.
+    if isinstance(obj, JsonObject):
+      return (copyreg.__newobj__, (type(obj),), obj.__dict__, None, None, _set_dict)
+    return NotImplemented
+
+
+def pickle_dumps(obj):
+  """pickle.dumps, which also handles (sanskrit_data) JsonObjects - eg. for sending them to other processes. Use pickle.loads to load."""
+  f = io.BytesIO()
+  _JsonObjectPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+  return f.getvalue()
+
+
+def write_file_atomically(filename, content, binary=False):
+  """Write content to a temporary file which then replaces filename (creating missing directories) - so that concurrent readers (or an interrupted run) never leave partial files.
+
+  :param content: A str, bytes, or a function which writes to the (open) temporary file.
+  :param binary: Whether a content function writes bytes.
+  """
+  filename = os.path.expanduser(filename)
+  temp_filename = "%s.%d.tmp" % (filename, os.getpid())
+  if isinstance(content, (str, bytes)):
+    (data, binary) = (content, isinstance(content, bytes))
+    content = lambda f: f.write(data)
+  try:
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(temp_filename, "wb" if binary else "w") as f:
+      content(f)
+    os.replace(temp_filename, filename)
+  finally:
+    if os.path.exists(temp_filename):
+      os.remove(temp_filename)
+
+
+def dump_to_file_atomically(obj, filename):
+  """Like JsonObject.dump_to_file, but writes to a temporary file which then replaces filename - so that concurrent readers (or an interrupted run) never leave partial files."""
+  filename = os.path.expanduser(filename)
+  (root, extension) = os.path.splitext(filename)
+  # The extension determines the format.
+  temp_filename = "%s.%d.tmp%s" % (root, os.getpid(), extension)
+  try:
+    obj.dump_to_file(filename=temp_filename)
+    os.replace(temp_filename, filename)
+  finally:
+    if os.path.exists(temp_filename):
+      os.remove(temp_filename)
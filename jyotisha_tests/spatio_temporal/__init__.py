@@ -1,9 +1,16 @@
+import copy
 import os
 
 from jyotisha.panchaanga.spatio_temporal import City
 from jyotisha.panchaanga.spatio_temporal.periodical import Panchaanga
+from jyotisha.panchaanga.temporal import ComputationSystem
 
 chennai = City.get_city_from_db("Chennai")
+orinda = City('Orinda', '37:51:38', '-122:10:59', 'America/Los_Angeles')
+
+# For tests which do not need festivals - which take the bulk of the computation time.
+computation_system_no_fests = copy.deepcopy(ComputationSystem.DEFAULT)
+computation_system_no_fests.festival_options.no_fests = True
 
 
 TEST_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
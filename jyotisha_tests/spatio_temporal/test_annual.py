@@ -33,6 +33,8 @@ def panchaanga_json_comparer(city, year):
   expected_content_path = os.path.join(TEST_DATA_PATH, '%s-%d.json' % (city.name, year))
   panchaanga = annual.get_panchaanga_for_civil_year(city=city, year=year, computation_system=test_computation_system,
                                                     allow_precomputed=False)
+  # The expected content includes rise and set times of all grahas.
+  panchaanga.compute_graha_rise_set_jds()
   timebudget.report(reset=True)
   testing.json_compare(actual_object=panchaanga, expected_content_path=expected_content_path)
 
@@ -0,0 +1,41 @@
+import os
+
+from jyotisha.panchaanga.spatio_temporal import City, annual, batch
+from jyotisha.panchaanga.temporal import ComputationSystem, eclipse, era, julian_day
+from jyotisha_tests.spatio_temporal import chennai, computation_system_no_fests
+
+
+def test_run_jobs(tmp_path, monkeypatch):
+  # Caches (eg. the eclipse catalogue, at eclipse.DEFAULT_CACHE_DIR) are written under the home directory - also by worker processes.
+  monkeypatch.setenv("HOME", str(tmp_path))
+  # Centuries already loaded (by earlier tests in this process) would not be saved again.
+  monkeypatch.setattr(eclipse, "DEFAULT_CATALOGUE", eclipse.EclipseCatalogue(cache_dir=eclipse.DEFAULT_CACHE_DIR))
+  output_dir = str(tmp_path / "output")
+  # The sun does not rise at Tromsø in early January - the failure of the latter job should be reported, not raised.
+  tromso = City('Tromso', '69:38:56', '18:57:18', 'Europe/Oslo')
+  jobs = batch.get_jobs(cities=[chennai, tromso], years=[2019], computation_systems=[computation_system_no_fests])
+  reports = batch.run_jobs(jobs=jobs, output_dir=output_dir, workers=2)
+  assert [report.job for report in reports] == jobs
+  assert reports[0].error is None
+  assert "No sunrise was computed" in reports[1].error
+  assert os.listdir(output_dir) == [os.path.basename(reports[0].output_path)]
+  assert len(os.listdir(str(tmp_path / "Documents" / "jyotisha" / "eclipses"))) > 0
+  panchaanga = annual.get_panchaanga_for_year(city=chennai, year=2019, year_type=era.ERA_GREGORIAN, computation_system=computation_system_no_fests, precomputed_json_dir=output_dir)
+  assert panchaanga.start_date.get_date_str() == "2019-01-01"
+
+
+def test_get_jd_ranges():
+  jobs = batch.get_jobs(cities=[chennai], years=[2019, 2020, 2030])
+  # Kali year 5121 begins in 2020.
+  jobs += batch.get_jobs(cities=[chennai], years=[5121], year_types=[era.ERA_KALI])
+  assert batch._get_jd_ranges(jobs=jobs) == [(julian_day.ymdhms_to_jd(2018, 1, 1), julian_day.ymdhms_to_jd(2022, 1, 1)), (julian_day.ymdhms_to_jd(2029, 1, 1), julian_day.ymdhms_to_jd(2032, 1, 1))]
+
+
+def test_get_jobs():
+  jobs = batch.get_jobs(cities=[chennai], years=[2019, 2020], year_types=[era.ERA_GREGORIAN, era.ERA_KALI])
+  assert [(job.year_type, job.year) for job in jobs] == [(era.ERA_GREGORIAN, 2019), (era.ERA_GREGORIAN, 2020), (era.ERA_KALI, 2019), (era.ERA_KALI, 2020)]
+  assert jobs[0].computation_system is ComputationSystem.DEFAULT
+
+
+def test_parse_years():
+  assert batch._parse_years(["2019", "2021-2023"]) == [2019, 2021, 2022, 2023]
@@ -28,6 +28,8 @@ TEST_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
 def panchaanga_json_comparer(city, date):
   expected_content_path=os.path.join(TEST_DATA_PATH, '%s-%s.json' % (city.name, date.get_date_str()))
   panchaanga = daily.DailyPanchaanga(city=city, date=date)
+  # The expected content includes rise and set times of all grahas.
+  panchaanga.compute_graha_rise_set_jds()
   timebudget.report(reset=True)
   testing.json_compare(actual_object=panchaanga, expected_content_path=expected_content_path)
   return panchaanga
@@ -150,3 +152,18 @@ def test_get_samvatsara():
   assert panchaanga.get_samvatsara(month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR).get_name(script=sanscript.DEVANAGARI) == "विकारी"
   panchaanga = daily.DailyPanchaanga(city=city, date=Date(year=2020, month=4, day=20))
   assert panchaanga.get_samvatsara(month_type=RulesRepo.SIDEREAL_SOLAR_MONTH_DIR).get_name(script=sanscript.DEVANAGARI) == "शार्वरी"
+
+
+def test_lazy_graha_rise_set():
+  from jyotisha.panchaanga.temporal import ComputationSystem, FestivalOptions
+  from jyotisha.panchaanga.temporal.body import Graha
+  panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2018, 11, 11))
+  assert panchaanga.graha_rise_jd == {} and panchaanga.graha_set_jd == {}
+  numpy.testing.assert_approx_equal(panchaanga.get_graha_rise_jd(body=Graha.SATURN), chennai.get_rising_time(julian_day_start=panchaanga.jd_sunrise, body=Graha.SATURN))
+  assert list(panchaanga.graha_rise_jd.keys()) == [Graha.SATURN]
+  panchaanga.compute_graha_rise_set_jds()
+  assert sorted(panchaanga.graha_set_jd.keys()) == sorted(Graha.PLANETS_REVERSE_ORDER + [Graha.MOON])
+
+  computation_system = ComputationSystem(lunar_month_assigner_type=ComputationSystem.DEFAULT.lunar_month_assigner_type, ayanaamsha_id=ComputationSystem.DEFAULT.ayanaamsha_id, festival_options=FestivalOptions(graha_rise_set_bodies=[Graha.MOON]))
+  panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2018, 11, 11), computation_system=computation_system)
+  assert list(panchaanga.graha_rise_jd.keys()) == [Graha.MOON]
@@ -0,0 +1,44 @@
+import ast
+import inspect
+import textwrap
+
+import pytest
+
+from jyotisha.panchaanga.spatio_temporal import periodical
+from jyotisha.panchaanga.spatio_temporal.festival_query import FestivalQuery, OVERRIDDEN_FEST_IDS
+from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner
+from jyotisha_tests.spatio_temporal import chennai
+
+
+def test_find_dates():
+  panchaanga = periodical.Panchaanga(city=chennai, start_date='2019-01-01', end_date='2019-12-31')
+  query = FestivalQuery(city=chennai)
+  # Lunar tithi, lunar nakshatra, sidereal nakshatra, yoga (in every month), gregorian day, sidereal solar day and relative festivals.
+  for fest_id in ['dIpAvalI_or_lakSmI-kubEra-pUjA', 'sarasvatI-AvAhanam', 'tiruvaNNAmalai~dIpam', 'vaidhRti-zrAddham', 'bhArata-svAtantrya-dinotsavaH', 'sarvanadI-rajasvalA~1', 'EkaviMzati-divasa-gaNapati-vrata-samApanam']:
+    expected_dates = sorted(panchaanga.festival_id_to_days.get(fest_id, set()))
+    assert len(expected_dates) > 0, fest_id
+    assert query.find_dates(fest_id=fest_id, start_year=2019, end_year=2019) == expected_dates, fest_id
+
+  with pytest.raises(ValueError):
+    query.find_dates(fest_id='mahA~kArttikI', start_year=2019, end_year=2019)
+  with pytest.raises(ValueError):
+    query.find_dates(fest_id='no-such-festival', start_year=2019, end_year=2019)
+
+
+def test_find_dates_year_start():
+  # year_start is 2021 - the year of the 0th occurrence, which (like those before it) is not assigned.
+  assert [date.year for date in FestivalQuery(city=chennai).find_dates(fest_id='obavva-jayantI', start_year=2019, end_year=2023)] == [2022, 2023]
+
+
+def test_overridden_fest_ids():
+  applier_classes = periodical.FESTIVAL_ASSIGNER_CLASSES + [FestivalAssigner]
+  assert OVERRIDDEN_FEST_IDS == set().union(*[applier_class.OVERRIDDEN_FEST_IDS for applier_class in applier_classes])
+  rules_collection = FestivalQuery(city=chennai).rules_collection
+  for applier_class in applier_classes:
+    # Festivals with rules which RuleLookupAssigner assigns (ie. with timings), named by appliers when adding or removing festivals.
+    fest_ids = set()
+    for node in ast.walk(ast.parse(textwrap.dedent(inspect.getsource(applier_class)))):
+      if isinstance(node, ast.Call) and getattr(node.func, "attr", getattr(node.func, "id", None)) in ["add_festival", "delete_festival", "delete_festival_date", "FestivalInstance"]:
+        fest_ids.update(keyword.value.value for keyword in node.keywords if keyword.arg in ["fest_id", "name"] and isinstance(keyword.value, ast.Constant))
+    fest_ids = {fest_id for fest_id in fest_ids if fest_id in rules_collection.name_to_rule and rules_collection.name_to_rule[fest_id].timing is not None and rules_collection.name_to_rule[fest_id].timing.anga_type is not None}
+    assert fest_ids <= applier_class.OVERRIDDEN_FEST_IDS, applier_class
@@ -0,0 +1,43 @@
+import numpy
+from scipy.optimize import brentq
+
+from jyotisha.panchaanga.spatio_temporal import City, lagna
+
+# Above the arctic circle - but with sunrise and sunset in March.
+tromso = City('Tromsø', '69:38:56', '18:57:18', 'Europe/Oslo')
+
+
+def test_get_lagna_floats():
+  city = City.get_city_from_db('Chennai')
+  jds = 2444961.7125 + numpy.linspace(0, 2, 17)
+  numpy.testing.assert_allclose(lagna.get_lagna_floats(city=city, jds=jds), [city.get_lagna_float(jd) for jd in jds], atol=1e-9, rtol=0)
+  numpy.testing.assert_allclose(lagna.get_lagna_floats(city=tromso, jds=jds), [tromso.get_lagna_float(jd) for jd in jds], atol=1e-9, rtol=0)
+
+
+def test_get_lagna_data():
+  city = City.get_city_from_db('Chennai')
+  (jd_start, jd_end) = (2458222.5208333335, 2458223.5192)
+  lagna_data = lagna.get_lagna_data(city=city, jd_start=jd_start, jd_end=jd_end)
+  assert [x[0] for x in lagna_data] == [12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+  for (lagna_id, jd) in lagna_data:
+    # The lagna float at the end of lagna 12 is 0 or 12.
+    numpy.testing.assert_allclose((city.get_lagna_float(jd) - lagna_id + 6) % 12 - 6, 0, atol=1e-7)
+  # Slices of data computed for a longer period.
+  period_lagna_data = lagna.get_lagna_data(city=city, jd_start=jd_start - 10, jd_end=jd_end + 10)
+  numpy.testing.assert_allclose(lagna.get_lagna_data_slice(lagna_data=period_lagna_data, jd_start=jd_start, jd_end=jd_end), lagna_data, rtol=0, atol=1e-8)
+
+
+def test_get_lagna_data_polar():
+  (jd_start, jd_end) = (2459659.5, 2459660.5)
+  # Reference: brentq over the houses_ex ascendant, bracketed by minutely samples - it moves backwards and jumps across lagna-s which never rise.
+  jds = numpy.linspace(jd_start, jd_end, 1441)
+  lagna_floats = [tromso.get_lagna_float(jd) for jd in jds]
+  expected_lagna_data = []
+  for (jd_1, lagna_float_1, jd_2, lagna_float_2) in zip(jds, lagna_floats, jds[1:], lagna_floats[1:]):
+    (lagna_1, lagna_2) = (int(lagna_float_1) + 1, int(lagna_float_2) + 1)
+    if lagna_1 != lagna_2:
+      boundary = lagna_1 if (lagna_2 - lagna_1) % 12 == 1 else lagna_1 - 1
+      expected_lagna_data.append((lagna_1, brentq(lambda jd: (tromso.get_lagna_float(jd) - boundary + 6) % 12 - 6, jd_1, jd_2)))
+  lagna_data = lagna.get_lagna_data(city=tromso, jd_start=jd_start, jd_end=jd_end)
+  assert [x[0] for x in lagna_data] == [x[0] for x in expected_lagna_data] == [7, 8, 2, 1, 12, 11, 10, 4, 5, 6]
+  numpy.testing.assert_allclose([x[1] for x in lagna_data], [x[1] for x in expected_lagna_data], rtol=0, atol=1e-7)
@@ -0,0 +1,121 @@
+import copy
+from collections import defaultdict
+
+import pytest
+
+from jyotisha.panchaanga.spatio_temporal import City, periodical
+from jyotisha.panchaanga.temporal import DayHook, apply_steps
+from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner, ecliptic, tithi_festival, vaara, solar, rule_repo_based
+from jyotisha.panchaanga.temporal.time import Date
+from jyotisha_tests.spatio_temporal import chennai, computation_system_no_fests, orinda
+
+
+def test_day_at():
+  panchaanga = periodical.Panchaanga(city=orinda, start_date='2019-03-01', end_date='2019-03-15', computation_system=computation_system_no_fests)
+  timezone = orinda.get_timezone_obj()
+  # Includes the daylight saving time transition on 2019-03-10.
+  for day in range(1, 16):
+    date = Date(2019, 3, day)
+    daily_panchaanga = panchaanga.day_at(date)
+    assert daily_panchaanga.date == date
+    assert daily_panchaanga is panchaanga.date_str_to_panchaanga[date.get_date_str()]
+    jd_midnight = timezone.local_time_to_julian_day(date=date)
+    assert panchaanga.day_at(jd_midnight + 1e-6) is daily_panchaanga
+    assert panchaanga.day_at(jd_midnight - 1e-6) is panchaanga.day_at(date - 1)
+    assert panchaanga.day_at(daily_panchaanga.jd_sunrise) is daily_panchaanga
+  assert panchaanga.day_at(Date(2018, 3, 1)) is None
+
+  daily_panchaangas = panchaanga.daily_panchaangas_sorted()
+  assert [dp.date.get_date_str() for dp in daily_panchaangas] == sorted(panchaanga.date_str_to_panchaanga.keys())
+  assert sorted(reversed(daily_panchaangas)) == daily_panchaangas
+  assert [dp.date.day for dp in panchaanga.daily_panchaangas_sorted(skip_padding_days=True)] == list(range(1, 16))
+
+  # The day store is not serialized, but rebuilt.
+  panchaanga_copy = copy.deepcopy(panchaanga)
+  assert [dp.date for dp in panchaanga_copy.daily_panchaangas_sorted()] == [dp.date for dp in daily_panchaangas]
+  assert panchaanga_copy.day_at(Date(2019, 3, 10)).jd_sunrise == panchaanga.day_at(Date(2019, 3, 10)).jd_sunrise
+
+
+def test_parallel_computation():
+  panchaanga_serial = periodical.Panchaanga(city=chennai, start_date='2019-03-01', end_date='2019-03-20', computation_system=computation_system_no_fests)
+  panchaanga_parallel = periodical.Panchaanga(city=chennai, start_date='2019-03-01', end_date='2019-03-20', computation_system=computation_system_no_fests, workers=3)
+  assert panchaanga_parallel.to_json_map() == panchaanga_serial.to_json_map()
+  assert [dp.date for dp in panchaanga_parallel.daily_panchaangas_sorted()] == [dp.date for dp in panchaanga_serial.daily_panchaangas_sorted()]
+
+
+def test_extend():
+  panchaanga = periodical.Panchaanga(city=chennai, start_date='2019-01-01', end_date='2019-02-15')
+  panchaanga_extended = periodical.Panchaanga(city=chennai, start_date='2019-01-01', end_date='2019-01-20')
+  panchaanga_extended.extend_to('2019-02-15')
+  assert panchaanga_extended.to_json_map() == panchaanga.to_json_map()
+  assert panchaanga_extended.day_at(Date(2019, 2, 15)) is panchaanga_extended.date_str_to_panchaanga['2019-02-15']
+
+  panchaanga_prepended = periodical.Panchaanga(city=chennai, start_date='2019-01-20', end_date='2019-02-15')
+  panchaanga_prepended.prepend_from('2019-01-01')
+  assert panchaanga_prepended.to_json_map() == panchaanga.to_json_map()
+  assert [dp.date for dp in panchaanga_prepended.daily_panchaangas_sorted()] == [dp.date for dp in panchaanga.daily_panchaangas_sorted()]
+
+
+def test_padding_on_demand():
+  panchaanga = periodical.Panchaanga(city=chennai, start_date='2019-03-01', end_date='2019-03-07', computation_system=computation_system_no_fests)
+  num_core_days = panchaanga.duration_prior_padding + panchaanga.duration
+  assert len(panchaanga.date_str_to_panchaanga) == num_core_days
+  assert panchaanga.day_at(Date(2019, 3, 10)).date == Date(2019, 3, 10)
+  assert len(panchaanga.date_str_to_panchaanga) == num_core_days + 3
+  daily_panchaangas = panchaanga.daily_panchaangas_on_demand()
+  assert daily_panchaangas[num_core_days + 3] is panchaanga.day_at(Date(2019, 3, 11))
+  assert len(panchaanga.date_str_to_panchaanga) == num_core_days + 4
+
+  panchaanga_eager = periodical.Panchaanga(city=chennai, start_date='2019-03-01', end_date='2019-03-07', computation_system=computation_system_no_fests)
+  assert len(panchaanga_eager.daily_panchaangas_sorted()) == len(daily_panchaangas)
+  assert panchaanga.to_json_map() == panchaanga_eager.to_json_map()
+  assert [dp.date for dp in daily_panchaangas] == [dp.date for dp in panchaanga_eager.daily_panchaangas_sorted()]
+
+
+def test_applier_look_ahead():
+  # How many days past the period these appliers look: cleanup_festivals compares each day with the next; iShTi-s are computed for parva-s till 3 days after the period, and may be on the day after the parva sandhi; jupiter transits till 13 days after the period are considered, and the puShkara following a transit ends 11 days after it starts. (The solar and rule based appliers look at all padding days.)
+  # Jupiter enters dhanus a week after the period.
+  for (applier_class, assign, max_look_ahead_days) in [(FestivalAssigner, lambda applier: applier.cleanup_festivals(), 1), (ecliptic.EclipticFestivalAssigner, lambda applier: applier.assign_all(), 26), (tithi_festival.TithiFestivalAssigner, lambda applier: applier.assign_all(), 5), (vaara.VaraFestivalAssigner, lambda applier: applier.assign_all(), 0)]:
+    panchaanga = periodical.Panchaanga(city=chennai, start_date='2019-10-20', end_date='2019-10-27', computation_system=computation_system_no_fests)
+    assign(applier_class(panchaanga=panchaanga))
+    num_look_ahead_days = len(panchaanga.date_str_to_panchaanga) - panchaanga.duration_prior_padding - panchaanga.duration
+    assert num_look_ahead_days <= max_look_ahead_days, applier_class
+
+
+def test_apply_steps():
+  panchaanga = periodical.Panchaanga(city=chennai, start_date='2019-03-01', end_date='2019-03-07', computation_system=computation_system_no_fests)
+
+  def get_steps(log):
+    return [
+      DayHook(lambda d: log[d - 2].append(('a', d)), look_behind=2, posterior_padding_days=True),
+      DayHook(lambda d: log[d + 1].append(('b', d, tuple(log[d]))), look_ahead=1),
+      DayHook(lambda d: log[d].append(('c', d, tuple(log[d + 1]))), look_ahead=1, prior_padding_days=True),
+      lambda: log[0].append(('period', len(log))),
+      DayHook(lambda d: log[d - 1].append(('d', d, tuple(log[d - 1]))), look_behind=1),
+    ]
+
+  (log, log_sequential) = (defaultdict(list), defaultdict(list))
+  apply_steps(panchaanga=panchaanga, steps=get_steps(log))
+  for step in get_steps(log_sequential):
+    apply_steps(panchaanga=panchaanga, steps=[step])
+  assert log == log_sequential
+
+
+def test_fused_day_hooks():
+  (panchaanga, panchaanga_sequential) = [periodical.Panchaanga(city=chennai, start_date='2019-10-15', end_date='2019-11-15') for _ in range(2)]
+  for p in (panchaanga, panchaanga_sequential):
+    p._reset_festivals()
+  get_steps = lambda p: [step for applier_class in (rule_repo_based.RuleLookupAssigner, tithi_festival.TithiFestivalAssigner, solar.SolarFestivalAssigner, vaara.VaraFestivalAssigner) for step in applier_class(panchaanga=p).get_steps()]
+  apply_steps(panchaanga=panchaanga, steps=get_steps(panchaanga))
+  # Each hook applied to all days before the next.
+  for step in get_steps(panchaanga_sequential):
+    apply_steps(panchaanga=panchaanga_sequential, steps=[step])
+  assert panchaanga.to_json_map() == panchaanga_sequential.to_json_map()
+  assert [list(dp.festival_id_to_instance.keys()) for dp in panchaanga.daily_panchaangas_sorted()] == [list(dp.festival_id_to_instance.keys()) for dp in panchaanga_sequential.daily_panchaangas_sorted()]
+
+
+def test_polar_days():
+  city = City('Tromso', '69:38:56', '18:57:18', 'Europe/Oslo')
+  for (start_date, end_date) in [('2021-06-10', '2021-06-12'), ('2021-12-10', '2021-12-12')]:
+    with pytest.raises(ValueError):
+      periodical.Panchaanga(city=city, start_date=start_date, end_date=end_date)
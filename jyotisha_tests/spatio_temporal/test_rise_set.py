@@ -0,0 +1,31 @@
+import numpy
+
+from jyotisha.panchaanga.spatio_temporal import City, rise_set
+from jyotisha.panchaanga.temporal.body import Graha
+
+
+def test_get_rising_and_setting_times():
+  cities = [City.get_city_from_db(name="Chennai"), City.get_city_from_db(name="Bangalore"), City('Orinda', '37:51:38', '-122:10:59', 'America/Los_Angeles')]
+  jd_starts = 2459107.33 + numpy.arange(40)
+  for (body, tolerance) in [(Graha.SUN, 1e-8), (Graha.MOON, 1e-6), (Graha.KETU, 1e-5)]:
+    numpy.testing.assert_allclose(rise_set.get_rising_times(cities=cities, jd_starts=jd_starts, body=body), [[city.get_rising_time(julian_day_start=jd, body=body) for jd in jd_starts] for city in cities], atol=tolerance, rtol=0)
+    numpy.testing.assert_allclose(rise_set.get_setting_times(cities=cities, jd_starts=jd_starts, body=body), [[city.get_setting_time(julian_day_start=jd, body=body) for jd in jd_starts] for city in cities], atol=tolerance, rtol=0)
+
+
+def test_get_sunrise_sunset_table():
+  city = City.get_city_from_db(name="Chennai")
+  table = rise_set.get_sunrise_sunset_table(cities=[city], jd_starts=[2459107.27, 2459108.27])
+  numpy.testing.assert_allclose(table["jd_sunrise"][0][1], table["jd_next_sunrise"][0][0], atol=1e-8, rtol=0)
+  numpy.testing.assert_allclose(table["jd_sunset"][0][0], table["jd_previous_sunset"][0][1], atol=1e-8, rtol=0)
+  assert table["jd_previous_sunset"][0][0] < table["jd_sunrise"][0][0] < table["jd_sunset"][0][0] < table["jd_next_sunrise"][0][0]
+
+
+def test_get_rising_and_setting_times_polar():
+  # At Tromsø, the sun does not set around the June solstice (2021-06-10), and does not rise around the December one (2021-12-10).
+  cities = [City('Tromso', '69:38:56', '18:57:18', 'Europe/Oslo'), City.get_city_from_db(name="Chennai")]
+  jd_starts = [2459376.5, 2459559.5]
+  table = rise_set.get_sunrise_sunset_table(cities=cities, jd_starts=jd_starts)
+  for jds in table.values():
+    assert numpy.all(numpy.isnan(jds[0]))
+    assert numpy.all(numpy.isfinite(jds[1]))
+  numpy.testing.assert_allclose(table["jd_sunrise"][1], [City.get_city_from_db(name="Chennai").get_rising_time(julian_day_start=jd, body=Graha.SUN) for jd in jd_starts], atol=1e-8, rtol=0)
@@ -1,3 +1,5 @@
+import os
+import shutil
 from pprint import pprint
 
 from sanskrit_data import collection_helper
@@ -14,3 +16,74 @@ def test_rules_dicts():
 def test_get_url():
   rule_set = rules.RulesCollection.get_cached(repos_tuple=rules.rule_repos)
   assert rule_set.tree[rules.RulesRepo.GREGORIAN_MONTH_DIR][rules.RulesRepo.DAY_DIR]["02"]["09"]["proklas-janma"][collection_helper.LEAVES_KEY][0].get_url() == "https://github.com/jyotisham/adyatithi/blob/master/mahApuruSha/general-indic-tropical/julian/day/02/08/proklas-janma.toml"
+
+
+def test_rules_cache(tmp_path, monkeypatch):
+  repo_path = str(tmp_path / "test_repo")
+  shutil.copytree(os.path.join(os.path.dirname(__file__), 'data/test_repo'), repo_path)
+  cache_dir = str(tmp_path / "cache")
+  repos = [rules.RulesRepo(name="test_repo", path=repo_path)]
+  rule_set = rules.RulesCollection(repos=repos, julian_handling=None, cache_dir=cache_dir)
+  assert len(os.listdir(cache_dir)) == 1
+
+  rule_set_cached = rules.RulesCollection(repos=repos, julian_handling=None, cache_dir=cache_dir)
+  assert rule_set_cached.name_to_rule == rule_set.name_to_rule
+  assert rule_set_cached.tree == rule_set.tree
+  assert rule_set_cached.name_to_rule["taittirIya-utsargaH_paurNamAsyAm"].repo is repos[0]
+
+  # Removing a rule invalidates the cache.
+  os.remove(rule_set.name_to_rule["taittirIya-utsargaH_paurNamAsyAm"].path_actual)
+  rule_set_updated = rules.RulesCollection(repos=repos, julian_handling=None, cache_dir=cache_dir)
+  rule_set_updated_fingerprint = rules.get_rule_files_fingerprint(dir_paths=[repo_path])
+  assert rule_set_updated.name_to_rule == rules.RulesCollection(repos=repos, julian_handling=None, cache_dir=None).name_to_rule
+  assert list(rule_set_updated.name_to_rule.keys()) == ["throchi-durge_goraxa-sainika-nighAtaH"]
+
+  # So does changing the parser.
+  parser_path = tmp_path / "parser.py"
+  parser_path.write_text("# A changed parser.")
+  monkeypatch.setattr(rules, "PARSER_SOURCE_PATHS", rules.PARSER_SOURCE_PATHS + [str(parser_path)])
+  assert rules.get_rule_files_fingerprint(dir_paths=[repo_path]) != rule_set_updated_fingerprint
+  cache_writes = []
+  monkeypatch.setattr(rules.RulesCollection, "_write_cache", lambda self, cache_path, fingerprint: cache_writes.append(fingerprint))
+  rules.RulesCollection(repos=repos, julian_handling=None, cache_dir=cache_dir)
+  assert len(cache_writes) == 1
+
+
+def test_month_anga_index():
+  rule_set = rules.RulesCollection.get_cached(repos_tuple=rules.rule_repos)
+  for (month_type, anga_type_id) in [(rules.RulesRepo.LUNAR_MONTH_DIR, rules.RulesRepo.TITHI_DIR), (rules.RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, rules.RulesRepo.NAKSHATRA_DIR), (rules.RulesRepo.GREGORIAN_MONTH_DIR, rules.RulesRepo.DAY_DIR)]:
+    for (month_str, month_tree) in rule_set.tree[month_type][anga_type_id].items():
+      if month_str == collection_helper.LEAVES_KEY:
+        continue
+      for (anga_str, anga_tree) in month_tree.items():
+        if anga_str == collection_helper.LEAVES_KEY:
+          continue
+        fests = {fest_id: fest_tree[collection_helper.LEAVES_KEY][0] for (fest_id, fest_tree) in anga_tree.items() if fest_id != collection_helper.LEAVES_KEY}
+        assert rule_set.get_month_anga_fests(month_type=month_type, month=float(month_str), anga_type_id=anga_type_id, anga=int(anga_str)) == fests
+
+  # adhika-mAsa-samApanam is an adhika_only festival, pUrNimA~vratam adhika_and_nija.
+  for (anga, fest_id, relevance) in [(30, "adhika-mAsa-samApanam", {False: False, True: True}), (15, "pUrNimA~vratam", {False: True, True: True})]:
+    for is_adhika in (False, True):
+      fest_ids = [x for (x, _) in rule_set._month_anga_index[(rules.RulesRepo.LUNAR_MONTH_DIR, rules.RulesRepo.TITHI_DIR, 0, anga, is_adhika)]]
+      assert (fest_id in fest_ids) == relevance[is_adhika]
+      assert all(rule_set.name_to_rule[x].timing.get_adhika_maasa_handling() != ("nija_only" if is_adhika else "adhika_only") for x in fest_ids)
+
+
+def test_relative_event_graph():
+  rule_set = rules.RulesCollection(repos=[rules.RulesRepo(name="test_repo", path=os.path.join(os.path.dirname(__file__), 'data/test_repo'))], julian_handling=None, cache_dir=None)
+
+  def _get_event(fest_id, anchor_festival_id=None, offset=None):
+    event = rules.HinduCalendarEvent(id=fest_id)
+    event.timing = rules.HinduCalendarEventTiming()
+    (event.timing.anchor_festival_id, event.timing.offset) = (anchor_festival_id, offset)
+    return event
+
+  # c (relative to b) precedes b (relative to a) in rule order.
+  events = [_get_event("c", "b", 1), _get_event("a"), _get_event("b", "a", 2), _get_event("navama-aparapakSa-samApanam", "sarva-kArttika-amAvAsyA", 0), _get_event("kArttika-amAvAsyA_x"), _get_event("bOdhAyana-kArttika-amAvAsyA")]
+  rule_set.name_to_rule = {event.id: event for event in events}
+  rule_set._set_relative_event_graph()
+  assert rule_set.get_relative_fest_ids() == ["b", "c", "navama-aparapakSa-samApanam"]
+  assert rule_set.get_anchor_aliases(anchor_festival_id="sarva-kArttika-amAvAsyA") == ("kArttika-amAvAsyA_x",)
+
+  rule_set = rules.RulesCollection.get_cached(repos_tuple=rules.rule_repos)
+  assert sorted(rule_set.get_relative_fest_ids()) == sorted(fest_id for (fest_id, rule) in rule_set.name_to_rule.items() if rule.timing is not None and rule.timing.offset is not None)
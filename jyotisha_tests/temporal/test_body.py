@@ -14,6 +14,41 @@ logging.basicConfig(
 def test_graha_get_longitude():
   numpy.testing.assert_approx_equal(Graha.singleton(Graha.SUN).get_longitude(jd=2458434.083333251), 229.12286985575702)
 
+def test_graha_get_longitudes():
+  from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+  jds = numpy.linspace(2458434.083333251, 2458464.083333251, 7)
+  for graha_id in [Graha.SUN, Graha.MOON, Graha.KETU]:
+    graha = Graha.singleton(graha_id)
+    numpy.testing.assert_allclose(graha.get_longitudes(jds), [graha.get_longitude(jd=jd) for jd in jds])
+    numpy.testing.assert_allclose(graha.get_longitudes(jds, ayanaamsha_id=Ayanamsha.CHITRA_AT_180), [graha.get_longitude(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180) for jd in jds])
+
+
+def test_graha_get_longitude_and_speed():
+  from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+  jd = 2458434.083333251
+  for graha_id in [Graha.SUN, Graha.MOON, Graha.JUPITER, Graha.KETU]:
+    graha = Graha.singleton(graha_id)
+    (longitude, speed) = graha.get_longitude_and_speed(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    numpy.testing.assert_approx_equal(longitude, graha.get_longitude(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180))
+    numpy.testing.assert_allclose(speed, (graha.get_longitude(jd=jd + 0.001) - graha.get_longitude(jd=jd - 0.001)) / 0.002, rtol=1e-4)
+
+
+def test_find_root():
+  moon = Graha.singleton(Graha.MOON)
+  calls = []
+  def fn(jd):
+    calls.append(jd)
+    (longitude, speed) = moon.get_longitude_and_speed(jd=jd)
+    return (longitude - 290, speed)
+  jd_root = body.find_root(fn, 2458434.0, 2458436.0)
+  numpy.testing.assert_allclose(moon.get_longitude(jd=jd_root), 290, atol=1e-8)
+  assert len(calls) <= 4
+  # Falls back to brentq semantics when there is no root.
+  import pytest
+  with pytest.raises(ValueError):
+    body.find_root(fn, 2458434.0, 2458434.5)
+
+
 def test_longitude_difference():
   numpy.testing.assert_approx_equal(body.longitude_difference(jd=2458484.545, body1=Graha.singleton(Graha.SUN), body2=Graha.singleton(Graha.MARS)), -79.66, significant=2)
   numpy.testing.assert_approx_equal(body.longitude_difference(jd=2458485.5453, body1=Graha.singleton(Graha.SUN), body2=Graha.singleton(Graha.MARS)), -79.31, significant=2)
@@ -29,5 +64,24 @@ def test_graha_get_next_raashi_transit():
   assert Graha.singleton(Graha.SUN).get_transits(jd_start=2458162.545722, jd_end=2458177.545722, anga_type=AngaType.RASHI, ayanaamsha_id=Ayanamsha.CHITRA_AT_180) == []
 
 
+def test_graha_get_transits_retrograde():
+  from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+  from jyotisha.panchaanga.temporal.zodiac import AngaType
+  (jd_start, jd_end) = (2458484.5, 2458849.5)
+  # Brute force - sample every hour.
+  jds = numpy.arange(jd_start, jd_end, 1 / 24.0)
+  for graha_id in [Graha.MERCURY, Graha.JUPITER, Graha.RAHU]:
+    graha = Graha.singleton(graha_id)
+    transits = graha.get_transits(jd_start=jd_start, jd_end=jd_end, anga_type=AngaType.RASHI, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    raashis = numpy.floor(graha.get_longitudes(jds, ayanaamsha_id=Ayanamsha.CHITRA_AT_180) / 30) + 1
+    changes = numpy.nonzero(numpy.diff(raashis))[0]
+    assert len(transits) == len(changes)
+    for (transit, index) in zip(transits, changes):
+      assert jds[index] <= transit.jd <= jds[index + 1]
+      assert (transit.value_1, transit.value_2) == (raashis[index], raashis[index + 1])
+  # Jupiter re-entered vRzcika (while retrograde) on 2019-04-23, and rahu moves backwards.
+  assert [(transit.value_1, transit.value_2) for transit in Graha.singleton(Graha.JUPITER).get_transits(jd_start=jd_start, jd_end=jd_end, anga_type=AngaType.RASHI, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)] == [(8, 9), (9, 8), (8, 9)]
+
+
 def test_get_star_longitude():
   numpy.testing.assert_approx_equal(body.get_star_longitude(star="Spica", jd=2458434.083333251), 204.09485939669307)
@@ -0,0 +1,43 @@
+import logging
+
+from jyotisha.panchaanga.temporal.zodiac import Ayanamsha, AngaType, AngaSpanFinder, boundary_store
+
+logging.basicConfig(
+  level=logging.DEBUG,
+  format="%(levelname)s: %(asctime)s {%(filename)s:%(lineno)d}: %(message)s "
+)
+
+
+def test_get_timeline(tmp_path):
+  store = boundary_store.AngaBoundaryStore(max_chunks=2, cache_dir=str(tmp_path))
+  jd1 = 2458434.1
+  jd2 = jd1 + 150
+  timeline = store.get_timeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.NAKSHATRA, jd_start=jd1, jd_end=jd2)
+  assert timeline.covers(jd1, jd2)
+  expected_spans = AngaSpanFinder.get_cached(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.NAKSHATRA).get_all_angas_in_period(jd1=jd1, jd2=jd2)
+  spans = timeline.get_all_angas_in_period(jd1=jd1, jd2=jd2)
+  assert [span.anga for span in spans] == [span.anga for span in expected_spans]
+  for (span, expected_span) in zip(spans[:-1], expected_spans[:-1]):
+    assert abs(span.jd_end - expected_span.jd_end) < 1e-6
+  # Evicted down to max_chunks.
+  assert len(store._chunks) == 2 and store.misses == 3
+
+  # Tithi-s are stored against a single ayanaamsha.
+  assert store.get_timeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.TITHI, jd_start=jd1, jd_end=jd1 + 1).ayanaamsha_id == Ayanamsha.ASHVINI_STARTING_0
+
+  # Read back from disk.
+  disk_store = boundary_store.AngaBoundaryStore(cache_dir=str(tmp_path))
+  disk_timeline = disk_store.get_timeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.NAKSHATRA, jd_start=jd1, jd_end=jd2)
+  assert disk_timeline.angas == timeline.angas and disk_timeline.boundaries == timeline.boundaries
+
+
+def test_cache_dir(tmp_path, monkeypatch):
+  monkeypatch.setenv("HOME", str(tmp_path))
+  store = boundary_store.AngaBoundaryStore(cache_dir="~/boundaries")
+  timeline = store.get_timeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.TITHI, jd_start=2458434.1, jd_end=2458435.1)
+  assert len(list((tmp_path / "boundaries").iterdir())) == 1
+
+  # Boundaries are still computed (just not persisted) if the cache directory cannot be written to.
+  (tmp_path / "file").write_text("")
+  unwritable_store = boundary_store.AngaBoundaryStore(cache_dir=str(tmp_path / "file" / "boundaries"))
+  assert unwritable_store.get_timeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.TITHI, jd_start=2458434.1, jd_end=2458435.1).boundaries == timeline.boundaries
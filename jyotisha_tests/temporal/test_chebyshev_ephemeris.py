@@ -0,0 +1,38 @@
+import logging
+
+import numpy
+
+from jyotisha.panchaanga.temporal import chebyshev_ephemeris
+from jyotisha.panchaanga.temporal.body import Graha
+from jyotisha.panchaanga.temporal.zodiac import Ayanamsha, NakshatraDivision, AngaType
+
+logging.basicConfig(
+  level=logging.DEBUG,
+  format="%(levelname)s: %(asctime)s {%(filename)s:%(lineno)d}: %(message)s "
+)
+
+
+def test_fit_error_bound():
+  jds = numpy.linspace(2458434.1, 2458494.1, 241)
+  for graha_id in chebyshev_ephemeris.FITTED_BODIES:
+    graha = Graha.singleton(graha_id)
+    expected = [graha.get_longitude(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180) for jd in jds]
+    fit = chebyshev_ephemeris.ChebyshevEphemeris(body_name=graha_id, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, jd_start=2458434, jd_end=2458495)
+    assert fit.max_error < 1e-7
+    errors = (fit.get_longitudes(jds) - expected + 180) % 360 - 180
+    assert numpy.abs(errors).max() < 1e-7
+    numpy.testing.assert_allclose([fit.get_longitude(jd) for jd in jds], fit.get_longitudes(jds))
+
+
+def test_fitted_span():
+  jd = 2458434.083333251
+  moon = Graha.singleton(Graha.MOON)
+  expected_longitude = moon.get_longitude(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+  expected_tithi = NakshatraDivision(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_anga_float(anga_type=AngaType.TITHI)
+  with chebyshev_ephemeris.fitted_span(jd_start=jd - 10, jd_end=jd + 10, ayanaamsha_ids=[Ayanamsha.CHITRA_AT_180]) as fits:
+    assert len(fits) == 4
+    assert chebyshev_ephemeris.get_longitude(body_name=Graha.MOON, jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180) is not None
+    assert chebyshev_ephemeris.get_longitude(body_name=Graha.MOON, jd=jd + 100) is None
+    numpy.testing.assert_allclose(moon.get_longitude(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180), expected_longitude, atol=1e-7)
+    numpy.testing.assert_allclose(NakshatraDivision(jd=jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_anga_float(anga_type=AngaType.TITHI), expected_tithi, atol=1e-7)
+  assert not chebyshev_ephemeris.is_active()
@@ -0,0 +1,23 @@
+import swisseph as swe
+
+from jyotisha.panchaanga.temporal import eclipse
+
+
+def test_get_local_eclipses(tmp_path):
+  catalogue = eclipse.EclipseCatalogue(cache_dir=str(tmp_path))
+  (jd_start, jd_end) = (2458484.5, 2459215.5)
+  # Chennai, Orinda, Tromso
+  for (latitude, longitude) in [(13.09, 80.27), (37.86, -122.18), (69.65, 18.96)]:
+    for (eclipse_type, find_next) in [(eclipse.SOLAR, swe.sol_eclipse_when_loc), (eclipse.LUNAR, swe.lun_eclipse_when_loc)]:
+      expected = []
+      jd = jd_start
+      while True:
+        local_eclipse = find_next(jd, lon=longitude, lat=latitude)
+        if local_eclipse[1][0] > jd_end:
+          break
+        expected.append(local_eclipse)
+        jd = local_eclipse[1][0] + 25
+      assert eclipse.get_local_eclipses(eclipse_type=eclipse_type, latitude=latitude, longitude=longitude, jd_start=jd_start, jd_end=jd_end, catalogue=catalogue) == expected
+  # Read back from the disk.
+  assert eclipse.EclipseCatalogue(cache_dir=str(tmp_path)).get_eclipses(eclipse_type=eclipse.LUNAR, jd_start=jd_start, jd_end=jd_end) == catalogue.get_eclipses(eclipse_type=eclipse.LUNAR, jd_start=jd_start, jd_end=jd_end)
+  assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from jyotisha.panchaanga.temporal import julian_day
+
+
+def test_jd_to_ymdhms():
+  random.seed(0)
+  jds = [random.uniform(2378496.5, 2488069.5) for _ in range(500)]
+  # Around midnights - including one ending with a leap second (2016-12-31).
+  jds += [2457754.5 + offset for offset in (-2e-5, -1e-5, -5.787e-6, -1e-9, 0, 1e-9)]
+  jds += [2458434.5 + offset for offset in (-1e-9, -1e-10, 0, 1e-10, 1e-9)]
+  for jd in jds:
+    assert julian_day.jd_to_ymdhms(jd) == julian_day.astropy_jd_to_ymdhms(jd)
+    if julian_day.jd_to_ymdhms(jd)[5] < 60:
+      assert julian_day.jd_to_datetime(jd) == julian_day.astropy_jd_to_datetime(jd)
+    else:
+      with pytest.raises(ValueError):
+        julian_day.jd_to_datetime(jd)
+
+
+def test_ymdhms_to_jd():
+  random.seed(0)
+  for _ in range(500):
+    date_time = (random.randint(1800, 2200), random.randint(1, 12), random.randint(1, 28), random.randint(0, 23), random.randint(0, 59), random.choice([0, random.randint(0, 59), random.uniform(0, 60)]))
+    assert julian_day.ymdhms_to_jd(*date_time) == julian_day.astropy_ymdhms_to_jd(*date_time)
+  assert julian_day.ymdhms_to_jd(2016, 12, 31, 23, 59, 60.5) == julian_day.astropy_ymdhms_to_jd(2016, 12, 31, 23, 59, 60.5)
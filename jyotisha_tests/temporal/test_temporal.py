@@ -47,3 +47,41 @@ def test_get_timezone_offset_hours_from_jd():
 def test_get_weekday():
   # 2018, 11, 11 was sunday
   assert time.get_weekday(2458434.083333251) == 0
+
+
+def test_utc_offset_table():
+  import datetime
+  import pytz
+  from jyotisha.panchaanga.temporal import julian_day
+  tz = Timezone("America/Los_Angeles")
+  pytz_tz = pytz.timezone("America/Los_Angeles")
+  # Around the 2019 daylight saving time transitions - 2019-03-10 10:00 UTC and 2019-11-03 09:00 UTC.
+  for jd_transition in (2458552.9166666665, 2458790.875):
+    for minutes in range(-119, 121, 15):
+      jd = jd_transition + minutes / 1440.0
+      local_datetime = pytz_tz.fromutc(julian_day.jd_to_datetime(jd))
+      assert str(tz.julian_day_to_local_datetime(jd=jd)) == str(local_datetime)
+      assert tz.get_timezone_offset_hours_from_jd(jd) == local_datetime.utcoffset().total_seconds() / 3600
+      # Including non-existent and ambiguous local times.
+      naive_datetime = local_datetime.replace(tzinfo=None) + datetime.timedelta(minutes=30)
+      expected_datetime = pytz_tz.localize(naive_datetime)
+      assert tz.utc_offset_table.local_to_utc_datetime(naive_datetime) == (expected_datetime - expected_datetime.utcoffset()).replace(tzinfo=None)
+  assert tz.get_timezone_offset_hours_from_jds([2458552.9, 2458552.95, 2458790.85, 2458790.9]).tolist() == [-8, -7, -7, -8]
+  assert Timezone("UTC").get_timezone_offset_hours_from_jd(2458552.9) == 0
+
+
+def test_ordinal_date():
+  date = Date(2018, 12, 31)
+  ordinal_date = date.to_ordinal_date()
+  assert ordinal_date.ordinal == 737059
+  assert (ordinal_date + 1).to_date() == Date(2019, 1, 1)
+  assert ordinal_date - Date(2018, 12, 1).to_ordinal_date() == 30
+  assert ordinal_date == date and hash(ordinal_date) == hash(date)
+  assert date + 1 == Date(2019, 1, 1) and (date + 1).as_tuple() == (2019, 1, 1, None, None, None)
+  assert date - 1 == Date(2018, 12, 30)
+  date_time = Date(2018, 12, 31, 23, 30, 15.5)
+  assert date_time.to_ordinal_date().to_date().as_tuple() == (2018, 12, 31, 23, 30, 15.5)
+  assert date < date_time < Date(2019, 1, 1)
+  assert (date_time + 1).as_tuple() == (2019, 1, 1, 23, 30, 15.5)
+  assert sorted([Date(2019, 1, 1), date_time, date]) == [date, date_time, Date(2019, 1, 1)]
+  assert len({date, Date(2018, 12, 31, 0, 0, 0), ordinal_date}) == 1
@@ -10,6 +10,23 @@ def test_get_ayanaamsha():
   numpy.testing.assert_approx_equal(ayanaamsha.get_offset(2458434.083333251), 24.094859396693067)
 
 
+def test_get_ayanaamsha_offsets():
+  jds = numpy.linspace(2458434.083333251, 2458834.083333251, 5)
+  for ayanaamsha_id in [Ayanamsha.CHITRA_AT_180, Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING, Ayanamsha.ASHVINI_STARTING_0]:
+    ayanaamsha = zodiac.Ayanamsha.singleton(ayanaamsha_id=ayanaamsha_id)
+    numpy.testing.assert_allclose(ayanaamsha.get_offsets(jds), [ayanaamsha.get_offset(jd) for jd in jds])
+
+
+def test_interpolated_chitra_offset():
+  from jyotisha.panchaanga.temporal import body
+  ayanaamsha = zodiac.Ayanamsha.singleton(ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180)
+  # Includes a chunk boundary (2458240).
+  jds = numpy.linspace(2458230.1, 2458250.1, 97)
+  numpy.testing.assert_allclose([ayanaamsha.get_offset(jd) for jd in jds], [body.get_star_longitude(star="Spica", jd=jd) - 180 for jd in jds], rtol=0, atol=1e-7)
+  # Far past.
+  numpy.testing.assert_allclose(ayanaamsha.get_offset(1000000.3), body.get_star_longitude(star="Spica", jd=1000000.3) - 180, rtol=0, atol=1e-7)
+
+
 def disabled_test_swe_ayanaamsha_api():
   import swisseph as swe
   swe.set_sid_mode(swe.SIDM_LAHIRI)
@@ -48,6 +65,13 @@ def test_get_anga():
   assert nd.get_anga(AngaType.KARANA).index == 55
   assert nd.get_solar_raashi().index == 9
 
+def test_get_anga_floats():
+  jds = numpy.linspace(2444961.7125, 2444991.7125, 11)
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.SIDEREAL_MONTH]:
+    anga_floats = NakshatraDivision.get_anga_floats(jds=jds, anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    numpy.testing.assert_allclose(anga_floats, [NakshatraDivision(jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_anga_float(anga_type=anga_type) for jd in jds])
+
+
 def test_get_anga_span_solar_month():
   from jyotisha.panchaanga.temporal import time
   span_finder = AngaSpanFinder.get_cached(anga_type=AngaType.SIDEREAL_MONTH, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
@@ -68,6 +92,43 @@ def test_get_anga_span_tithi():
   numpy.testing.assert_array_almost_equal(span_finder.find(jd1=2444959.54042, jd2=2444963.54076, target_anga_id=27).to_tuple(), (2444960.4924699212, 2444961.599213224))
 
 
+def test_find_anga_start_between_predictive():
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.SIDEREAL_MONTH]:
+    span_finder = AngaSpanFinder(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    jd1 = 2458484.5
+    jd2 = jd1 + anga_type.mean_period_days * 1.1
+    for target_anga_id in [1, 7, 12]:
+      target_anga = zodiac.Anga.get_cached(index=target_anga_id, anga_type_id=anga_type.name)
+      expected = span_finder._find_anga_start_between_by_walking(jd1=jd1, jd2=jd2, target_anga=target_anga)
+      jd_start = span_finder.find_anga_start_between(jd1=jd1, jd2=jd2, target_anga=target_anga)
+      numpy.testing.assert_allclose(jd_start, expected, rtol=0, atol=1e-8)
+    # Not found.
+    assert span_finder.find_anga_start_between(jd1=jd_start + 0.01, jd2=jd_start + 0.1, target_anga=target_anga) is None
+  span_finder.find(jd1=jd1, jd2=jd2, target_anga_id=1)
+  assert 0 < span_finder.get_mean_ephemeris_calls_per_find() < 30
+
+
+def test_anga_timeline():
+  jd_start = 2458484.5
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.SIDEREAL_MONTH]:
+    timeline = zodiac.AngaTimeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=anga_type, jd_start=jd_start, jd_end=jd_start + 40)
+    span_finder = AngaSpanFinder.get_cached(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=anga_type)
+    for jd1 in numpy.arange(jd_start, jd_start + 38, 0.7):
+      spans = timeline.get_all_angas_in_period(jd1=jd1, jd2=jd1 + 1.03)
+      expected_spans = span_finder.get_all_angas_in_period(jd1=jd1, jd2=jd1 + 1.03)
+      assert [x.anga for x in spans] == [x.anga for x in expected_spans]
+      numpy.testing.assert_allclose([x.to_tuple() for x in spans[1:-1]], [x.to_tuple() for x in expected_spans[1:-1]], rtol=0, atol=1e-8)
+      assert spans[0].jd_start is None and spans[-1].jd_end is None
+  assert timeline.covers(jd1=jd_start + 1, jd2=jd_start + 2)
+  assert not timeline.covers(jd1=jd_start + 1, jd2=jd_start + 41)
+
+  karana_timeline = zodiac.AngaTimeline(ayanaamsha_id=Ayanamsha.CHITRA_AT_180, anga_type=AngaType.KARANA, jd_start=jd_start, jd_end=jd_start + 40)
+  tithi_timeline = zodiac.AngaTimeline(ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0, anga_type=AngaType.TITHI, jd_start=jd_start, jd_end=jd_start + 40)
+  derived_timeline = karana_timeline.get_coarser_timeline(anga_type=AngaType.TITHI, ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0)
+  assert derived_timeline.angas == tithi_timeline.angas
+  numpy.testing.assert_allclose(derived_timeline.boundaries, tithi_timeline.boundaries, rtol=0, atol=1e-8)
+
+
 def test_get_tithis_in_period():
   span_finder = AngaSpanFinder.get_cached(anga_type=AngaType.TITHI, ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0)
   spans = span_finder.get_spans_in_period(jd_start=time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1)), jd_end=time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=6, day=30)), target_anga_id=30)
@@ -94,6 +155,14 @@ def test_get_yogas_in_period():
   numpy.testing.assert_array_almost_equal(jds, [2458851.146, 2458881.029, 2458910.808, 2458940.431, 2458969.882, 2458999.185, 2459028.392], decimal=3)
 
 
+def test_get_all_yogas_in_period():
+  # Consecutive occurrences of a yoga are about 25.4 days apart - none should be skipped.
+  span_finder = AngaSpanFinder.get_cached(anga_type=AngaType.YOGA, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+  spans = span_finder.get_spans_in_period(jd_start=time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1)), jd_end=time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=6, day=30)), target_anga_id=15)
+  jds = [x.jd_start for x in spans]
+  numpy.testing.assert_array_almost_equal(jds, [2458872.388, 2458897.632, 2458923.004, 2458948.683, 2458974.467, 2459000.08, 2459025.559], decimal=3)
+
+
 def test_get_previous_solstice():
   solstice = zodiac.get_previous_solstice_month_span(jd=time.ist_timezone.local_time_to_julian_day(Date(2018, 1, 14)))
   expected_jd_start = time.ist_timezone.local_time_to_julian_day(date=Date(year=2017, month=12, day=21, hour=16, minute=28))